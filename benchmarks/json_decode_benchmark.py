@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for decoding Hypixel /player responses.
+
+Compares decode time and peak memory of every installed JSON decoder for one
+lobby's worth of player payloads, with and without keeping only the fields the
+stats processor uses. Pass recorded responses (raw /player JSON
+files) to measure real data; without arguments a synthetic payload is used.
+
+Usage:
+    python benchmarks/json_decode_benchmark.py [--lobby-size 16] [--rounds 20] [payload.json ...]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Allow running the script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import stats_schema
+from src.utils import json_utils
+
+# Game modes with a stats section in a typical player response
+GAME_MODES = [
+    "Bedwars", "SkyWars", "Duels", "Arcade", "MurderMystery", "BuildBattle", "UHC",
+    "HungerGames", "TNTGames", "Walls3", "MCGO", "Paintball", "Quake", "VampireZ",
+    "Battleground", "GingerBread", "SuperSmash", "SpeedUHC", "TrueCombat", "Pit"
+]
+
+def make_synthetic_payload(seed: int = 0) -> bytes:
+    """
+    Build a /player response of a realistic size, with many counters for every game mode.
+
+    Args:
+        seed: Seed for the random values.
+
+    Returns:
+        bytes: The encoded response.
+    """
+    rng = random.Random(seed)
+    stats = {}
+    for mode in GAME_MODES:
+        stats[mode] = {f"{prefix}_{stat}": rng.randint(0, 100000)
+                       for prefix in ("", "solo", "doubles", "threes", "fours", "ranked")
+                       for stat in ("kills", "deaths", "wins", "losses", "final_kills", "final_deaths",
+                                    "beds_broken", "games_played", "coins", "winstreak")}
+        stats[mode]["packages"] = [f"item_{rng.randint(0, 5000)}" for _ in range(200)]
+
+    player = {
+        "uuid": f"{rng.getrandbits(128):032x}",
+        "displayname": f"Player{seed}",
+        "networkExp": rng.randint(0, 50000000),
+        "achievementPoints": rng.randint(0, 20000),
+        "achievements": {f"general_{i}": rng.randint(0, 1000) for i in range(400)},
+        "achievementsOneTime": [f"one_time_{i}" for i in range(600)],
+        "stats": stats
+    }
+    return json.dumps({"success": True, "player": player}).encode("utf-8")
+
+def load_payloads(paths, lobby_size: int):
+    """
+    Load recorded payloads, or generate synthetic ones, for one lobby.
+
+    Args:
+        paths: Files with recorded /player responses.
+        lobby_size: Number of players in the lobby.
+
+    Returns:
+        List[bytes]: One payload per player.
+    """
+    if paths:
+        recorded = []
+        for path in paths:
+            with open(path, "rb") as f:
+                recorded.append(f.read())
+        return [recorded[i % len(recorded)] for i in range(lobby_size)]
+
+    return [make_synthetic_payload(i) for i in range(lobby_size)]
+
+def measure(decoder, payloads, rounds: int):
+    """
+    Measure how long one lobby takes to decode, and the peak memory it needs.
+
+    Args:
+        decoder: The JSON decoder function.
+        payloads: The lobby's payloads.
+        rounds: Number of timed runs.
+
+    Returns:
+        Tuple[float, float]: Median seconds per lobby and peak memory in bytes.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for payload in payloads:
+            decoder(payload)
+        timings.append(time.perf_counter() - start)
+
+    # Keep every decoded payload alive, as the stats cache does for a lobby
+    tracemalloc.start()
+    decoded = [decoder(payload) for payload in payloads]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+
+    return statistics.median(timings), peak
+
+def main():
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoding of Hypixel player responses")
+    parser.add_argument("payloads", nargs="*", help="recorded /player responses to decode")
+    parser.add_argument("--lobby-size", type=int, default=16, help="players per lobby (default: 16)")
+    parser.add_argument("--rounds", type=int, default=20, help="timed runs per decoder (default: 20)")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads, args.lobby_size)
+    total_kb = sum(len(payload) for payload in payloads) / 1024
+    print(f"Lobby of {len(payloads)} players, {total_kb:.0f} KB of JSON")
+    print(f"{'decoder':<10} {'ms/lobby':>10} {'peak MB':>10}")
+
+    decoders = dict(json_utils.DECODERS)
+    paths = ['success', 'cause'] + [f"player.{path}" for path in stats_schema.PLAYER_FIELDS]
+    projection = json_utils.compile_projection(paths)
+    default = json_utils.get_decoder()
+    decoders['pruned'] = lambda data: json_utils.project(default(data), projection)
+    if json_utils.ijson is not None:
+        decoders['streamed'] = lambda data: json_utils._stream_project(data, projection)
+
+    for name, decoder in decoders.items():
+        seconds, peak = measure(decoder, payloads, args.rounds)
+        print(f"{name:<10} {seconds * 1000:>10.2f} {peak / (1024 * 1024):>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for classifying Minecraft log lines.
+
+Compares running every log monitor pattern on each line, as the monitor used to,
+with the single-pass line classifier, on a synthetic multi-megabyte log of a busy
+Bedwars lobby. Also measures tailing the whole log from disk with the classifier,
+and the peak memory that needs. Pass a recorded latest.log to measure real data.
+
+Usage:
+    python benchmarks/log_classifier_benchmark.py [--size-mb 8] [--rounds 5] [latest.log]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Allow running the script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import log_monitor
+
+PREFIX = "[{:02d}:{:02d}:{:02d}] [Client thread/INFO]: "
+
+CHAT_MESSAGES = [
+    "[CHAT] [MVP+] {name}: gg ez", "[CHAT] [VIP] {name}: anyone party?", "[CHAT] {name}: rush mid",
+    "[CHAT] {name} was killed by {other}. FINAL KILL!", "[CHAT] BED DESTRUCTION > Red Bed was destroyed by {name}!",
+    "[CHAT] {name} joined the game", "[CHAT] +12 Bed Wars Experience", "[CHAT] You purchased Wool"
+]
+OTHER_MESSAGES = [
+    "Reloading ResourceManager: Default", "Connecting to mc.hypixel.net, 25565",
+    "[CHAT]                                     ", "Sound engine started"
+]
+EVENT_MESSAGES = [
+    "[CHAT] ONLINE: {names}", "[CHAT] [TEAM] {name}: going diamonds", "[CHAT] {name} has joined the Red team!",
+    "[CHAT] You joined the lobby!", "[CHAT] The game has started!"
+]
+
+def make_synthetic_log(size_mb: float, seed: int = 0) -> bytes:
+    """
+    Build a log of chat spam with the occasional line the monitor is interested in.
+
+    Args:
+        size_mb: Size of the log in megabytes.
+        seed: Seed for the random lines.
+
+    Returns:
+        bytes: The log, UTF-8 encoded.
+    """
+    rng = random.Random(seed)
+    names = [f"Player{i}" for i in range(200)]
+    lines = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        roll = rng.random()
+        if roll < 0.01:
+            message = rng.choice(EVENT_MESSAGES)
+        elif roll < 0.1:
+            message = rng.choice(OTHER_MESSAGES)
+        else:
+            message = rng.choice(CHAT_MESSAGES)
+        message = message.format(name=rng.choice(names), other=rng.choice(names),
+                                 names=", ".join(rng.sample(names, 16)))
+        seconds = len(lines) // 10
+        line = PREFIX.format(seconds // 3600 % 24, seconds // 60 % 60, seconds % 60) + message + "\n"
+        lines.append(line)
+        size += len(line)
+    return "".join(lines).encode("utf-8")
+
+# The patterns the monitor ran on every line before the classifier
+PATTERNS = [re.compile(pattern) for pattern in (
+    r"You joined the lobby!", r"The game has started!", r"\[TEAM\] (\w+)",
+    r"(\w+) has joined the (\w+) team", r"ONLINE:\s*(.*?)(?:\s*\(\d+\))?$"
+)]
+
+def classify_with_patterns(line: str) -> int:
+    """Run every pattern on a line, as the monitor did before the classifier."""
+    hits = 0
+    for pattern in PATTERNS:
+        if pattern.search(line):
+            hits += 1
+    return hits
+
+def measure(function, rounds: int) -> float:
+    """
+    Measure the median run time of a function.
+
+    Args:
+        function: The function to run.
+        rounds: Number of timed runs.
+
+    Returns:
+        float: Median seconds per run.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description="Benchmark classifying Minecraft log lines")
+    parser.add_argument("log", nargs="?", help="recorded latest.log to classify")
+    parser.add_argument("--size-mb", type=float, default=8, help="size of the synthetic log (default: 8)")
+    parser.add_argument("--rounds", type=int, default=5, help="timed runs per method (default: 5)")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, "rb") as f:
+            data = f.read()
+    else:
+        data = make_synthetic_log(args.size_mb)
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    print(f"{len(lines)} lines, {len(data) / (1024 * 1024):.1f} MB of log")
+
+    classifier = log_monitor.LineClassifier()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "latest.log")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        def tail_and_classify():
+            tailer = log_monitor.LogTailer(path)
+            for line in tailer.read_lines():
+                classifier.classify(line)
+            tailer.close()
+
+        methods = {
+            "patterns": lambda: [classify_with_patterns(line) for line in lines],
+            "classifier": lambda: [classifier.classify(line) for line in lines],
+            "events": lambda: list(log_monitor.parse_lines(lines, classifier)),
+            "tail+classify": tail_and_classify
+        }
+
+        print(f"{'method':<14} {'ms':>10} {'MB/s':>10}")
+        for name, function in methods.items():
+            seconds = measure(function, args.rounds)
+            print(f"{name:<14} {seconds * 1000:>10.1f} {len(data) / (1024 * 1024) / seconds:>10.1f}")
+
+        tracemalloc.start()
+        tail_and_classify()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Peak memory tailing the log: {peak / (1024 * 1024):.2f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,236 @@
 API Client for the Hypixel Stats Companion App.
 Handles communication with Hypixel and Mojang APIs.
 """
+import hashlib
+import json
+import os
+import random
 import time
 import requests
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Hashable, Tuple
 import threading
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
 
-from src.utils import config
+from requests.adapters import HTTPAdapter
+
+from src.utils import config, json_utils
+from src import stats_schema
+from src.cache import UuidCache, TTLCache
+
+# Base URLs of the APIs we talk to
+HYPIXEL_API_URL = "https://api.hypixel.net"
+MOJANG_API_URL = "https://api.mojang.com"
+
+# Maximum number of names accepted by Mojang's bulk profiles endpoint
+MOJANG_BULK_LIMIT = 10
+
+# Seconds to pause after a 429 response that doesn't say how long to wait
+DEFAULT_RETRY_AFTER = 60
+
+# Status codes that indicate a temporary problem worth retrying
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Longest pause we accept before a retry; longer waits fail the request instead of stalling the lobby
+MAX_RETRY_DELAY = 10
+
+# Request priorities, from the lookup the user is waiting on to work nobody is waiting on
+PRIORITY_INTERACTIVE = 0
+PRIORITY_LOBBY = 1
+PRIORITY_BACKGROUND = 2
+
+# Share of each rate limit budget that lower priorities may not use, so more important
+# requests always have headroom. Interactive requests may use the whole budget.
+RESERVED_SHARE = {
+    PRIORITY_INTERACTIVE: 0.0,
+    PRIORITY_LOBBY: 0.05,
+    PRIORITY_BACKGROUND: 0.25
+}
+
+# Background threads refreshing stale player stats; refreshes beyond these wait in a queue
+STATS_REFRESH_WORKERS = 2
+
+# Maximum number of unresolvable names and players remembered by the negative cache
+NEGATIVE_CACHE_SIZE = 1024
+
+# Minimum seconds between writes of the persisted rate limiter state
+RATE_LIMIT_SAVE_INTERVAL = 5
+
+# Exponential backoff between retries: BASE, 2*BASE, 4*BASE ... capped at MAX_RETRY_DELAY
+RETRY_BACKOFF_BASE = 0.5
+
+class ApiResponseError(ValueError):
+    """
+    Raised when an API answers with an unexpected HTTP status code.
+    """
+    
+    def __init__(self, status_code: int, message: str) -> None:
+        """
+        Initialize the error.
+        
+        Args:
+            status_code: The HTTP status code of the response.
+            message: The error message.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+class ServiceUnavailableError(requests.RequestException):
+    """
+    Raised when an API is temporarily unreachable: retries were exhausted or its circuit breaker is open.
+    This says nothing about the player being looked up.
+    """
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that applies a default (connect, read) timeout to every request.
+    
+    requests waits forever unless a timeout is passed on each call; mounting this
+    adapter on the session makes a hung connection fail instead of stalling a worker.
+    """
+    
+    def __init__(self, timeout, *args, **kwargs) -> None:
+        """
+        Initialize the adapter.
+        
+        Args:
+            timeout: Default timeout in seconds, or a (connect, read) tuple.
+            *args, **kwargs: Passed on to HTTPAdapter (pool sizes, retries, ...).
+        """
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        """
+        Send a request, using the default timeout unless the caller gave one.
+        """
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+def _create_session() -> requests.Session:
+    """
+    Create an HTTP session with the pool sizes, timeouts and compression set in config.ini.
+    
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    
+    # Keep enough connections per host open for every fetch worker to reuse one
+    adapter = TimeoutHTTPAdapter(
+        timeout=(config.get_connect_timeout(), config.get_read_timeout()),
+        pool_connections=config.get_connection_pool_size(),
+        pool_maxsize=config.get_max_connections_per_host()
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    session.headers['Connection'] = 'keep-alive'
+    session.headers['Accept-Encoding'] = 'gzip, deflate' if config.get_accept_gzip() else 'identity'
+    return session
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+    
+    After `failure_threshold` consecutive transient failures the circuit opens and
+    requests fail fast for `reset_timeout` seconds. After that, one trial request is
+    let through: if it succeeds the circuit closes again, otherwise it re-opens.
+    A trial that ends without either outcome (e.g. a 429) must be given back with
+    release_trial, so the next request can make a new one.
+    """
+    
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            host: The host this breaker protects, used in error messages.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to fail fast before letting a trial request through.
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_progress = False
+        self._trial_owner: Optional[int] = None  # Thread making the trial request
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+        
+        Returns:
+            bool: True if the circuit is closed, or if this is the trial request after the timeout.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            
+            if self._trial_in_progress or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            
+            self._trial_in_progress = True
+            self._trial_owner = threading.get_ident()
+            return True
+    
+    def release_trial(self) -> None:
+        """
+        End the calling thread's trial request without a success or failure, leaving the circuit open.
+        The next request after the timeout becomes a new trial. Does nothing for other threads.
+        """
+        with self._lock:
+            if self._trial_in_progress and self._trial_owner == threading.get_ident():
+                self._trial_in_progress = False
+                self._trial_owner = None
+    
+    def record_success(self) -> None:
+        """
+        Record a request that reached the service, closing the circuit.
+        """
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_progress = False
+            self._trial_owner = None
+    
+    def record_failure(self) -> None:
+        """
+        Record a transient failure, opening the circuit once the threshold is reached.
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._trial_in_progress or self.consecutive_failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"Circuit opened for {self.host} after {self.consecutive_failures} failures")
+                self.opened_at = time.monotonic()
+            self._trial_in_progress = False
+            self._trial_owner = None
+
+def _parse_int_header(headers, name: str) -> Optional[int]:
+    """
+    Read an integer header value.
+    
+    Args:
+        headers: The response headers.
+        name: The header name.
+        
+    Returns:
+        Optional[int]: The value, or None if the header is missing or not an integer.
+    """
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    
+    try:
+        return int(value.strip())
+    except ValueError:
+        return None
 
 class RateLimiter:
     """
@@ -18,6 +241,10 @@ class RateLimiter:
     This class ensures we don't exceed that limit by tracking when requests were made
     and waiting if necessary.
     
+    When the server reports its own budget (see sync_from_server), that budget is used
+    instead of the local estimate until the server's window resets, so we neither
+    exceed the real quota nor sleep while quota is still available.
+    
     Thread safety is ensured through proper use of locks with context managers,
     and by minimizing lock hold times to prevent blocking other threads unnecessarily.
     """
@@ -34,33 +261,292 @@ class RateLimiter:
         self.time_window = time_window    # 5 minutes (300 seconds)
         self.request_timestamps = deque()
         self._lock = threading.Lock()
+        
+        # Budget reported by the server, valid until server_reset_at (None if unknown)
+        self.server_remaining: Optional[int] = None
+        self.server_reset_at: Optional[float] = None
     
-    def wait_if_needed(self):
+    def wait_if_needed(self, priority: int = PRIORITY_LOBBY):
         """
         Wait if the rate limit would be exceeded by making a request now.
         Uses a context manager for the lock to ensure proper release even when exceptions occur.
+        
+        Lower priority requests start waiting earlier, leaving the reserved part of
+        the budget (see RESERVED_SHARE) to more important requests.
+        
+        Args:
+            priority: The request priority, one of the PRIORITY_* constants.
+        """
+        while True:
+            current_time = time.time()
+            wait_time = 0
+            
+            # Use a context manager to ensure the lock is always released
+            with self._lock:
+                reserved = int(self.max_requests * RESERVED_SHARE.get(priority, 0.0))
+                
+                if self.server_reset_at is not None and current_time < self.server_reset_at:
+                    # The server told us how much budget is left in its current window
+                    if self.server_remaining > reserved:
+                        self.server_remaining -= 1
+                    else:
+                        wait_time = self.server_reset_at - current_time
+                else:
+                    # No server information (or it has expired), so use the local sliding window
+                    self.server_remaining = None
+                    self.server_reset_at = None
+                    
+                    # Remove timestamps outside the window
+                    while self.request_timestamps and self.request_timestamps[0] < current_time - self.time_window:
+                        self.request_timestamps.popleft()
+                    
+                    allowed = self.max_requests - reserved
+                    if len(self.request_timestamps) >= allowed:
+                        # Calculate how long to wait until enough old requests have expired
+                        oldest = self.request_timestamps[len(self.request_timestamps) - allowed]
+                        wait_time = oldest + self.time_window - current_time
+                        wait_time = max(wait_time, 0)  # Ensure non-negative
+                
+                if wait_time <= 0:
+                    # Record this request while still holding the lock, so no other thread takes the same slot
+                    self.request_timestamps.append(current_time)
+                    return
+            
+            # Sleep outside the lock to not block other threads unnecessarily, then check the
+            # budget again: other threads may have used it up, or the new window may be full
+            time.sleep(wait_time)
+    
+    def sync_from_server(self, limit: Optional[int], remaining: Optional[int], reset: Optional[float]) -> None:
+        """
+        Adopt the rate limit budget reported by the server.
+        
+        Args:
+            limit: Total requests allowed per window (RateLimit-Limit), if known.
+            remaining: Requests left in the current window (RateLimit-Remaining).
+            reset: Seconds until the current window resets (RateLimit-Reset).
         """
+        if remaining is None or reset is None:
+            return
+        
         current_time = time.time()
-        wait_time = 0
+        reset_at = current_time + max(reset, 0)
         
-        # Use a context manager to ensure the lock is always released
         with self._lock:
-            # Remove timestamps outside the window
-            while self.request_timestamps and self.request_timestamps[0] < current_time - self.time_window:
-                self.request_timestamps.popleft()
+            if limit:
+                self.max_requests = limit
             
-            if len(self.request_timestamps) >= self.max_requests:
-                # Calculate how long to wait for the oldest request to expire
-                wait_time = self.request_timestamps[0] + self.time_window - current_time
-                wait_time = max(wait_time, 0)  # Ensure non-negative
+            if self.server_reset_at is not None and abs(reset_at - self.server_reset_at) < 1.0:
+                # Same window: requests sent after this response was generated are already
+                # counted locally, so never raise our estimate
+                self.server_remaining = min(self.server_remaining, max(remaining, 0))
+            else:
+                self.server_remaining = max(remaining, 0)
+            self.server_reset_at = reset_at
+    
+    def remaining(self) -> int:
+        """
+        Get how many requests can be made right now without waiting.
         
-        # Sleep outside the lock to not block other threads unnecessarily
-        if wait_time > 0:
-            time.sleep(wait_time)
+        Returns:
+            int: The remaining budget, from the server's report if it is current,
+                 otherwise from the local sliding window.
+        """
+        current_time = time.time()
+        
+        with self._lock:
+            if self.server_reset_at is not None and current_time < self.server_reset_at:
+                return self.server_remaining
+            
+            recent = sum(1 for t in self.request_timestamps if t >= current_time - self.time_window)
+            return max(self.max_requests - recent, 0)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the limiter's state in a form that can be saved as JSON.
+        
+        Returns:
+            Dict[str, Any]: Recent request times and the last budget reported by the server.
+        """
+        with self._lock:
+            return {
+                'timestamps': list(self.request_timestamps),
+                'server_remaining': self.server_remaining,
+                'server_reset_at': self.server_reset_at
+            }
+    
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore state saved by get_state, keeping only what still falls inside the window.
+        
+        Args:
+            state: The saved state.
+        """
+        current_time = time.time()
+        cutoff = current_time - self.time_window
+        timestamps = sorted(float(t) for t in state.get('timestamps', []) if cutoff <= float(t) <= current_time)
+        
+        with self._lock:
+            # Requests made since startup come after the saved ones
+            self.request_timestamps = deque(timestamps[-self.max_requests:] + list(self.request_timestamps))
+            
+            reset_at = state.get('server_reset_at')
+            remaining = state.get('server_remaining')
+            if reset_at is not None and remaining is not None and reset_at > current_time and self.server_reset_at is None:
+                self.server_remaining = int(remaining)
+                self.server_reset_at = float(reset_at)
+    
+    def block_for(self, seconds: float) -> None:
+        """
+        Stop issuing requests for the given time, e.g. when the server answers 429 with Retry-After.
+        
+        Args:
+            seconds: How long to wait before the next request.
+        """
+        reset_at = time.time() + max(seconds, 0)
         
-        # Record this request - separate lock acquisition to minimize lock hold time
         with self._lock:
-            self.request_timestamps.append(time.time())
+            self.server_remaining = 0
+            self.server_reset_at = max(reset_at, self.server_reset_at or 0)
+
+class RateLimitStore:
+    """
+    Saves the state of a group of rate limiters to a JSON file.
+    
+    Without it, a restarted app forgets the requests it just made and can burst past
+    the real quota. All limiters share one file, keyed by name. Saves are skipped if
+    the previous one was less than RATE_LIMIT_SAVE_INTERVAL seconds ago, unless forced.
+    """
+    
+    def __init__(self, path: str, limiters: Dict[str, RateLimiter]) -> None:
+        """
+        Initialize the store and restore any saved state into the limiters.
+        
+        Args:
+            path: Path to the JSON state file.
+            limiters: The limiters to persist, by name.
+        """
+        self.path = path
+        self.limiters = limiters
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+        self.load()
+    
+    def load(self) -> None:
+        """
+        Restore saved state into the limiters. A missing or unreadable file is ignored.
+        """
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            
+            for name, limiter in self.limiters.items():
+                if isinstance(saved.get(name), dict):
+                    limiter.load_state(saved[name])
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Error loading rate limit state from {self.path}: {str(e)}")
+    
+    def save(self, force: bool = False) -> None:
+        """
+        Write the limiters' state to the file.
+        
+        Args:
+            force: Save even if the last save was very recent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_save < RATE_LIMIT_SAVE_INTERVAL:
+                return
+            self._last_save = now
+            
+            try:
+                # Keep entries written by other clients, e.g. for keys this client doesn't use
+                saved = {}
+                if os.path.exists(self.path):
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        saved = json.load(f)
+                if not isinstance(saved, dict):
+                    saved = {}
+                
+                for name, limiter in self.limiters.items():
+                    saved[name] = limiter.get_state()
+                
+                # Write to a temporary file first so a crash can't leave a half-written file
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(saved, f)
+                os.replace(temp_path, self.path)
+            except (OSError, ValueError) as e:
+                print(f"Error saving rate limit state to {self.path}: {str(e)}")
+
+class _InflightCall:
+    """
+    A call in progress inside SingleFlight, shared by every caller with the same key.
+    """
+    
+    def __init__(self) -> None:
+        """
+        Initialize an unfinished call.
+        """
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so they share one execution.
+    
+    The first caller for a key runs the function. Callers that arrive with the same key
+    while it is still running wait for it and receive the same result or exception.
+    Once the call finishes, the next caller for that key starts a new one.
+    """
+    
+    def __init__(self) -> None:
+        """
+        Initialize the single-flight group.
+        """
+        self._calls: Dict[Hashable, _InflightCall] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for an identical call already in flight.
+        
+        Args:
+            key: Identifies identical calls.
+            fn: The function to run if no identical call is in flight.
+            
+        Returns:
+            Any: The result of fn.
+            
+        Raises:
+            Any exception raised by fn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InflightCall()
+                self._calls[key] = call
+        
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
 
 class ApiClient:
     """
@@ -68,31 +554,110 @@ class ApiClient:
     Handles authentication, requests, and error handling.
     """
     
-    def __init__(self, api_key=None) -> None:
+    def __init__(self, api_key=None, uuid_cache: Optional[UuidCache] = None) -> None:
         """
         Initialize the API client with the given API key.
         
         Args:
             api_key (str, optional): The Hypixel API key. If not provided,
                                      attempts to get it from configuration.
+            uuid_cache (UuidCache, optional): Cache for username -> UUID lookups. If not provided,
+                                              the persistent cache next to config.ini is used.
         """
         self.api_key = api_key or config.get_api_key()
-        self.session = requests.Session()
+        self.session = _create_session()
+        
+        # Player responses are large, so decode them with the fastest installed JSON library,
+        # and keep only the fields the stats processor uses from /player responses
+        self.decode_json = json_utils.get_decoder()
+        self.decode_player_json = json_utils.get_projecting_decoder(
+            ['success', 'cause'] + [f"player.{path}" for path in stats_schema.PLAYER_FIELDS]
+        )
+        
+        # Persistent username -> UUID cache so repeat lobbies skip the Mojang API
+        if uuid_cache is None:
+            uuid_cache = UuidCache(config.UUID_CACHE_FILE, config.get_uuid_cache_ttl())
+        self.uuid_cache = uuid_cache
+        
+        # Recently fetched player stats, served stale while a background refresh runs
+        self.stats_cache = TTLCache(
+            config.get_stats_cache_size(),
+            config.get_stats_cache_ttl(),
+            config.get_stats_cache_stale_ttl()
+        )
+        self._refreshing: set = set()  # UUIDs with a background refresh queued or in progress
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=STATS_REFRESH_WORKERS,
+                                                    thread_name_prefix="stats-refresh")
+        
+        # Names Mojang doesn't know ("mojang", lowercase name) and UUIDs Hypixel has no
+        # player for ("hypixel", uuid), so repeated nicks cost no requests
+        self.not_found_cache = TTLCache(NEGATIVE_CACHE_SIZE, config.get_negative_cache_ttl())
+        
+        # Identical requests made at the same time share one network round-trip
+        self._inflight = SingleFlight()
         
-        # Initialize rate limiter (300 requests per 5 minutes)
-        self.rate_limiter = RateLimiter(300, 300)
+        # Priority of the requests made by each thread, see priority()
+        self._request_priority = threading.local()
+        
+        # Transient failures are retried, and a host that keeps failing is skipped for a while
+        self.max_retries = config.get_max_retries()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        
+        # Every Hypixel API key has its own limit of 300 requests per 5 minutes.
+        # rate_limiter is the main key's limiter; extra keys from config.ini add their own.
+        self.api_keys = [self.api_key] + [key for key in config.get_additional_api_keys() if key != self.api_key]
+        self.key_limiters: Dict[str, RateLimiter] = {key: RateLimiter(300, 300) for key in self.api_keys}
+        self.rate_limiter = self.key_limiters[self.api_key]
         
         # Mojang: 600 requests per 10 minutes
         self.mojang_limiter = RateLimiter(600, 600)  # 600 seconds = 10 minutes
         
-    def _make_request(self, url: str, params: Optional[Dict[str, str]] = None, is_hypixel: bool = True) -> Dict[str, Any]:
+        # Remember recent requests across restarts so a restart can't burst past the quota
+        self.rate_limit_store: Optional[RateLimitStore] = None
+        if config.get_persist_rate_limits():
+            limiters = {"mojang": self.mojang_limiter}
+            for key, limiter in self.key_limiters.items():
+                # Name Hypixel limiters by a hash so the keys themselves aren't written out
+                limiters["hypixel:" + hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]] = limiter
+            self.rate_limit_store = RateLimitStore(config.RATE_LIMIT_FILE, limiters)
+        
+    @contextmanager
+    def priority(self, priority: int):
+        """
+        Make all requests on the current thread use the given priority inside a with block.
+        
+            with api_client.priority(PRIORITY_INTERACTIVE):
+                uuid = api_client.get_uuid(username)
+        
+        Args:
+            priority: One of the PRIORITY_* constants.
+        """
+        previous = getattr(self._request_priority, 'value', PRIORITY_LOBBY)
+        self._request_priority.value = priority
+        try:
+            yield
+        finally:
+            self._request_priority.value = previous
+    
+    def _make_request(self, url: str, params: Optional[Dict[str, str]] = None, is_hypixel: bool = True,
+                      json_body: Optional[Any] = None, pin_key: bool = False,
+                      decoder: Optional[json_utils.JsonDecoder] = None) -> Dict[str, Any]:
         """
         Make an HTTP GET request to the specified URL with parameters.
+        If a JSON body is given, a POST request is made instead.
+        
+        Hypixel requests made with the client's own API key may be sent with any key
+        in the pool, whichever has the most rate limit budget left.
         
         Args:
             url: The URL to make the request to.
             params: Optional dictionary of query parameters.
             is_hypixel: Whether this is a Hypixel API request (True) or a Mojang API request (False).
+            json_body: Optional JSON-serializable body to POST.
+            pin_key: Always send the request with the API key given in params.
+            decoder: Optional function to decode the response body, instead of the default JSON decoder.
             
         Returns:
             Dict[str, Any]: The JSON response from the API.
@@ -101,19 +666,91 @@ class ApiClient:
             requests.RequestException: For any request-related errors.
             ValueError: For API errors (non-200 status codes).
         """
-        # Apply rate limiting based on which API we're calling
-        if is_hypixel:
-            self.rate_limiter.wait_if_needed()
-        else:
-            self.mojang_limiter.wait_if_needed()
+        # Concurrent callers asking for the same thing share one request and its result or error.
+        # Only callers with the same priority share, so an interactive lookup never waits
+        # behind a lobby request that the rate limiter is holding back.
+        priority = getattr(self._request_priority, 'value', PRIORITY_LOBBY)
+        key = (url, tuple(sorted((params or {}).items())), repr(json_body), is_hypixel, pin_key, decoder, priority)
+        return self._inflight.do(key, lambda: self._send_request(url, params, is_hypixel, json_body, pin_key, decoder))
+    
+    def _send_request(self, url: str, params: Optional[Dict[str, str]], is_hypixel: bool,
+                      json_body: Optional[Any], pin_key: bool = False,
+                      decoder: Optional[json_utils.JsonDecoder] = None) -> Dict[str, Any]:
+        """
+        Send a single rate-limited HTTP request and decode the response.
+        See _make_request for the arguments and errors.
+        """
+        use_key_pool = (is_hypixel and not pin_key and len(self.api_keys) > 1
+                        and params is not None and params.get('key') == self.api_key)
+        limiter = self.rate_limiter if is_hypixel else self.mojang_limiter
+        breaker = self._get_circuit_breaker(url)
+        attempt = 0
         
-        try:
-            response = self.session.get(url, params=params)
+        while True:
+            # Fail fast while the service is known to be down
+            if not breaker.allow_request():
+                raise ServiceUnavailableError(f"Request to {url} failed: {breaker.host} is unavailable, try again later")
             
+            try:
+                # Spread Hypixel requests over the key pool; a retry may go out with a different key
+                if use_key_pool:
+                    api_key, limiter = self._select_api_key()
+                    params = dict(params, key=api_key)
+                
+                # Apply rate limiting based on which API we're calling
+                limiter.wait_if_needed(getattr(self._request_priority, 'value', PRIORITY_LOBBY))
+                if self.rate_limit_store is not None:
+                    self.rate_limit_store.save()
+                
+                try:
+                    if json_body is not None:
+                        response = self.session.post(url, params=params, json=json_body)
+                    else:
+                        response = self.session.get(url, params=params)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    # Network blips and timeouts are transient, so retry them with backoff
+                    breaker.record_failure()
+                    if attempt < self.max_retries:
+                        time.sleep(self._backoff_delay(attempt))
+                        attempt += 1
+                        continue
+                    raise ServiceUnavailableError(f"Request to {url} failed: {str(e)}")
+                except requests.RequestException as e:
+                    raise requests.RequestException(f"Request to {url} failed: {str(e)}")
+                
+                # Keep the limiter in sync with the budget the server reports
+                retry_after = self._sync_rate_limit(limiter, response)
+                
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                
+                    # For 429 the limiter already holds requests back until Retry-After has passed
+                    delay = retry_after if retry_after is not None else self._backoff_delay(attempt)
+                    if attempt < self.max_retries and delay <= MAX_RETRY_DELAY:
+                        if retry_after is None:
+                            time.sleep(delay)
+                        attempt += 1
+                        continue
+                    raise ServiceUnavailableError(f"API request failed with status code {response.status_code}: {response.text}")
+                
+                breaker.record_success()
+                break
+            finally:
+                # A trial request that ended without a success or failure, e.g. on a 429 or an
+                # invalid request, mustn't keep the circuit open forever
+                breaker.release_trial()
+        
+        try:
             if response.status_code != 200:
-                raise ValueError(f"API request failed with status code {response.status_code}: {response.text}")
+                raise ApiResponseError(response.status_code, f"API request failed with status code {response.status_code}: {response.text}")
             
-            response_json = response.json()
+            try:
+                response_json = (decoder or self.decode_json)(response.content)
+            except ValueError as e:
+                # A 200 with a body that isn't JSON, e.g. a proxy error page, is an outage
+                # rather than a sign that the player doesn't exist
+                raise ServiceUnavailableError(f"Request to {url} failed: Invalid JSON in response: {str(e)}")
             
             # Handle Hypixel API specific error responses
             if 'success' in response_json and not response_json['success']:
@@ -121,12 +758,88 @@ class ApiClient:
                 raise ValueError(f"API request failed: {error_msg}")
             
             return response_json
+        except ServiceUnavailableError:
+            raise
         except requests.RequestException as e:
             raise requests.RequestException(f"Request to {url} failed: {str(e)}")
     
+    def _select_api_key(self) -> Tuple[str, RateLimiter]:
+        """
+        Pick the API key with the most rate limit budget left.
+        
+        Returns:
+            Tuple[str, RateLimiter]: The API key and its rate limiter.
+        """
+        api_key = max(self.api_keys, key=lambda key: self.key_limiters[key].remaining())
+        return api_key, self.key_limiters[api_key]
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Get the pause before the next retry, using exponential backoff with jitter
+        so that many clients don't retry in lockstep.
+        
+        Args:
+            attempt: The number of retries already made.
+            
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = min(MAX_RETRY_DELAY, RETRY_BACKOFF_BASE * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def _get_circuit_breaker(self, url: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker for the host of a URL, creating it on first use.
+        
+        Args:
+            url: The request URL.
+            
+        Returns:
+            CircuitBreaker: The breaker for the URL's host.
+        """
+        host = urlparse(url).netloc
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host)
+                self._breakers[host] = breaker
+            return breaker
+    
+    def _sync_rate_limit(self, limiter: RateLimiter, response: requests.Response) -> Optional[int]:
+        """
+        Update a rate limiter from the RateLimit-* and Retry-After headers of a response.
+        
+        Args:
+            limiter: The rate limiter for the API that was called.
+            response: The HTTP response.
+            
+        Returns:
+            Optional[int]: For a 429 response, the number of seconds the limiter is now blocked for.
+        """
+        headers = response.headers
+        limiter.sync_from_server(
+            _parse_int_header(headers, 'RateLimit-Limit'),
+            _parse_int_header(headers, 'RateLimit-Remaining'),
+            _parse_int_header(headers, 'RateLimit-Reset')
+        )
+        
+        if response.status_code == 429:
+            # Honor Retry-After, falling back to the reset time or a default pause
+            retry_after = _parse_int_header(headers, 'Retry-After')
+            if retry_after is None:
+                retry_after = _parse_int_header(headers, 'RateLimit-Reset')
+            if retry_after is None:
+                retry_after = DEFAULT_RETRY_AFTER
+            limiter.block_for(retry_after)
+            return retry_after
+        
+        return None
+    
     def get_uuid(self, username: str) -> str:
         """
         Get a player's UUID from their Minecraft username using the Mojang API.
+        Previously resolved usernames are served from the UUID cache, and names recently
+        reported as nonexistent fail, without a request.
         
         Args:
             username: The Minecraft username.
@@ -138,52 +851,194 @@ class ApiClient:
             ValueError: If the player doesn't exist or API request fails.
             requests.RequestException: For any request-related errors.
         """
-        url = f"https://api.mojang.com/users/profiles/minecraft/{username}"
+        cached_uuid = self.uuid_cache.get(username)
+        if cached_uuid:
+            return cached_uuid
+        
+        if self.not_found_cache.get(("mojang", username.lower())) is not None:
+            raise ValueError(f"Failed to get UUID for {username}: Player '{username}' not found")
+        
+        url = f"{MOJANG_API_URL}/users/profiles/minecraft/{username}"
         
         try:
             response = self._make_request(url, is_hypixel=False)
             
             if not response or 'id' not in response:
+                self.not_found_cache.put(("mojang", username.lower()), True)
                 raise ValueError(f"Player '{username}' not found")
             
+            self.uuid_cache.put(username, response['id'])
             return response['id']
+        except ApiResponseError as e:
+            # Mojang answers 204/404 for names that don't exist
+            if e.status_code in (204, 404):
+                self.not_found_cache.put(("mojang", username.lower()), True)
+            raise ValueError(f"Failed to get UUID for {username}: {str(e)}")
+        except ServiceUnavailableError as e:
+            raise ServiceUnavailableError(f"Failed to get UUID for {username}: {str(e)}")
         except requests.RequestException as e:
             raise requests.RequestException(f"Failed to get UUID for {username}: {str(e)}")
         except ValueError as e:
             raise ValueError(f"Failed to get UUID for {username}: {str(e)}")
     
+    def get_uuids(self, usernames: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve many usernames to UUIDs using Mojang's bulk profiles endpoint.
+        Cached usernames and names recently reported as nonexistent are served without
+        a request, and the rest are looked up in chunks of MOJANG_BULK_LIMIT names per request.
+        
+        Args:
+            usernames: The Minecraft usernames.
+            
+        Returns:
+            Dict[str, Optional[str]]: Mapping of each username to its UUID, or to None if
+                                      Mojang doesn't know the name (a confirmed nick).
+                                      Usernames whose chunk failed to load are left out
+                                      so callers can retry them individually.
+        """
+        results: Dict[str, Optional[str]] = {}
+        pending: Dict[str, List[str]] = {}  # lowercase name -> original spellings
+        
+        for username in usernames:
+            cached_uuid = self.uuid_cache.get(username)
+            if cached_uuid:
+                results[username] = cached_uuid
+            elif self.not_found_cache.get(("mojang", username.lower())) is not None:
+                results[username] = None
+            else:
+                pending.setdefault(username.lower(), []).append(username)
+        
+        names = list(pending.keys())
+        url = f"{MOJANG_API_URL}/profiles/minecraft"
+        
+        for i in range(0, len(names), MOJANG_BULK_LIMIT):
+            chunk = names[i:i + MOJANG_BULK_LIMIT]
+            
+            try:
+                response = self._make_request(url, is_hypixel=False, json_body=chunk)
+            except (ValueError, requests.RequestException) as e:
+                print(f"Failed to get UUIDs for {', '.join(chunk)}: {str(e)}")
+                continue
+            
+            found = {}
+            for profile in response or []:
+                if isinstance(profile, dict) and 'id' in profile and 'name' in profile:
+                    found[profile['name'].lower()] = profile['id']
+            
+            for name in chunk:
+                uuid = found.get(name)
+                if uuid:
+                    self.uuid_cache.put(name, uuid)
+                else:
+                    self.not_found_cache.put(("mojang", name), True)
+                for username in pending[name]:
+                    results[username] = uuid
+        
+        return results
+    
     def get_player_stats(self, uuid: str) -> Dict[str, Any]:
         """
         Get a player's statistics from the Hypixel API.
+        Fresh cached stats are returned without a request. Stale cached stats are
+        returned immediately while a background refresh fetches new ones. UUIDs recently
+        reported as unknown to Hypixel fail without a request.
+        
+        Args:
+            uuid: The player's UUID.
+            
+        Returns:
+            Dict[str, Any]: The player's statistics, limited to stats_schema.PLAYER_FIELDS.
+            
+        Raises:
+            ValueError: If the player doesn't exist or API request fails.
+            requests.RequestException: For any request-related errors.
+        """
+        cached = self.stats_cache.get(uuid)
+        if cached is not None:
+            player, is_fresh = cached
+            if not is_fresh:
+                self._schedule_stats_refresh(uuid)
+            return player
+        
+        if self.not_found_cache.get(("hypixel", uuid)) is not None:
+            raise ValueError(f"Failed to get stats for player {uuid}: Player with UUID '{uuid}' not found")
+        
+        return self._fetch_player_stats(uuid)
+    
+    def _fetch_player_stats(self, uuid: str) -> Dict[str, Any]:
+        """
+        Fetch a player's statistics from the Hypixel API and store them in the stats cache.
         
         Args:
             uuid: The player's UUID.
             
         Returns:
-            Dict[str, Any]: The player's statistics.
+            Dict[str, Any]: The player's statistics, limited to stats_schema.PLAYER_FIELDS.
             
         Raises:
             ValueError: If the player doesn't exist or API request fails.
             requests.RequestException: For any request-related errors.
         """
-        url = "https://api.hypixel.net/player"
+        url = f"{HYPIXEL_API_URL}/player"
         params = {
             "key": self.api_key,
             "uuid": uuid
         }
         
         try:
-            response = self._make_request(url, params, is_hypixel=True)
+            # Only the fields the stats processor needs are kept, which saves a lot of memory per lobby
+            response = self._make_request(url, params, is_hypixel=True, decoder=self.decode_player_json)
             
             if not response.get('player'):
+                self.not_found_cache.put(("hypixel", uuid), True)
                 raise ValueError(f"Player with UUID '{uuid}' not found")
             
+            self.stats_cache.put(uuid, response['player'])
             return response['player']
+        except ServiceUnavailableError as e:
+            raise ServiceUnavailableError(f"Failed to get stats for player {uuid}: {str(e)}")
         except requests.RequestException as e:
             raise requests.RequestException(f"Failed to get stats for player {uuid}: {str(e)}")
         except ValueError as e:
             raise ValueError(f"Failed to get stats for player {uuid}: {str(e)}")
     
+    def _schedule_stats_refresh(self, uuid: str) -> None:
+        """
+        Refresh a player's cached stats in the background.
+        At most STATS_REFRESH_WORKERS refreshes run at a time, and only one per player
+        is queued or running.
+        
+        Args:
+            uuid: The player's UUID.
+        """
+        with self._refresh_lock:
+            if uuid in self._refreshing:
+                return
+            self._refreshing.add(uuid)
+            
+            try:
+                self._refresh_executor.submit(self._refresh_player_stats, uuid)
+            except RuntimeError:
+                # The client was closed, so the stale entry is kept as it is
+                self._refreshing.discard(uuid)
+    
+    def _refresh_player_stats(self, uuid: str) -> None:
+        """
+        Background worker that re-fetches a player's stats into the cache.
+        Errors are logged and the stale entry is left in place.
+        
+        Args:
+            uuid: The player's UUID.
+        """
+        try:
+            with self.priority(PRIORITY_BACKGROUND):
+                self._fetch_player_stats(uuid)
+        except Exception as e:
+            print(f"Background refresh failed for player {uuid}: {str(e)}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(uuid)
+    
     def get_player_status(self, uuid: str) -> Dict[str, Any]:
         """
         Get a player's online status from the Hypixel API.
@@ -198,7 +1053,7 @@ class ApiClient:
             ValueError: If the API request fails.
             requests.RequestException: For any request-related errors.
         """
-        url = "https://api.hypixel.net/status"
+        url = f"{HYPIXEL_API_URL}/status"
         params = {
             "key": self.api_key,
             "uuid": uuid
@@ -208,6 +1063,8 @@ class ApiClient:
             response = self._make_request(url, params, is_hypixel=True)
             
             return response['session']
+        except ServiceUnavailableError as e:
+            raise ServiceUnavailableError(f"Failed to get status for player {uuid}: {str(e)}")
         except requests.RequestException as e:
             raise requests.RequestException(f"Failed to get status for player {uuid}: {str(e)}")
         except ValueError as e:
@@ -216,6 +1073,34 @@ class ApiClient:
             # This is a special case where the API might return success: true but no session
             raise ValueError(f"Session data for player {uuid} not available")
     
+    def prewarm(self) -> None:
+        """
+        Open connections to the API hosts in the background.
+        
+        The TLS handshake is done before the first lobby comes in, so the first lookups
+        reuse a ready connection. Failures are ignored; requests reconnect as usual.
+        """
+        def warm() -> None:
+            for url in (HYPIXEL_API_URL, MOJANG_API_URL):
+                try:
+                    # HEAD without a key doesn't count against any rate limit
+                    self.session.head(url, timeout=config.get_connect_timeout())
+                except requests.RequestException:
+                    pass
+        
+        threading.Thread(target=warm, name="api-prewarm", daemon=True).start()
+    
+    def close(self) -> None:
+        """
+        Release resources held by the client, such as the HTTP session and cache files.
+        """
+        # Drop refreshes that haven't started; running ones finish on their own
+        self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+        if self.rate_limit_store is not None:
+            self.rate_limit_store.save(force=True)
+        self.uuid_cache.close()
+        self.session.close()
+    
     def verify_api_key(self) -> bool:
         """
         Verify that the API key is valid by making a test request.
@@ -227,11 +1112,11 @@ class ApiClient:
             requests.RequestException: For any request-related errors.
         """
         # First try the key endpoint, which is specifically for key validation
-        url = "https://api.hypixel.net/key"
+        url = f"{HYPIXEL_API_URL}/key"
         params = {"key": self.api_key}
         
         try:
-            response = self._make_request(url, params, is_hypixel=True)
+            response = self._make_request(url, params, is_hypixel=True, pin_key=True)
             
             # Check if the API key is valid
             if response.get('success', False):
@@ -265,14 +1150,14 @@ class ApiClient:
         """
         # Hypixel's account UUID - should always exist as a fallback check
         hypixel_uuid = "f7c77d999f154a66a87dc4a51ef30d19"
-        url = "https://api.hypixel.net/player"
+        url = f"{HYPIXEL_API_URL}/player"
         params = {
             "key": self.api_key,
             "uuid": hypixel_uuid
         }
         
         try:
-            response = self._make_request(url, params, is_hypixel=True)
+            response = self._make_request(url, params, is_hypixel=True, pin_key=True)
             valid = response.get('success', False)
             
             if valid:
@@ -0,0 +1,367 @@
+"""
+Asyncio API Client for the Hypixel Stats Companion App.
+Non-blocking counterpart of ApiClient for running many lookups on a single thread.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Hashable
+
+import aiohttp
+import requests
+
+from src.utils import config, json_utils
+from src import stats_schema
+from src.cache import UuidCache
+from src.api_client import HYPIXEL_API_URL, MOJANG_API_URL, ServiceUnavailableError
+
+class AsyncRateLimiter:
+    """
+    Sliding window rate limiter for coroutines.
+
+    Works like RateLimiter, but waits with asyncio.sleep so other coroutines keep
+    running while a request is held back. Waiters are served in arrival order.
+    """
+
+    def __init__(self, max_requests: int, time_window: float) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_requests: Maximum number of requests allowed in the time window.
+            time_window: Time window in seconds.
+        """
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self.request_timestamps = deque()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def wait_if_needed(self) -> None:
+        """
+        Wait if the rate limit would be exceeded by making a request now, then record the request.
+        """
+        # Create the lock lazily so it belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                current_time = time.time()
+
+                # Remove timestamps outside the window
+                while self.request_timestamps and self.request_timestamps[0] < current_time - self.time_window:
+                    self.request_timestamps.popleft()
+
+                if len(self.request_timestamps) < self.max_requests:
+                    break
+
+                # Wait for the oldest request to expire. Holding the lock keeps later waiters in order.
+                wait_time = self.request_timestamps[0] + self.time_window - current_time
+                await asyncio.sleep(max(wait_time, 0))
+
+            self.request_timestamps.append(current_time)
+
+class AsyncApiClient:
+    """
+    Asyncio client for interacting with Hypixel and Mojang APIs.
+
+    Offers the same lookups as ApiClient as coroutines. All requests share one pooled
+    aiohttp session, so hundreds of lookups can be in flight on a single thread.
+    Errors are reported with the same exception types as ApiClient.
+
+    Use it as an async context manager, or call close() when done:
+
+        async with AsyncApiClient(api_key) as client:
+            uuid = await client.get_uuid("Player")
+    """
+
+    def __init__(self, api_key=None, uuid_cache: Optional[UuidCache] = None, max_connections: int = 100,
+                 hypixel_url: str = HYPIXEL_API_URL, mojang_url: str = MOJANG_API_URL) -> None:
+        """
+        Initialize the async API client.
+
+        Args:
+            api_key (str, optional): The Hypixel API key. If not provided,
+                                     attempts to get it from configuration.
+            uuid_cache (UuidCache, optional): Cache for username -> UUID lookups. If not provided,
+                                              the persistent cache next to config.ini is used.
+            max_connections: Maximum number of simultaneous connections in the session pool.
+            hypixel_url: Base URL of the Hypixel API.
+            mojang_url: Base URL of the Mojang API.
+        """
+        self.api_key = api_key or config.get_api_key()
+        self.max_connections = max_connections
+        self.hypixel_url = hypixel_url.rstrip('/')
+        self.mojang_url = mojang_url.rstrip('/')
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.decode_json = json_utils.get_decoder()
+        self.decode_player_json = json_utils.get_projecting_decoder(
+            ['success', 'cause'] + [f"player.{path}" for path in stats_schema.PLAYER_FIELDS]
+        )
+
+        if uuid_cache is None:
+            uuid_cache = UuidCache(config.UUID_CACHE_FILE, config.get_uuid_cache_ttl())
+        self.uuid_cache = uuid_cache
+
+        # Same budgets as ApiClient: Hypixel 300 per 5 minutes, Mojang 600 per 10 minutes
+        self.rate_limiter = AsyncRateLimiter(300, 300)
+        self.mojang_limiter = AsyncRateLimiter(600, 600)
+
+        # Identical requests made at the same time share one network round-trip
+        self._inflight: Dict[Hashable, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        """
+        Enter the async context manager.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """
+        Close the client when leaving the async context manager.
+        """
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use inside the running event loop.
+
+        Returns:
+            aiohttp.ClientSession: The pooled session.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             limit_per_host=config.get_max_connections_per_host())
+            timeout = aiohttp.ClientTimeout(sock_connect=config.get_connect_timeout(),
+                                            sock_read=config.get_read_timeout())
+            encoding = 'gzip, deflate' if config.get_accept_gzip() else 'identity'
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                 headers={'Accept-Encoding': encoding})
+        return self.session
+
+    async def close(self) -> None:
+        """
+        Close the HTTP session and release the cache files.
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.uuid_cache.close()
+
+    async def _make_request(self, url: str, params: Optional[Dict[str, str]] = None, is_hypixel: bool = True,
+                            decoder: Optional[json_utils.JsonDecoder] = None) -> Dict[str, Any]:
+        """
+        Make an HTTP GET request to the specified URL with parameters.
+
+        Args:
+            url: The URL to make the request to.
+            params: Optional dictionary of query parameters.
+            is_hypixel: Whether this is a Hypixel API request (True) or a Mojang API request (False).
+            decoder: Optional function to decode the response body, instead of the default JSON decoder.
+
+        Returns:
+            Dict[str, Any]: The JSON response from the API.
+
+        Raises:
+            requests.RequestException: For any request-related errors.
+            ValueError: For API errors (non-200 status codes).
+        """
+        # Concurrent callers asking for the same thing share one request and its result or error
+        key = (url, tuple(sorted((params or {}).items())), is_hypixel, decoder)
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._send_request(url, params, is_hypixel, decoder))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield the shared request so one caller being cancelled doesn't cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _send_request(self, url: str, params: Optional[Dict[str, str]], is_hypixel: bool,
+                            decoder: Optional[json_utils.JsonDecoder] = None) -> Dict[str, Any]:
+        """
+        Send a single rate-limited HTTP request and decode the response.
+        See _make_request for the arguments and errors.
+        """
+        # Apply rate limiting based on which API we're calling
+        if is_hypixel:
+            await self.rate_limiter.wait_if_needed()
+        else:
+            await self.mojang_limiter.wait_if_needed()
+
+        try:
+            async with self._get_session().get(url, params=params) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    raise ValueError(f"API request failed with status code {response.status}: {text}")
+
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise requests.RequestException(f"Request to {url} failed: {str(e)}")
+
+        try:
+            response_json = (decoder or self.decode_json)(body)
+        except ValueError as e:
+            # A 200 with a body that isn't JSON, e.g. a proxy error page, is an outage
+            # rather than a sign that the player doesn't exist
+            raise ServiceUnavailableError(f"Request to {url} failed: Invalid JSON in response: {str(e)}")
+
+        # Handle Hypixel API specific error responses
+        if 'success' in response_json and not response_json['success']:
+            error_msg = response_json.get('cause', 'Unknown API error')
+            raise ValueError(f"API request failed: {error_msg}")
+
+        return response_json
+
+    async def get_uuid(self, username: str) -> str:
+        """
+        Get a player's UUID from their Minecraft username using the Mojang API.
+        Previously resolved usernames are served from the UUID cache without a request.
+
+        Args:
+            username: The Minecraft username.
+
+        Returns:
+            str: The player's UUID.
+
+        Raises:
+            ValueError: If the player doesn't exist or API request fails.
+            requests.RequestException: For any request-related errors.
+        """
+        cached_uuid = self.uuid_cache.get(username)
+        if cached_uuid:
+            return cached_uuid
+
+        url = f"{self.mojang_url}/users/profiles/minecraft/{username}"
+
+        try:
+            response = await self._make_request(url, is_hypixel=False)
+
+            if not response or 'id' not in response:
+                raise ValueError(f"Player '{username}' not found")
+
+            self.uuid_cache.put(username, response['id'])
+            return response['id']
+        except requests.RequestException as e:
+            raise requests.RequestException(f"Failed to get UUID for {username}: {str(e)}")
+        except ValueError as e:
+            raise ValueError(f"Failed to get UUID for {username}: {str(e)}")
+
+    async def get_player_stats(self, uuid: str) -> Dict[str, Any]:
+        """
+        Get a player's statistics from the Hypixel API.
+
+        Args:
+            uuid: The player's UUID.
+
+        Returns:
+            Dict[str, Any]: The player's statistics, limited to stats_schema.PLAYER_FIELDS.
+
+        Raises:
+            ValueError: If the player doesn't exist or API request fails.
+            requests.RequestException: For any request-related errors.
+        """
+        url = f"{self.hypixel_url}/player"
+        params = {
+            "key": self.api_key,
+            "uuid": uuid
+        }
+
+        try:
+            response = await self._make_request(url, params, is_hypixel=True, decoder=self.decode_player_json)
+
+            if not response.get('player'):
+                raise ValueError(f"Player with UUID '{uuid}' not found")
+
+            return response['player']
+        except requests.RequestException as e:
+            raise requests.RequestException(f"Failed to get stats for player {uuid}: {str(e)}")
+        except ValueError as e:
+            raise ValueError(f"Failed to get stats for player {uuid}: {str(e)}")
+
+    async def get_player_status(self, uuid: str) -> Dict[str, Any]:
+        """
+        Get a player's online status from the Hypixel API.
+
+        Args:
+            uuid: The player's UUID.
+
+        Returns:
+            Dict[str, Any]: The player's online status.
+
+        Raises:
+            ValueError: If the API request fails.
+            requests.RequestException: For any request-related errors.
+        """
+        url = f"{self.hypixel_url}/status"
+        params = {
+            "key": self.api_key,
+            "uuid": uuid
+        }
+
+        try:
+            response = await self._make_request(url, params, is_hypixel=True)
+
+            return response['session']
+        except requests.RequestException as e:
+            raise requests.RequestException(f"Failed to get status for player {uuid}: {str(e)}")
+        except ValueError as e:
+            raise ValueError(f"Failed to get status for player {uuid}: {str(e)}")
+        except KeyError:
+            # This is a special case where the API might return success: true but no session
+            raise ValueError(f"Session data for player {uuid} not available")
+
+    async def verify_api_key(self) -> bool:
+        """
+        Verify that the API key is valid by making a test request.
+
+        Returns:
+            bool: True if the API key is valid, False otherwise.
+        """
+        url = f"{self.hypixel_url}/key"
+        params = {"key": self.api_key}
+
+        try:
+            response = await self._make_request(url, params, is_hypixel=True)
+
+            if response.get('success', False):
+                key_owner = response.get('record', {}).get('owner', 'Unknown')
+                print(f"API Key validated successfully. Owner: {key_owner}")
+                return True
+
+            print(f"API Key validation failed: {response.get('cause', 'Unknown error')}")
+        except (ValueError, requests.RequestException) as e:
+            print(f"API Key validation error with /key endpoint: {str(e)}")
+
+        # The key endpoint might be deprecated, so fall back to a known player lookup
+        return await self._try_alternative_validation()
+
+    async def _try_alternative_validation(self) -> bool:
+        """
+        Alternative method to validate API key if the primary method fails.
+        Uses the player endpoint with a known existing player UUID (Hypixel's own account).
+
+        Returns:
+            bool: True if the API key is valid, False otherwise.
+        """
+        hypixel_uuid = "f7c77d999f154a66a87dc4a51ef30d19"
+        url = f"{self.hypixel_url}/player"
+        params = {
+            "key": self.api_key,
+            "uuid": hypixel_uuid
+        }
+
+        try:
+            response = await self._make_request(url, params, is_hypixel=True)
+            valid = response.get('success', False)
+
+            if valid:
+                print("API Key validated successfully using alternative method")
+            else:
+                print(f"Alternative API Key validation failed: {response.get('cause', 'Unknown error')}")
+
+            return valid
+        except (ValueError, requests.RequestException) as e:
+            print(f"Alternative API Key validation error: {str(e)}")
+            return False
@@ -0,0 +1,321 @@
+"""
+Caching utilities for the Hypixel Stats Companion App.
+Keeps API results around so repeat lobbies don't cost extra requests.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class UuidCache:
+    """
+    Persistent username -> UUID cache.
+
+    Entries are held in memory for fast lookups and written through to a small
+    SQLite database so they survive application restarts. Usernames are matched
+    case-insensitively, the same way Mojang treats them.
+
+    All access is guarded by a lock so the cache can be shared between threads.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl: int = 7 * 24 * 60 * 60) -> None:
+        """
+        Initialize the UUID cache.
+
+        Args:
+            db_path: Path to the SQLite database file. If None, the cache is memory-only.
+            ttl: How long an entry stays valid, in seconds. 0 disables caching.
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[str, float]] = {}  # lowercase name -> (uuid, stored_at)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if db_path and ttl > 0:
+            self._open()
+
+    def _open(self) -> None:
+        """
+        Open the database and load all entries that haven't expired yet.
+        Falls back to a memory-only cache if the database can't be used.
+        """
+        try:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS uuid_cache ("
+                "username TEXT PRIMARY KEY, uuid TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+            # Drop expired rows so the file doesn't grow forever
+            cutoff = time.time() - self.ttl
+            self._conn.execute("DELETE FROM uuid_cache WHERE stored_at < ?", (cutoff,))
+            self._conn.commit()
+
+            for username, uuid, stored_at in self._conn.execute("SELECT username, uuid, stored_at FROM uuid_cache"):
+                self._entries[username] = (uuid, stored_at)
+        except sqlite3.Error as e:
+            print(f"Error opening UUID cache at {self.db_path}: {str(e)}")
+            self.close()
+
+    def get(self, username: str) -> Optional[str]:
+        """
+        Look up the cached UUID for a username.
+
+        Args:
+            username: The Minecraft username.
+
+        Returns:
+            Optional[str]: The cached UUID, or None if missing or expired.
+        """
+        if self.ttl <= 0:
+            return None
+
+        key = username.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            uuid, stored_at = entry
+            if stored_at < time.time() - self.ttl:
+                del self._entries[key]
+                return None
+
+            return uuid
+
+    def put(self, username: str, uuid: str) -> None:
+        """
+        Store a resolved UUID for a username.
+
+        Args:
+            username: The Minecraft username.
+            uuid: The player's UUID.
+        """
+        if self.ttl <= 0:
+            return
+
+        key = username.lower()
+        stored_at = time.time()
+        with self._lock:
+            self._entries[key] = (uuid, stored_at)
+
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO uuid_cache (username, uuid, stored_at) VALUES (?, ?, ?)",
+                        (key, uuid, stored_at)
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing to UUID cache: {str(e)}")
+
+    def invalidate(self, username: str) -> None:
+        """
+        Remove a username from the cache.
+
+        Args:
+            username: The Minecraft username.
+        """
+        key = username.lower()
+        with self._lock:
+            self._entries.pop(key, None)
+
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM uuid_cache WHERE username = ?", (key,))
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing to UUID cache: {str(e)}")
+
+    def __len__(self) -> int:
+        """
+        Get the number of entries currently held in memory.
+        """
+        with self._lock:
+            return len(self._entries)
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection. The in-memory entries stay usable.
+        """
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            finally:
+                self._conn = None
+
+class TTLCache:
+    """
+    Bounded in-memory LRU cache with time-based expiry.
+    
+    Each entry is fresh for `ttl` seconds after it is stored. If `stale_ttl` is set,
+    the entry is then kept as stale for that many extra seconds, so callers can serve it
+    immediately while they refresh it in the background (stale-while-revalidate).
+    When the cache is full, the least recently used entry is evicted.
+    
+    All access is guarded by a lock so the cache can be shared between threads.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 120, stale_ttl: float = 0) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of entries to keep.
+            ttl: How long an entry stays fresh, in seconds.
+            stale_ttl: How long an entry may be served as stale after it stops being fresh, in seconds.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """
+        Look up an entry.
+        
+        Args:
+            key: The cache key.
+            
+        Returns:
+            Optional[Tuple[Any, bool]]: The cached value and whether it is still fresh,
+                                        or None if the key is missing or fully expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            
+            if age >= self.ttl + self.stale_ttl:
+                del self._entries[key]
+                return None
+            
+            # Mark as recently used
+            self._entries.move_to_end(key)
+            return value, age < self.ttl
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used one if the cache is full.
+        
+        Args:
+            key: The cache key.
+            value: The value to store.
+        """
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove an entry from the cache.
+        
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        """
+        Get the number of entries currently held, including expired ones not yet evicted.
+        """
+        with self._lock:
+            return len(self._entries)
+
+class FingerprintCache:
+    """
+    Bounded in-memory LRU memo of values computed from changing data.
+    
+    Each key (e.g. a player's UUID) holds one value together with a fingerprint of the
+    data it was computed from. A lookup only hits while the caller's fingerprint still
+    equals the stored one, so a changed player is recomputed and replaces the old entry.
+    When the cache is full, the least recently used entry is evicted.
+    
+    All access is guarded by a lock so the cache can be shared between threads.
+    """
+    
+    def __init__(self, max_entries: int = 512) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of entries to keep.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()  # key -> (fingerprint, value)
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, fingerprint: Any) -> Optional[Any]:
+        """
+        Look up the value computed for a key from data with the given fingerprint.
+        
+        Args:
+            key: The cache key.
+            fingerprint: Fingerprint of the current data; compared with ==.
+            
+        Returns:
+            Optional[Any]: The cached value, or None if the key is missing or its data has changed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                return None
+            
+            # Mark as recently used
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: Hashable, fingerprint: Any, value: Any) -> None:
+        """
+        Store the value computed for a key, replacing any older one.
+        
+        Args:
+            key: The cache key.
+            fingerprint: Fingerprint of the data the value was computed from.
+            value: The value to store.
+        """
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        """
+        Get the number of entries currently held.
+        """
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,181 @@
+"""
+Leveling for Hypixel Stats Companion.
+Converts Bedwars and network experience to stars and levels, and back, using precomputed tables.
+"""
+import math
+from bisect import bisect_right
+from typing import Any, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the batch functions loop in Python without it
+    np = None
+
+# Bedwars: every prestige has 100 stars. The first four stars of a prestige need less experience.
+BEDWARS_STARS_PER_PRESTIGE = 100
+BEDWARS_WARMUP_XP = (500, 1000, 2000, 3500)
+BEDWARS_STAR_XP = 5000
+BEDWARS_XP_PER_PRESTIGE = sum(BEDWARS_WARMUP_XP) + (BEDWARS_STARS_PER_PRESTIGE - len(BEDWARS_WARMUP_XP)) * BEDWARS_STAR_XP
+
+def _build_prestige_table() -> List[int]:
+    """
+    Build the experience needed for each star of a prestige, counted from the start of the prestige.
+
+    Returns:
+        List[int]: BEDWARS_STARS_PER_PRESTIGE + 1 entries; the last one is BEDWARS_XP_PER_PRESTIGE.
+    """
+    table = [0]
+    for star in range(BEDWARS_STARS_PER_PRESTIGE):
+        cost = BEDWARS_WARMUP_XP[star] if star < len(BEDWARS_WARMUP_XP) else BEDWARS_STAR_XP
+        table.append(table[-1] + cost)
+    return table
+
+_PRESTIGE_XP = _build_prestige_table()
+_PRESTIGE_XP_ARRAY = np.array(_PRESTIGE_XP, dtype=np.float64) if np is not None else None
+
+# Network level: level = (√(exp + 15312.5) - 125/√2) / (25√2), with the constants precomputed
+_NETWORK_XP_OFFSET = 15312.5
+_NETWORK_LEVEL_OFFSET = 125 / math.sqrt(2)
+_NETWORK_LEVEL_SCALE = 25 * math.sqrt(2)
+
+def get_bedwars_star(experience: int) -> int:
+    """
+    Get the Bedwars star for an amount of Bedwars experience.
+
+    Args:
+        experience: The player's Bedwars experience.
+
+    Returns:
+        int: The star. 0 for no or negative experience.
+    """
+    if experience <= 0:
+        return 0
+
+    prestige, remainder = divmod(int(experience), BEDWARS_XP_PER_PRESTIGE)
+    return prestige * BEDWARS_STARS_PER_PRESTIGE + bisect_right(_PRESTIGE_XP, remainder) - 1
+
+def get_bedwars_level(experience: int) -> float:
+    """
+    Get the Bedwars star for an amount of experience, including the progress towards the next star.
+
+    Args:
+        experience: The player's Bedwars experience.
+
+    Returns:
+        float: The star plus the fraction of the next star already earned, e.g. 104.5.
+    """
+    star = get_bedwars_star(experience)
+    if experience <= 0:
+        return 0.0
+
+    start = get_bedwars_xp_for_star(star)
+    cost = get_bedwars_xp_for_star(star + 1) - start
+    return star + (experience - start) / cost
+
+def get_bedwars_xp_for_star(star: int) -> int:
+    """
+    Get the total Bedwars experience needed to reach a star.
+
+    Args:
+        star: The star.
+
+    Returns:
+        int: The experience needed. 0 for star 0 and below.
+    """
+    if star <= 0:
+        return 0
+
+    prestige, star_in_prestige = divmod(star, BEDWARS_STARS_PER_PRESTIGE)
+    return prestige * BEDWARS_XP_PER_PRESTIGE + _PRESTIGE_XP[star_in_prestige]
+
+def get_bedwars_xp_to_next_star(experience: int) -> int:
+    """
+    Get how much Bedwars experience is missing for the next star.
+
+    Args:
+        experience: The player's Bedwars experience.
+
+    Returns:
+        int: The experience still needed.
+    """
+    return get_bedwars_xp_for_star(get_bedwars_star(experience) + 1) - max(int(experience), 0)
+
+def get_network_level(experience: float) -> float:
+    """
+    Get the exact Hypixel network level for an amount of network experience.
+
+    Args:
+        experience: The player's network experience.
+
+    Returns:
+        float: The unrounded network level, at least 1.0.
+    """
+    if experience <= 0:
+        return 1.0
+
+    level = (math.sqrt(experience + _NETWORK_XP_OFFSET) - _NETWORK_LEVEL_OFFSET) / _NETWORK_LEVEL_SCALE
+    return max(1.0, level)
+
+def get_network_xp_for_level(level: float) -> float:
+    """
+    Get the total network experience needed to reach a network level.
+
+    Args:
+        level: The network level; fractions are allowed.
+
+    Returns:
+        float: The experience needed. 0 for level 1 and below.
+    """
+    if level <= 1:
+        return 0.0
+
+    return (level * _NETWORK_LEVEL_SCALE + _NETWORK_LEVEL_OFFSET) ** 2 - _NETWORK_XP_OFFSET
+
+def get_network_xp_to_next_level(experience: float) -> float:
+    """
+    Get how much network experience is missing for the next whole network level.
+
+    Args:
+        experience: The player's network experience.
+
+    Returns:
+        float: The experience still needed.
+    """
+    next_level = math.floor(get_network_level(experience)) + 1
+    return get_network_xp_for_level(next_level) - max(experience, 0.0)
+
+def get_bedwars_stars_batch(experience: Sequence[float]) -> Any:
+    """
+    Get the Bedwars stars for many amounts of experience at once (see get_bedwars_star).
+
+    Args:
+        experience: The experience values, e.g. a NumPy array.
+
+    Returns:
+        Any: The stars, as an int64 NumPy array if NumPy is installed, a list otherwise.
+    """
+    if np is None:
+        return [get_bedwars_star(value) for value in experience]
+
+    experience = np.maximum(np.floor(np.asarray(experience, dtype=np.float64)), 0.0)
+    prestige, remainder = np.divmod(experience, BEDWARS_XP_PER_PRESTIGE)
+    star_in_prestige = np.searchsorted(_PRESTIGE_XP_ARRAY, remainder, side='right') - 1
+    return (prestige * BEDWARS_STARS_PER_PRESTIGE + star_in_prestige).astype(np.int64)
+
+def get_network_levels_batch(experience: Sequence[float]) -> Any:
+    """
+    Get the exact network levels for many amounts of experience at once (see get_network_level).
+
+    Args:
+        experience: The experience values, e.g. a NumPy array.
+
+    Returns:
+        Any: The unrounded levels, as a NumPy array if NumPy is installed, a list otherwise.
+    """
+    if np is None:
+        return [get_network_level(value) for value in experience]
+
+    experience = np.asarray(experience, dtype=np.float64)
+    level = (np.sqrt(np.maximum(experience, 0.0) + _NETWORK_XP_OFFSET) - _NETWORK_LEVEL_OFFSET) / _NETWORK_LEVEL_SCALE
+    # NaN comparisons are False, so NaN stays NaN for the caller to handle
+    return np.where(experience <= 0, 1.0, np.maximum(level, 1.0))
@@ -2,16 +2,453 @@
 Log Monitor for Hypixel Stats Companion.
 Monitors Minecraft log file for Hypixel /who command output.
 """
+import datetime
 import os
 import re
+import threading
 import time
-from typing import Callable, List, Optional, Set, Dict
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileModifiedEvent
 
 from src.utils import config
 
+# Largest block read from the log file at once
+READ_CHUNK_SIZE = 64 * 1024
+# Longest line kept while waiting for its newline; longer lines are skipped
+MAX_LINE_LENGTH = 1024 * 1024
+# Bytes at the start of the log file used to tell a new log from the one being followed
+HEAD_SIZE = 256
+
+def _file_identity(stat_result: os.stat_result) -> Tuple[int, int]:
+    """
+    Get the (device, inode) pair identifying a file, also across renames.
+    """
+    return stat_result.st_dev, stat_result.st_ino
+
+class LogTailer:
+    """
+    Reads the lines appended to a log file.
+
+    The file is kept open in binary mode between reads and read in blocks of at most
+    chunk_size bytes, so catching up on a lot of new output doesn't load it into memory
+    at once. A line Minecraft is still writing is held back until its newline arrives;
+    only complete lines are decoded.
+
+    When Minecraft starts a new log the tailer follows it from the start. A log moved
+    away and replaced is told apart by its device and inode; the rest of the old file is
+    read first. A log truncated in place (copied away, which is what happens when the
+    rename fails) is told apart by its first HEAD_SIZE bytes or by having become shorter.
+    """
+
+    def __init__(self, path: str, position: int = 0, chunk_size: int = READ_CHUNK_SIZE) -> None:
+        """
+        Initialize the tailer. The file is opened on the first read.
+
+        Args:
+            path: Path of the log file.
+            position: Offset in the file to start reading from.
+            chunk_size: Largest number of bytes to read at once.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.offset = position  # Bytes of the file read so far
+        self._file: Optional[BinaryIO] = None
+        self._identity: Optional[Tuple[int, int]] = None  # Device and inode of the file being followed
+        self._head = b''  # First bytes of the file being followed
+        self._partial = b''  # Start of a line whose newline hasn't been written yet
+        self._skipping = False  # Whether the rest of an overlong line is being skipped
+
+    @property
+    def position(self) -> int:
+        """
+        Offset just past the last complete line that was read.
+        """
+        return self.offset - len(self._partial)
+
+    def changed(self) -> bool:
+        """
+        Check whether the file at the path was written to, truncated or replaced since the last read.
+
+        Returns:
+            bool: True if a read might return new lines.
+
+        Raises:
+            OSError: If the file can't be accessed.
+        """
+        stat_result = os.stat(self.path)
+        return stat_result.st_size != self.offset or _file_identity(stat_result) != self._identity
+
+    def read_lines(self) -> Iterator[str]:
+        """
+        Read the complete lines written since the last read.
+
+        The generator has to be exhausted; lines of a block that aren't consumed are lost.
+
+        Yields:
+            str: Each new line, without its line ending.
+
+        Raises:
+            OSError: If the file can't be opened or read.
+        """
+        if self._file is None:
+            self._open()
+        elif self._is_replaced():
+            # Finish the old log, including a last line without a newline, then follow the new one
+            yield from self._read_available()
+            if self._partial and not self._skipping:
+                yield self._partial.decode('utf-8', errors='replace').rstrip('\r')
+            self.close()
+            self._start_over()
+            self._open()
+
+        if not self._is_same_file():
+            self._start_over()
+
+        yield from self._read_available()
+
+    def close(self) -> None:
+        """
+        Close the file. The next read opens it again at the same offset, or at the start if it was replaced.
+        """
+        if self._file is not None:
+            try:
+                self._file.close()
+            finally:
+                self._file = None
+
+    def _open(self) -> None:
+        """
+        Open the file at the path and seek to the current offset.
+        """
+        self._file = open(self.path, 'rb')
+        identity = _file_identity(os.fstat(self._file.fileno()))
+        if self._identity is not None and identity != self._identity:
+            # Reopened a different file than the one followed so far
+            self._start_over()
+        self._identity = identity
+        self._file.seek(self.offset)
+
+    def _is_replaced(self) -> bool:
+        """
+        Check whether another file was put at the path than the one held open.
+
+        Returns:
+            bool: True if the path now names a different file.
+        """
+        try:
+            stat_result = os.stat(self.path)
+        except FileNotFoundError:
+            # Moved away and not recreated yet; keep reading the old file
+            return False
+        return _file_identity(stat_result) != self._identity
+
+    def _is_same_file(self) -> bool:
+        """
+        Check that the open file still holds the log read so far, and hasn't been truncated.
+
+        Returns:
+            bool: False if the file got shorter or its first bytes changed.
+        """
+        if os.fstat(self._file.fileno()).st_size < self.offset:
+            return False
+
+        self._file.seek(0)
+        head = self._file.read(HEAD_SIZE)
+        self._file.seek(self.offset)
+
+        if head[:len(self._head)] != self._head:
+            return False
+        self._head = head
+        return True
+
+    def _start_over(self) -> None:
+        """
+        Forget the position in the file followed so far and continue at the start.
+        """
+        self.offset = 0
+        self._head = b''
+        self._partial = b''
+        self._skipping = False
+        if self._file is not None:
+            self._file.seek(0)
+
+    def _read_available(self) -> Iterator[str]:
+        """
+        Read the complete lines between the offset and the end of the open file.
+
+        Yields:
+            str: Each line, without its line ending.
+        """
+        while True:
+            chunk = self._file.read(self.chunk_size)
+            if not chunk:
+                return
+            self.offset += len(chunk)
+
+            end = chunk.rfind(b'\n')
+            if end < 0:
+                self._hold(chunk)
+                continue
+
+            data = self._partial + chunk[:end + 1]
+            self._partial = b''
+            if self._skipping:
+                # Drop the end of the overlong line
+                data = data[data.find(b'\n') + 1:]
+                self._skipping = False
+            self._hold(chunk[end + 1:])
+
+            yield from data.decode('utf-8', errors='replace').splitlines()
+
+    def _hold(self, data: bytes) -> None:
+        """
+        Keep the start of an incomplete line for the next read.
+
+        Args:
+            data: Bytes after the last newline read.
+        """
+        if self._skipping:
+            return
+
+        self._partial += data
+        if len(self._partial) > MAX_LINE_LENGTH:
+            print(f"Skipping log line longer than {MAX_LINE_LENGTH} bytes")
+            self._partial = b''
+            self._skipping = True
+
+# Kinds of log lines the line classifier recognizes
+LOBBY_JOIN = 'lobby_join'
+GAME_START = 'game_start'
+TEAM_CHAT = 'team_chat'
+TEAM_JOIN = 'team_join'
+WHO = 'who'
+PLAYER_JOIN = 'player_join'
+FINAL_KILL = 'final_kill'
+BED_DESTROYED = 'bed_destroyed'
+
+# Team of players seen in team chat, and of the player's own bed
+YOUR_TEAM = 'YOUR_TEAM'
+
+class LobbyJoined(NamedTuple):
+    """The player joined a lobby."""
+    timestamp: Optional[datetime.time]
+
+class GameStarted(NamedTuple):
+    """The game started."""
+    timestamp: Optional[datetime.time]
+
+class WhoList(NamedTuple):
+    """Output of the /who command."""
+    timestamp: Optional[datetime.time]
+    players: Tuple[str, ...]
+
+class TeamAssigned(NamedTuple):
+    """A player's team became known, from a team join or team chat message."""
+    timestamp: Optional[datetime.time]
+    player: str
+    team: str  # Upper-case team color, or YOUR_TEAM for players seen in team chat
+
+class PlayerJoined(NamedTuple):
+    """A player joined the game's waiting lobby."""
+    timestamp: Optional[datetime.time]
+    player: str
+
+class FinalKill(NamedTuple):
+    """A player was final killed."""
+    timestamp: Optional[datetime.time]
+    player: str
+    killer: Optional[str]  # None for deaths without a killer, e.g. falling into the void
+
+class BedDestroyed(NamedTuple):
+    """A team's bed was destroyed."""
+    timestamp: Optional[datetime.time]
+    team: str  # Upper-case team color, or YOUR_TEAM for the player's own bed
+    player: str
+
+LogEvent = Union[LobbyJoined, GameStarted, WhoList, TeamAssigned, PlayerJoined, FinalKill, BedDestroyed]
+
+# Time of day at the start of every log line, e.g. "[12:34:56] [Client thread/INFO]: ..."
+TIMESTAMP_PATTERN = re.compile(r"\[(\d{2}):(\d{2}):(\d{2})\]")
+
+# Formatting codes, garbled characters and trailing junk removed from player names
+_FORMATTING_CODE_PATTERN = re.compile(r'§[0-9a-fklmnor]')
+_CONTROL_CHARACTER_PATTERN = re.compile(r'[\x00-\x1F\x7F-\xFF]')
+_TRAILING_JUNK_PATTERN = re.compile(r'[^a-zA-Z0-9_]+$')
+
+def strip_minecraft_formatting(text: str) -> str:
+    """
+    Strip Minecraft formatting codes from text.
+    
+    Args:
+        text: Text that may contain Minecraft formatting codes.
+        
+    Returns:
+        str: Text with formatting codes removed.
+    """
+    # First handle standard Minecraft color codes (§ followed by a color code)
+    clean_text = _FORMATTING_CODE_PATTERN.sub('', text)
+    
+    # Handle corrupted encoding sequences that might appear in log files
+    # This includes characters that might be malformed in UTF-8
+    clean_text = _CONTROL_CHARACTER_PATTERN.sub('', clean_text)
+    
+    # As a final cleanup, remove any non-alphanumeric characters from the end
+    # This catches any remaining weird sequences at the end of names
+    clean_text = _TRAILING_JUNK_PATTERN.sub('', clean_text)
+    
+    return clean_text
+
+def split_who_players(players_text: str) -> List[str]:
+    """
+    Split the player list of /who command output into clean player names.
+
+    Args:
+        players_text: The comma-separated player names after "ONLINE:".
+
+    Returns:
+        List[str]: The player names; empty for "None".
+    """
+    players_text = players_text.strip()
+    
+    # If there are no players, return an empty list
+    if not players_text or players_text == "None":
+        return []
+    
+    # Split by comma, filter out any empty names and strip formatting codes
+    return [strip_minecraft_formatting(name) for name in (name.strip() for name in players_text.split(',')) if name]
+
+def parse_timestamp(line: str) -> Optional[datetime.time]:
+    """
+    Get the time of day from the prefix of a log line.
+
+    Args:
+        line: A single line from the log file.
+
+    Returns:
+        Optional[datetime.time]: The time, or None if the line has no valid timestamp prefix.
+    """
+    match = TIMESTAMP_PATTERN.match(line)
+    if match is None:
+        return None
+    try:
+        return datetime.time(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+class LineClassifier:
+    """
+    Classifies log lines in a single pass.
+
+    Nearly every line in a busy lobby is chat none of the patterns match. Those lines are
+    rejected with plain substring checks, which are much cheaper than a regex scan. The
+    remaining lines are searched once with a regex combining all patterns; the named
+    group that matched tells the kind of line. A line gets at most one kind, from the
+    match that starts first in the line.
+    """
+
+    PATTERN = re.compile(
+        rf"(?P<{LOBBY_JOIN}>You joined the lobby!)"
+        rf"|(?P<{GAME_START}>The game has started!)"
+        rf"|(?P<{TEAM_CHAT}>\[TEAM\] (?P<team_chat_player>\w+))"
+        rf"|(?P<{TEAM_JOIN}>(?P<team_join_player>\w+) has joined the (?P<team_color>\w+) team)"
+        rf"|(?P<{PLAYER_JOIN}>(?P<joined_player>\w+) has joined \(\d+/\d+\)!)"
+        rf"|(?P<{BED_DESTROYED}>BED DESTRUCTION > (?P<bed_team>\w+) Bed .*?by (?P<bed_player>\w+))"
+        # Kill messages vary ("was slain by", "fell into the void"); the killer follows "by".
+        # The victim's name starts the message, right after the "[CHAT] " prefix.
+        rf"|(?P<{FINAL_KILL}>(?:^|(?<=\] ))(?P<final_player>\w+) [^.:\]]*?(?:by (?P<final_killer>\w+)[^.:\]]*)?\. FINAL KILL!)"
+        rf"|(?P<{WHO}>ONLINE:\s*(?P<who_players>.*?)(?:\s*\(\d+\))?$)"
+    )
+
+    def classify(self, line: str) -> Optional[Tuple[str, re.Match]]:
+        """
+        Classify a log line.
+
+        Args:
+            line: A single line from the log file.
+
+        Returns:
+            Optional[Tuple[str, re.Match]]: The kind of line (e.g. WHO) and the match, whose
+            named groups hold the details; None for lines of no interest.
+        """
+        # Every pattern contains one of these literals
+        if not ('ONLINE:' in line or '[TEAM]' in line or ' has joined ' in line or 'FINAL KILL!' in line
+                or 'BED DESTRUCTION' in line or 'You joined the lobby!' in line or 'The game has started!' in line):
+            return None
+
+        # Search from the message, after the "[12:34:56] [Client thread/INFO]: " prefix none of the patterns can match
+        prefix_end = line.find(']: ')
+        match = self.PATTERN.search(line, prefix_end + 3 if prefix_end >= 0 else 0)
+        if match is None:
+            return None
+        return match.lastgroup, match
+
+    def parse(self, line: str) -> Optional[LogEvent]:
+        """
+        Parse a log line into an event.
+
+        Args:
+            line: A single line from the log file.
+
+        Returns:
+            Optional[LogEvent]: The event, with clean player names and the line's timestamp;
+            None for lines of no interest.
+        """
+        classified = self.classify(line)
+        if classified is None:
+            return None
+
+        kind, match = classified
+        timestamp = parse_timestamp(line)
+        if kind == WHO:
+            return WhoList(timestamp, tuple(split_who_players(match.group('who_players'))))
+        if kind == LOBBY_JOIN:
+            return LobbyJoined(timestamp)
+        if kind == GAME_START:
+            return GameStarted(timestamp)
+        if kind == TEAM_CHAT:
+            # Someone is chatting in team chat, they're on the same team as the player
+            player = strip_minecraft_formatting(match.group('team_chat_player'))
+            return TeamAssigned(timestamp, player, YOUR_TEAM) if player else None
+        if kind == TEAM_JOIN:
+            return TeamAssigned(timestamp, strip_minecraft_formatting(match.group('team_join_player')),
+                                match.group('team_color').upper())
+        if kind == PLAYER_JOIN:
+            return PlayerJoined(timestamp, strip_minecraft_formatting(match.group('joined_player')))
+        if kind == FINAL_KILL:
+            killer = match.group('final_killer')
+            return FinalKill(timestamp, strip_minecraft_formatting(match.group('final_player')),
+                             strip_minecraft_formatting(killer) if killer else None)
+        # BED_DESTROYED
+        team = match.group('bed_team').upper()
+        return BedDestroyed(timestamp, YOUR_TEAM if team == 'YOUR' else team,
+                            strip_minecraft_formatting(match.group('bed_player')))
+
+# Used for parsing when no classifier is given
+_CLASSIFIER = LineClassifier()
+
+def parse_lines(lines: Iterable[str], classifier: Optional[LineClassifier] = None) -> Iterator[LogEvent]:
+    """
+    Parse log lines into events, e.g. to replay a saved log without running the monitor:
+    
+        with open('2024-01-01-1.log', encoding='utf-8', errors='replace') as f:
+            for event in parse_lines(f):
+                ...
+
+    Args:
+        lines: The log lines, with or without line endings.
+        classifier: The classifier to use.
+
+    Yields:
+        LogEvent: The event of each line that has one, in log order.
+    """
+    parse = (classifier or _CLASSIFIER).parse
+    for line in lines:
+        event = parse(line.rstrip('\r\n'))
+        if event is not None:
+            yield event
+
 class LogEventHandler(FileSystemEventHandler):
     """
     File system event handler for watching log file changes.
@@ -57,7 +494,6 @@ class LogMonitor:
         self.log_file_path = config.get_log_file_path()
         self.callback = callback
         self.team_callback = team_callback
-        self.last_position = 0
         self.observer = None
         self.running = False
         self.poll_interval = config.get_polling_interval()  # Get interval from config
@@ -67,30 +503,22 @@ class LogMonitor:
         self.all_players: Set[str] = set()
         self.last_lobby_change_time = 0  # Timestamp of last lobby change
         
-        # Regular expressions for parsing /who command output
-        # Example: "ONLINE: Player1, Player2, Player3"
-        self.who_pattern = re.compile(r"ONLINE:\s*(.*?)(?:\s*\(\d+\))?$")
-        
-        # Regular expression for team color detection in Bedwars
-        # Example: "[TEAM] Player1: message" or "Player1 has joined the RED team!"
-        self.team_color_pattern = re.compile(r"(?:\[TEAM\])|(?:has joined the (\w+) team)")
-        self.team_chat_pattern = re.compile(r"\[TEAM\] (\w+)")
-        self.team_join_pattern = re.compile(r"(\w+) has joined the (\w+) team")
-        
-        # Regex to detect lobby changes
-        self.lobby_join_pattern = re.compile(r"You joined the lobby!")
-        self.game_start_pattern = re.compile(r"The game has started!")
+        # Finds /who output, lobby changes, team information and other game events in one pass per line
+        self.classifier = LineClassifier()
         
         # Store player team colors
         self.player_teams: Dict[str, str] = {}
         
-        # Initialize the last position to the current file size if it exists
+        # Start reading at the current end of the file if it exists
+        start_position = 0
         if os.path.exists(self.log_file_path):
             try:
-                self.last_position = os.path.getsize(self.log_file_path)
+                start_position = os.path.getsize(self.log_file_path)
             except OSError as e:
                 print(f"Error getting file size: {str(e)}")
-                self.last_position = 0
+        self.tailer = LogTailer(self.log_file_path, start_position)
+        # The watchdog thread and the main thread's timer both read new lines
+        self._read_lock = threading.Lock()
                 
         print(f"Log monitor initialized with polling interval: {self.poll_interval} seconds")
     
@@ -195,6 +623,9 @@ class LogMonitor:
             finally:
                 self.observer = None
         
+        with self._read_lock:
+            self.tailer.close()
+        
         print("Stopped monitoring log file")
     
     def force_check(self) -> None:
@@ -220,65 +651,42 @@ class LogMonitor:
                 print(f"Log file not found: {self.log_file_path}")
                 return
             
-            # Get the current file size
-            current_size = os.path.getsize(self.log_file_path)
-            
-            # If the file has been truncated, reset position
-            if current_size < self.last_position:
-                self.last_position = 0
-            
-            # If there's no new content and we're not forcing a read, do nothing
-            if current_size <= self.last_position and not force_read:
-                return
-            
-            # If we're forcing a read but the file hasn't changed, try to reopen it
-            # This can help with buffering issues
-            if force_read and current_size == self.last_position:
-                # Only force-reread if we haven't successfully read in the last 10 seconds
-                current_time = time.time()
-                if current_time - self.last_successful_read < 10:
+            with self._read_lock:
+                # Check for new content, truncation or a new log file
+                changed = self.tailer.changed()
+                
+                # If there's no new content and we're not forcing a read, do nothing
+                if not changed and not force_read:
                     return
-                    
-                # Try to reopen the file and read from our last position
-                pass  # Continue to file reading code
-            
-            # Read new content - use a small buffer size to reduce OS buffering
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='replace') as f:
-                # Seek to the last position
-                f.seek(self.last_position)
                 
-                # Read new lines
-                new_content = f.read()
+                # If we're forcing a read but the file hasn't changed, try to reopen it
+                # This can help with buffering issues
+                if force_read and not changed:
+                    # Only force-reread if we haven't successfully read in the last 10 seconds
+                    current_time = time.time()
+                    if current_time - self.last_successful_read < 10:
+                        return
+                    
+                    # Reopen the file at our last position on the read below
+                    self.tailer.close()
                 
-                # Update the last position
-                self.last_position = f.tell()
+                # Process the events in each new complete line, reading the file in bounded chunks
+                players = []
+                for event in self.read_events():
+                    # Handle lobby changes and team colors, and extract player names from who command
+                    line_players = self._apply_event(event)
+                    if line_players:
+                        # Add these players to the running list
+                        for player in line_players:
+                            # Add to the set of all players
+                            self.all_players.add(player)
+                        
+                        # Add these players to the lobby update
+                        players.extend(line_players)
                 
                 # Update the last successful read timestamp
                 self.last_successful_read = time.time()
             
-            # Process each line for player names
-            players = []
-            for line in new_content.splitlines():
-                # Check for lobby changes
-                if self.lobby_join_pattern.search(line):
-                    self.reset_lobby()
-                elif self.game_start_pattern.search(line):
-                    self.reset_lobby()
-                
-                # Try to extract team color information
-                self._parse_team_color_info(line)
-                
-                # Try to extract player names from who command
-                line_players = self._parse_who_output(line)
-                if line_players:
-                    # Add these players to the running list
-                    for player in line_players:
-                        # Add to the set of all players
-                        self.all_players.add(player)
-                    
-                    # Add these players to the lobby update
-                    players.extend(line_players)
-            
             # If we have players, call the callback with all the accumulated players
             if players:
                 # Get a full list of all players that have been seen recently
@@ -296,57 +704,56 @@ class LogMonitor:
         except Exception as e:
             print(f"Error processing log file: {str(e)}")
     
-    def _strip_minecraft_formatting(self, text: str) -> str:
+    def read_events(self) -> Iterator[LogEvent]:
+        """
+        Read the events in the lines written to the log file since the last read.
+        
+        This only parses the lines; the player and team information and the callbacks are
+        updated by the monitor's own reads. Don't use it while the monitor is running, since
+        it shares the monitor's position in the file.
+        
+        Yields:
+            LogEvent: Each new event, in log order.
+            
+        Raises:
+            OSError: If the log file can't be opened or read.
+        """
+        return parse_lines(self.tailer.read_lines(), self.classifier)
+    
+    def _apply_event(self, event: LogEvent) -> Optional[List[str]]:
         """
-        Strip Minecraft formatting codes from text.
+        Update the player and team information from an event, calling the team callback.
         
         Args:
-            text: Text that may contain Minecraft formatting codes.
+            event: An event from the log.
             
         Returns:
-            str: Text with formatting codes removed.
+            Optional[List[str]]: The known players if the event is /who output, None otherwise.
         """
-        # First handle standard Minecraft color codes (§ followed by a color code)
-        clean_text = re.sub(r'§[0-9a-fklmnor]', '', text)
-        
-        # Handle corrupted encoding sequences that might appear in log files
-        # This includes characters that might be malformed in UTF-8
-        clean_text = re.sub(r'[\x00-\x1F\x7F-\xFF]', '', clean_text)
-        
-        # As a final cleanup, remove any non-alphanumeric characters from the end
-        # This catches any remaining weird sequences at the end of names
-        clean_text = re.sub(r'[^a-zA-Z0-9_]+$', '', clean_text)
-        
-        return clean_text
+        if isinstance(event, WhoList):
+            return self._add_who_players(list(event.players))
+        if isinstance(event, (LobbyJoined, GameStarted)):
+            self.reset_lobby()
+        elif isinstance(event, TeamAssigned):
+            if event.team == YOUR_TEAM:
+                self._add_team_chat_player(event.player)
+            else:
+                self._add_team_join(event.player, event.team)
+        return None
     
-    def _parse_who_output(self, line: str) -> Optional[List[str]]:
+    def _add_who_players(self, player_names: List[str]) -> List[str]:
         """
-        Parse a log line to check if it matches the Hypixel /who command output.
+        Add the players listed in /who command output.
         
         Args:
-            line: A single line from the log file.
+            player_names: The clean player names.
             
         Returns:
-            List[str]: List of player names if the line matches, None otherwise.
+            List[str]: The complete current known player list; empty if no players were listed.
         """
-        # Check if the line matches the /who command output pattern
-        match = self.who_pattern.search(line)
-        if not match:
-            return None
-        
-        # Extract the player names part
-        players_text = match.group(1).strip()
-        
-        # If there are no players, return an empty list
-        if not players_text or players_text == "None":
+        if not player_names:
             return []
         
-        # Split by comma and clean up each name
-        player_names = [name.strip() for name in players_text.split(',')]
-        
-        # Filter out any empty names and strip formatting codes
-        player_names = [self._strip_minecraft_formatting(name) for name in player_names if name]
-        
         # Print debug info about detected players
         print(f"Detected {len(player_names)} players in /who command")
         
@@ -360,52 +767,43 @@ class LogMonitor:
         # Return the complete current known player list
         return list(self.all_players)
     
-    def _parse_team_color_info(self, line: str) -> bool:
+    def _add_team_chat_player(self, player_name: str) -> bool:
         """
-        Parse a log line to extract team color information.
+        Record a player seen in team chat as being on the player's team.
         
         Args:
-            line: A single line from the log file.
+            player_name: The clean player name.
             
         Returns:
-            bool: True if team color information was found, False otherwise.
+            bool: True if the player wasn't known to be on a team yet, False otherwise.
         """
-        found_team_info = False
-        
-        # Check for team chat messages
-        team_chat_match = self.team_chat_pattern.search(line)
-        if team_chat_match:
-            # Someone is chatting in team chat, they're on the same team as the player
-            player_name = team_chat_match.group(1)
-            if player_name:
-                # Clean the player name
-                player_name = self._strip_minecraft_formatting(player_name)
-                
-                # Use 'YOUR_TEAM' as a placeholder for the player's team
-                if player_name and player_name not in self.player_teams:
-                    self.player_teams[player_name] = 'YOUR_TEAM'
-                    if self.team_callback:
-                        self.team_callback(player_name, 'YOUR_TEAM')
-                    print(f"Detected player {player_name} in your team")
-                    found_team_info = True
-            return found_team_info
+        # Use 'YOUR_TEAM' as a placeholder for the player's team
+        if player_name and player_name not in self.player_teams:
+            self.player_teams[player_name] = YOUR_TEAM
+            if self.team_callback:
+                self.team_callback(player_name, YOUR_TEAM)
+            print(f"Detected player {player_name} in your team")
+            return True
+        return False
+    
+    def _add_team_join(self, player_name: str, team_color: str) -> bool:
+        """
+        Record the team a player joined.
         
-        # Check for team join messages
-        team_join_match = self.team_join_pattern.search(line)
-        if team_join_match:
-            player_name = team_join_match.group(1)
-            team_color = team_join_match.group(2)
-            if player_name and team_color:
-                # Clean the player name
-                player_name = self._strip_minecraft_formatting(player_name)
-                
-                self.player_teams[player_name] = team_color.upper()
-                # Also add to all_players set in case this is a new player
-                self.all_players.add(player_name)
-                if self.team_callback:
-                    self.team_callback(player_name, team_color.upper())
-                print(f"Detected player {player_name} joined {team_color.upper()} team")
-                found_team_info = True
-            return found_team_info
+        Args:
+            player_name: The clean player name.
+            team_color: The upper-case team color.
             
-        return found_team_info 
\ No newline at end of file
+        Returns:
+            bool: True if team color information was found, False otherwise.
+        """
+        if not team_color:
+            return False
+        
+        self.player_teams[player_name] = team_color
+        # Also add to all_players set in case this is a new player
+        self.all_players.add(player_name)
+        if self.team_callback:
+            self.team_callback(player_name, team_color)
+        print(f"Detected player {player_name} joined {team_color} team")
+        return True
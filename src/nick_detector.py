@@ -5,6 +5,14 @@ Implements heuristics to estimate if a player is using a nickname (nicked).
 from typing import Dict, Any, List, Optional, Union
 import time
 
+from src.cache import FingerprintCache
+from src.player_stats import PlayerStats
+
+# Players whose nick scores are kept for estimate_if_nicked_memoized
+NICK_MEMO_SIZE = 512
+
+_nick_memo = FingerprintCache(NICK_MEMO_SIZE)
+
 def estimate_if_nicked(processed_stats: Dict[str, Any]) -> float:
     """
     Estimate the likelihood that a player is using a nickname based on various heuristics.
@@ -44,9 +52,11 @@ def estimate_if_nicked(processed_stats: Dict[str, Any]) -> float:
     
     # Heuristic 3: Stats profile seems unusually empty
     # WARNING: Unreliable as API might return incomplete data
-    empty_stats_count = sum(1 for value in processed_stats.values() if value in (0, 0.0, '', None))
+    # The rank and nick fields are set on the stats later, so they don't count
+    stats_values = [value for name, value in processed_stats.items() if name not in PlayerStats.OPTIONAL_FIELDS]
+    empty_stats_count = sum(1 for value in stats_values if value in (0, 0.0, '', None))
     
-    if empty_stats_count > len(processed_stats) / 2:
+    if empty_stats_count > len(stats_values) / 2:
         score += 0.25
         heuristics_count += 1
     
@@ -66,6 +76,41 @@ def estimate_if_nicked(processed_stats: Dict[str, Any]) -> float:
     
     return final_score
 
+def estimate_if_nicked_memoized(processed_stats: Dict[str, Any]) -> float:
+    """
+    Estimate the likelihood that a player is nicked like estimate_if_nicked, reusing the
+    score for unchanged players.
+    
+    Scores are remembered by UUID together with the fingerprint of the payload the stats
+    came from, since the heuristics don't look at the rank and nick fields set afterwards.
+    Only stats from stats_processor.extract_relevant_stats_memoized carry the fingerprint
+    this needs; other stats are always estimated again.
+    
+    Args:
+        processed_stats: A dictionary of processed player statistics.
+        
+    Returns:
+        float: A confidence score from 0.0 to 1.0 (see estimate_if_nicked).
+    """
+    fingerprint = getattr(processed_stats, 'fingerprint', None)
+    if fingerprint is None:
+        return estimate_if_nicked(processed_stats)
+    
+    uuid = processed_stats.get('uuid')
+    
+    score = _nick_memo.get(uuid, fingerprint)
+    if score is None:
+        score = estimate_if_nicked(processed_stats)
+        _nick_memo.put(uuid, fingerprint, score)
+    
+    return score
+
+def clear_memo() -> None:
+    """
+    Forget all memoized nick scores.
+    """
+    _nick_memo.clear()
+
 def get_nick_probability_description(nick_score: float) -> str:
     """
     Get a textual description for a nick probability score.
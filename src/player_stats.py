@@ -0,0 +1,332 @@
+"""
+Player stats records for Hypixel Stats Companion.
+Compact, typed replacements for the per-player stats dictionaries.
+"""
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from src import stats_schema
+
+def _to_int(value: Any) -> int:
+    """
+    Convert an API value to an int, using 0 for missing or invalid values.
+    """
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+def _to_float(value: Any) -> float:
+    """
+    Convert an API value to a float, using 0.0 for missing or invalid values.
+    """
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+class _StatsRecord:
+    """
+    Base class for slotted stats records that can still be used like the old dictionaries.
+
+    Supports get(), [] access, `in`, keys(), values(), items(), iteration and len(), so code
+    written for dictionaries keeps working during the migration. Fields listed in _FIELDS are
+    always present; fields in _OPTIONAL_FIELDS only count as present once set to a value other
+    than None, the same way keys were added to the dictionaries later on (rank, nick score, ...).
+    """
+
+    __slots__ = ()
+
+    _FIELDS: Tuple[str, ...] = ()
+    _OPTIONAL_FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls._FIELDS + cls._OPTIONAL_FIELDS)
+
+    def keys(self) -> List[str]:
+        """
+        Get the names of all fields that are present.
+        """
+        return list(self._FIELDS) + [name for name in self._OPTIONAL_FIELDS if getattr(self, name) is not None]
+
+    def values(self) -> List[Any]:
+        """
+        Get the values of all fields that are present.
+        """
+        return [getattr(self, name) for name in self.keys()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """
+        Get (name, value) pairs for all fields that are present.
+        """
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a field's value, or the default if the field isn't present.
+        """
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not None or key in self._FIELDS:
+                return value
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record to a plain dictionary.
+        """
+        return dict(self.items())
+
+    def copy(self) -> "_StatsRecord":
+        """
+        Get a shallow copy of the record.
+        """
+        clone = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                setattr(clone, name, getattr(self, name))
+        return clone
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> "_StatsRecord":
+        # All fields hold immutable values, so a shallow copy is already a deep copy
+        return self.copy()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._FIELD_SET:
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._FIELDS:
+            return True
+        return key in self._FIELD_SET and getattr(self, key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_StatsRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class ModeStats(_StatsRecord):
+    """
+    Bedwars stats of a player in one mode, e.g. solo or 4v4v4v4.
+    """
+
+    _FIELDS = (
+        'mode', 'final_kills', 'final_deaths', 'wins', 'losses', 'beds_broken', 'beds_lost',
+        'games_played', 'winstreak', 'fkdr', 'wlr', 'bblr'
+    )
+
+    __slots__ = _FIELDS
+
+    def __init__(self, mode: str, values: Dict[str, Any]) -> None:
+        """
+        Initialize the record from the values of stats_schema.get_mode_schema.
+
+        Args:
+            mode: The mode's name in stats_schema.BEDWARS_MODES.
+            values: The extracted values.
+        """
+        self.mode = mode
+        self.final_kills = _to_int(values['final_kills'])
+        self.final_deaths = _to_int(values['final_deaths'])
+        self.wins = _to_int(values['wins'])
+        self.losses = _to_int(values['losses'])
+        self.beds_broken = _to_int(values['beds_broken'])
+        self.beds_lost = _to_int(values['beds_lost'])
+        self.games_played = _to_int(values['games_played'])
+        self.winstreak = _to_int(values['winstreak'])
+        self.fkdr = values['fkdr']
+        self.wlr = values['wlr']
+        self.bblr = values['bblr']
+
+class PlayerStats(_StatsRecord):
+    """
+    Processed stats of a player that was found on Hypixel.
+
+    All numeric fields are normalized once on creation, so ranking, nick detection and
+    the table can use them directly without converting or guarding every access.
+
+    Per-mode stats are only computed when get_mode_stats() first asks for a mode, and are
+    then kept on the record.
+    """
+
+    _FIELDS = (
+        'username', 'uuid', 'hypixel_level', 'bedwars_stars', 'fkdr', 'wlr', 'bblr',
+        'achievement_points', 'karma', 'first_login', 'last_login', 'bedwars_coins',
+        'bedwars_games_played', 'bedwars_winstreak', 'final_kills', 'final_deaths',
+        'wins', 'losses', 'beds_broken', 'beds_lost', 'winstreak'
+    )
+    _OPTIONAL_FIELDS = ('rank', 'nick_probability', 'nick_estimate', 'nick_score', 'nick_description')
+
+    # The per-mode Bedwars counters, the per-mode stats computed from them so far, and the
+    # fingerprint of the payload the record came from; none of them is listed in keys()
+    __slots__ = _FIELDS + _OPTIONAL_FIELDS + ('_bedwars', '_mode_stats', 'fingerprint')
+
+    # Fields that always hold an int or float
+    NUMERIC_FIELDS = frozenset(_FIELDS[2:])
+
+    # Fields set after extraction, such as the rank and nick estimate
+    OPTIONAL_FIELDS = _OPTIONAL_FIELDS
+
+    # Real players are never placeholders; like the old dictionaries, this isn't listed in keys()
+    is_placeholder = False
+
+    def __init__(self, username: str = 'Unknown', uuid: str = '', hypixel_level: float = 0.0,
+                 bedwars_stars: int = 0, fkdr: float = 0.0, wlr: float = 0.0, bblr: float = 0.0,
+                 achievement_points: int = 0, karma: int = 0, first_login: int = 0, last_login: int = 0,
+                 bedwars_coins: int = 0, bedwars_games_played: int = 0, bedwars_winstreak: int = 0,
+                 final_kills: int = 0, final_deaths: int = 0, wins: int = 0, losses: int = 0,
+                 beds_broken: int = 0, beds_lost: int = 0, winstreak: int = 0,
+                 rank: Optional[int] = None, nick_probability: Optional[float] = None,
+                 nick_estimate: Optional[str] = None, nick_score: Optional[float] = None,
+                 nick_description: Optional[str] = None, bedwars: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Initialize the record, converting numeric fields to int or float.
+
+        bedwars is the player's raw Bedwars stats object, from which per-mode stats are computed.
+        Only the counters in stats_schema.MODE_KEYS are kept, so memoized records don't hold on
+        to the rest of the object.
+        """
+        self.username = username
+        self.uuid = uuid
+        self.hypixel_level = _to_float(hypixel_level)
+        self.bedwars_stars = _to_int(bedwars_stars)
+        self.fkdr = _to_float(fkdr)
+        self.wlr = _to_float(wlr)
+        self.bblr = _to_float(bblr)
+        self.achievement_points = _to_int(achievement_points)
+        self.karma = _to_int(karma)
+        self.first_login = _to_int(first_login)
+        self.last_login = _to_int(last_login)
+        self.bedwars_coins = _to_int(bedwars_coins)
+        self.bedwars_games_played = _to_int(bedwars_games_played)
+        self.bedwars_winstreak = _to_int(bedwars_winstreak)
+        self.final_kills = _to_int(final_kills)
+        self.final_deaths = _to_int(final_deaths)
+        self.wins = _to_int(wins)
+        self.losses = _to_int(losses)
+        self.beds_broken = _to_int(beds_broken)
+        self.beds_lost = _to_int(beds_lost)
+        self.winstreak = _to_int(winstreak)
+        self.rank = rank
+        self.nick_probability = nick_probability
+        self.nick_estimate = nick_estimate
+        self.nick_score = nick_score
+        self.nick_description = nick_description
+        self._bedwars = ({key: bedwars[key] for key in stats_schema.MODE_KEYS if key in bedwars}
+                         if isinstance(bedwars, dict) else None)
+        self._mode_stats = None
+        self.fingerprint = None  # Set by stats_processor.extract_relevant_stats_memoized
+
+    @classmethod
+    def from_dict(cls, stats: Dict[str, Any], bedwars: Optional[Dict[str, Any]] = None) -> "PlayerStats":
+        """
+        Create a record from an old-style stats dictionary. Unknown keys are ignored.
+
+        Args:
+            stats: The stats dictionary.
+            bedwars: The player's raw Bedwars stats object, if per-mode stats should be available.
+
+        Returns:
+            PlayerStats: The record.
+        """
+        return cls(bedwars=bedwars, **{key: value for key, value in stats.items() if key in cls._FIELD_SET})
+
+    def get_mode_stats(self, mode: str) -> ModeStats:
+        """
+        Get the player's stats in one Bedwars mode, computing them on first use.
+
+        Args:
+            mode: The mode's name in stats_schema.BEDWARS_MODES, e.g. "solo".
+
+        Returns:
+            ModeStats: The stats. All zero if the record has no raw Bedwars counters.
+
+        Raises:
+            KeyError: If the mode is unknown.
+        """
+        if self._mode_stats is None:
+            self._mode_stats = {}
+
+        stats = self._mode_stats.get(mode)
+        if stats is None:
+            extract = stats_schema.MODE_EXTRACTORS[mode]
+            stats = self._mode_stats[mode] = ModeStats(mode, extract(self._bedwars or {}))
+        return stats
+
+    def get_all_mode_stats(self) -> List[ModeStats]:
+        """
+        Get the player's stats in every Bedwars mode, in the order of stats_schema.BEDWARS_MODES.
+
+        Returns:
+            List[ModeStats]: The stats.
+        """
+        return [self.get_mode_stats(mode) for mode in stats_schema.BEDWARS_MODES]
+
+class PlaceholderStats(_StatsRecord):
+    """
+    Stand-in for a player whose stats couldn't be loaded, e.g. a nick or an API outage.
+
+    The stat fields always read as '?', matching what the table shows for them.
+    """
+
+    _FIELDS = (
+        'username', 'bedwars_stars', 'fkdr', 'wlr', 'level', 'achievement_points',
+        'nick_probability', 'nick_estimate', 'is_placeholder', 'is_confirmed_nick'
+    )
+    _OPTIONAL_FIELDS = ('rank', 'nick_score', 'nick_description')
+
+    __slots__ = ('username', 'nick_probability', 'nick_estimate', 'is_confirmed_nick') + _OPTIONAL_FIELDS
+
+    is_placeholder = True
+    bedwars_stars = '?'
+    fkdr = '?'
+    wlr = '?'
+    level = '?'
+    achievement_points = '?'
+
+    def __init__(self, username: str, nick_probability: float, nick_estimate: str,
+                 is_confirmed_nick: bool = False, rank: Optional[int] = None) -> None:
+        """
+        Initialize the placeholder.
+
+        Args:
+            username: The player's username.
+            nick_probability: How likely the player is nicked, from 0.0 to 1.0.
+            nick_estimate: Text shown in the Nick Est. column.
+            is_confirmed_nick: Whether the player is certainly nicked.
+            rank: Position in the lobby table, if already known.
+        """
+        self.username = username
+        self.nick_probability = nick_probability
+        self.nick_estimate = nick_estimate
+        self.is_confirmed_nick = is_confirmed_nick
+        self.rank = rank
+        self.nick_score = None
+        self.nick_description = None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in ('is_placeholder', 'bedwars_stars', 'fkdr', 'wlr', 'level', 'achievement_points'):
+            raise KeyError(f"PlaceholderStats field '{key}' can't be changed")
+        super().__setitem__(key, value)
@@ -2,9 +2,40 @@
 Ranking Engine for Hypixel Stats Companion.
 Sorts players based on their statistics.
 """
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 import copy
 
+from src.player_stats import PlayerStats
+
+def _coerce_rank_stats(player: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    Get the stars, FKDR and WLR of an old-style stats dictionary as numbers.
+    Non-numeric values count as 0.
+    
+    Args:
+        player: The player stat dictionary.
+        
+    Returns:
+        Tuple[float, float, float]: The stars, FKDR and WLR.
+    """
+    # Get numeric stats with fallbacks to 0 for non-numeric values
+    try:
+        stars = float(player.get('bedwars_stars', 0))
+    except (ValueError, TypeError):
+        stars = 0
+        
+    try:
+        fkdr = float(player.get('fkdr', 0))
+    except (ValueError, TypeError):
+        fkdr = 0
+        
+    try:
+        wlr = float(player.get('wlr', 0))
+    except (ValueError, TypeError):
+        wlr = 0
+    
+    return stars, fkdr, wlr
+
 def rank_players(players: List[Dict]) -> List[Dict]:
     """
     Rank players based on their Bedwars stats, with emphasis on skill-based metrics.
@@ -23,22 +54,14 @@ def rank_players(players: List[Dict]) -> List[Dict]:
     
     # Define the sorting key function with emphasis on FKDR and WLR
     def sort_key(player):
-        # Get numeric stats with fallbacks to 0 for non-numeric values
-        try:
-            stars = float(player.get('bedwars_stars', 0))
-        except (ValueError, TypeError):
-            stars = 0
-            
-        try:
-            fkdr = float(player.get('fkdr', 0))
-        except (ValueError, TypeError):
-            fkdr = 0
-            
-        try:
-            wlr = float(player.get('wlr', 0))
-        except (ValueError, TypeError):
-            wlr = 0
-            
+        if isinstance(player, PlayerStats):
+            # Records are already normalized, so no conversion is needed
+            stars = player.bedwars_stars
+            fkdr = player.fkdr
+            wlr = player.wlr
+        else:
+            stars, fkdr, wlr = _coerce_rank_stats(player)
+
         # Calculate points for each stat (with higher weights for skill-based stats)
         stars_points = stars / 100.0  # Reduced weight for stars
         fkdr_points = fkdr * 5.0     # Increased weight for FKDR
@@ -101,6 +124,10 @@ def rank_by_criteria(processed_stats_list: List[Dict[str, Any]],
     
     # Define a key function for sorting by the specified criteria
     def sort_key(player: Dict[str, Any]) -> Any:
+        if isinstance(player, PlayerStats) and criteria in PlayerStats.NUMERIC_FIELDS:
+            # Records are already normalized, so no conversion is needed
+            return getattr(player, criteria)
+        
         value = player.get(criteria, 0)
         
         # Handle non-numeric values for different types
@@ -2,7 +2,28 @@
 Stats Processor for Hypixel Stats Companion.
 Processes raw player stats from the Hypixel API into usable data.
 """
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batches are processed one player at a time without it
+    np = None
+
+from src import leveling, stats_schema
+from src.cache import FingerprintCache
+from src.player_stats import ModeStats, PlayerStats
+from src.stats_schema import PLAYER_SCHEMA, compute_ratio, to_float, to_int
+
+# Value type of every PLAYER_SCHEMA field, e.g. for formatting table columns
+FIELD_TYPES = stats_schema.get_types(PLAYER_SCHEMA)
+
+_extract_player = stats_schema.compile_extractor(PLAYER_SCHEMA)
+_read_player = stats_schema.compile_extractor(PLAYER_SCHEMA, derive=False)
+
+# Players whose processed stats are kept for extract_relevant_stats_memoized
+STATS_MEMO_SIZE = 512
+
+_stats_memo = FingerprintCache(STATS_MEMO_SIZE)
 
 def get_nested_value(data: Dict[str, Any], keys: List[str], default: Any = None) -> Any:
     """
@@ -36,18 +57,8 @@ def calculate_fkdr(player_stats: Dict[str, Any]) -> float:
     final_kills = get_nested_value(player_stats, ['stats', 'Bedwars', 'final_kills_bedwars'], 0)
     final_deaths = get_nested_value(player_stats, ['stats', 'Bedwars', 'final_deaths_bedwars'], 0)
     
-    # Convert to integers in case they're strings
-    try:
-        final_kills = int(final_kills)
-        final_deaths = int(final_deaths)
-    except (ValueError, TypeError):
-        return 0.0
-    
-    # Avoid division by zero
-    if final_deaths == 0:
-        return float(final_kills) if final_kills > 0 else 0.0
-    
-    return round(final_kills / final_deaths, 2)
+    # Values that aren't numbers (e.g. strings) give 0.0
+    return compute_ratio(to_int(final_kills), to_int(final_deaths))
 
 def calculate_wlr(player_stats: Dict[str, Any]) -> float:
     """
@@ -62,18 +73,24 @@ def calculate_wlr(player_stats: Dict[str, Any]) -> float:
     wins = get_nested_value(player_stats, ['stats', 'Bedwars', 'wins_bedwars'], 0)
     losses = get_nested_value(player_stats, ['stats', 'Bedwars', 'losses_bedwars'], 0)
     
-    # Convert to integers in case they're strings
-    try:
-        wins = int(wins)
-        losses = int(losses)
-    except (ValueError, TypeError):
-        return 0.0
+    # Values that aren't numbers (e.g. strings) give 0.0
+    return compute_ratio(to_int(wins), to_int(losses))
+
+def calculate_bblr(player_stats: Dict[str, Any]) -> float:
+    """
+    Calculate Bedwars Beds Broken/Lost Ratio.
     
-    # Avoid division by zero
-    if losses == 0:
-        return float(wins) if wins > 0 else 0.0
+    Args:
+        player_stats: The raw player stats dictionary from the Hypixel API.
+        
+    Returns:
+        float: The calculated BBLR, or 0.0 if it can't be calculated.
+    """
+    beds_broken = get_nested_value(player_stats, ['stats', 'Bedwars', 'beds_broken_bedwars'], 0)
+    beds_lost = get_nested_value(player_stats, ['stats', 'Bedwars', 'beds_lost_bedwars'], 0)
     
-    return round(wins / losses, 2)
+    # Values that aren't numbers (e.g. strings) give 0.0
+    return compute_ratio(to_int(beds_broken), to_int(beds_lost))
 
 def get_bedwars_stars(player_stats: Dict[str, Any]) -> int:
     """
@@ -87,51 +104,11 @@ def get_bedwars_stars(player_stats: Dict[str, Any]) -> int:
     Returns:
         int: The Bedwars star level.
     """
-    # First try to get stars directly from achievements
     bedwars_level = get_nested_value(player_stats, ['achievements', 'bedwars_level'], None)
-    
-    # If we found it in achievements, return it
-    if bedwars_level is not None:
-        try:
-            return int(bedwars_level)
-        except (ValueError, TypeError):
-            pass  # Fall back to calculating from experience
-    
-    # Fall back to calculating from experience
     experience = get_nested_value(player_stats, ['stats', 'Bedwars', 'Experience'], 0)
     
-    # Convert to integer in case it's a string
-    try:
-        experience = int(experience)
-    except (ValueError, TypeError):
-        return 0
-    
-    # Prestige levels
-    prestiges = [
-        (0, 0), (500, 100), (1500, 200), (3500, 300), (7000, 400),
-        (12000, 500), (20000, 600), (30000, 700), (45000, 800), (65000, 900)
-    ]
-    
-    # Find the highest prestige level
-    prestige_level = 0
-    for exp_threshold, level in prestiges:
-        if experience >= exp_threshold:
-            prestige_level = level
-    
-    # Calculate stars based on prestige and remaining XP
-    next_prestige_index = next((i for i, (exp, _) in enumerate(prestiges) if exp > experience), len(prestiges))
-    prev_prestige_index = next_prestige_index - 1
-    
-    if prev_prestige_index < 0:
-        return 0
-    
-    prev_exp, prev_level = prestiges[prev_prestige_index]
-    
-    # Calculate the level within the current prestige (100 per prestige)
-    level_within_prestige = (experience - prev_exp) // 5000
-    stars = prev_level + level_within_prestige
-    
-    return stars
+    # Experience that isn't a number (e.g. a string) counts as none
+    return stats_schema.compute_stars(bedwars_level, to_int(experience))
 
 def get_hypixel_level(player_stats: Dict[str, Any]) -> float:
     """
@@ -150,77 +127,223 @@ def get_hypixel_level(player_stats: Dict[str, Any]) -> float:
         exp = get_nested_value(player_stats, ['networkExp'], 0)
     
     # Convert to float in case it's a string
-    try:
-        exp = float(exp)
-    except (ValueError, TypeError):
-        return 0.0
-    
-    # Formula based on Hypixel network level calculation
-    # Level = (√(exp + 15312.5) - 125/sqrt(2)) / (25√2)
-    if exp == 0:
-        return 1.0
-    
-    import math
-    level = (math.sqrt(exp + 15312.5) - 125/math.sqrt(2)) / (25 * math.sqrt(2))
-    
-    return round(max(1.0, level), 2)
+    return stats_schema.compute_network_level(to_float(exp))
 
-def extract_relevant_stats(player_stats: Dict[str, Any]) -> Dict[str, Any]:
+def extract_relevant_stats(player_stats: Dict[str, Any]) -> Union[PlayerStats, Dict[str, Any]]:
     """
     Extract relevant statistics from raw player stats.
     
+    The fields are declared in stats_schema.PLAYER_SCHEMA and read in a single pass.
+    Per-mode stats aren't computed here; the record computes them when first asked.
+    
     Args:
         player_stats: The raw player stats dictionary from the Hypixel API.
         
     Returns:
-        Dict[str, Any]: A simplified dictionary with relevant stats.
+        PlayerStats: The relevant stats, with numeric fields normalized,
+                     or an empty dictionary if there are no stats.
     """
     if not player_stats:
         return {}
     
-    # Get the display name or fall back to uuid
-    display_name = player_stats.get('displayname', player_stats.get('uuid', 'Unknown'))
+    bedwars = get_nested_value(player_stats, ['stats', 'Bedwars'])
+    return PlayerStats.from_dict(_extract_player(player_stats), bedwars=bedwars)
+
+def get_fingerprint(player_stats: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Get a fingerprint of the raw player stats that changes whenever the processed stats can.
     
-    # Extract bedwars specific stats for detailed view
-    final_kills = get_nested_value(player_stats, ['stats', 'Bedwars', 'final_kills_bedwars'], 0)
-    final_deaths = get_nested_value(player_stats, ['stats', 'Bedwars', 'final_deaths_bedwars'], 0)
-    wins = get_nested_value(player_stats, ['stats', 'Bedwars', 'wins_bedwars'], 0)
-    losses = get_nested_value(player_stats, ['stats', 'Bedwars', 'losses_bedwars'], 0)
-    beds_broken = get_nested_value(player_stats, ['stats', 'Bedwars', 'beds_broken_bedwars'], 0)
-    beds_lost = get_nested_value(player_stats, ['stats', 'Bedwars', 'beds_lost_bedwars'], 0)
+    The fingerprint holds every value PLAYER_SCHEMA reads, without computing the derived stats.
+    Per-mode counters aren't part of it, as they only change in games, which also add Bedwars experience.
+    
+    Args:
+        player_stats: The raw player stats dictionary from the Hypixel API.
+        
+    Returns:
+        Tuple[Any, ...]: The fingerprint.
+    """
+    return tuple(_read_player(player_stats).values())
+
+def extract_relevant_stats_memoized(player_stats: Dict[str, Any]) -> Union[PlayerStats, Dict[str, Any]]:
+    """
+    Extract relevant statistics like extract_relevant_stats, reusing the result for unchanged players.
+    
+    Results are remembered by UUID together with the payload's fingerprint (see get_fingerprint),
+    for up to STATS_MEMO_SIZE players, so repeated /who refreshes skip all derived-stat work.
+    
+    Args:
+        player_stats: The raw player stats dictionary from the Hypixel API.
+        
+    Returns:
+        PlayerStats: A copy of the relevant stats, free to modify,
+                     or an empty dictionary if there are no stats.
+    """
+    uuid = player_stats.get('uuid') if player_stats else None
+    if not uuid:
+        return extract_relevant_stats(player_stats)
+    
+    fingerprint = get_fingerprint(player_stats)
+    stats = _stats_memo.get(uuid, fingerprint)
+    if stats is None:
+        stats = extract_relevant_stats(player_stats)
+        stats.fingerprint = fingerprint
+        _stats_memo.put(uuid, fingerprint, stats)
+    
+    return stats.copy()
+
+def clear_memo() -> None:
+    """
+    Forget all memoized stats.
+    """
+    _stats_memo.clear()
+
+def extract_mode_stats(player_stats: Dict[str, Any], mode: str) -> ModeStats:
+    """
+    Extract a player's Bedwars stats in one mode from raw player stats.
     
-    # Calculate beds broken to lost ratio
-    bblr = 0.0
-    if beds_lost > 0:
-        bblr = round(beds_broken / beds_lost, 2)
-    elif beds_broken > 0:
-        bblr = float(beds_broken)
-    
-    # Extract stats
-    stats = {
-        'username': display_name,
-        'uuid': player_stats.get('uuid', ''),
-        'hypixel_level': get_hypixel_level(player_stats),
-        'bedwars_stars': get_bedwars_stars(player_stats),
-        'fkdr': calculate_fkdr(player_stats),
-        'wlr': calculate_wlr(player_stats),
-        'bblr': bblr,
-        'achievement_points': get_nested_value(player_stats, ['achievementPoints'], 0),
-        'karma': get_nested_value(player_stats, ['karma'], 0),
-        'first_login': get_nested_value(player_stats, ['firstLogin'], 0),
-        'last_login': get_nested_value(player_stats, ['lastLogin'], 0),
-        'bedwars_coins': get_nested_value(player_stats, ['stats', 'Bedwars', 'coins'], 0),
-        'bedwars_games_played': wins + losses,
-        'bedwars_winstreak': get_nested_value(player_stats, ['stats', 'Bedwars', 'winstreak'], 0),
-        
-        # Detailed bedwars stats for player details view
-        'final_kills': final_kills,
-        'final_deaths': final_deaths,
-        'wins': wins,
-        'losses': losses,
-        'beds_broken': beds_broken,
-        'beds_lost': beds_lost,
-        'winstreak': get_nested_value(player_stats, ['stats', 'Bedwars', 'winstreak'], 0)
+    Args:
+        player_stats: The raw player stats dictionary from the Hypixel API.
+        mode: The mode's name in BEDWARS_MODES: "solo", "doubles", "threes" (3v3v3v3),
+              "fours" (4v4v4v4) or "4v4".
+        
+    Returns:
+        ModeStats: The mode's stats, with the same ratio rules as the overall stats.
+        
+    Raises:
+        KeyError: If the mode is unknown.
+    """
+    bedwars = get_nested_value(player_stats, ['stats', 'Bedwars'])
+    if not isinstance(bedwars, dict):
+        bedwars = {}
+    return ModeStats(mode, stats_schema.MODE_EXTRACTORS[mode](bedwars))
+
+def _gather_columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Turn the values read from many players into columns.
+    Counters that are missing count as 0; counters that can't be converted are None.
+    
+    Args:
+        rows: The values of each player, as read with PLAYER_SCHEMA.
+        
+    Returns:
+        Dict[str, List[Any]]: One list per column, in player order.
+    """
+    columns = {
+        name: [row[name] for row in rows]
+        for name in ('final_kills', 'final_deaths', 'wins', 'losses', 'beds_broken', 'beds_lost',
+                     'experience', 'network_exp')
     }
+    columns['bedwars_level'] = [None if row['bedwars_level'] is None else to_int(row['bedwars_level'])
+                                for row in rows]
+    return columns
+
+def _ratio(numerators: "np.ndarray", denominators: "np.ndarray") -> "np.ndarray":
+    """
+    Divide two counter columns with the division-by-zero rules of compute_ratio.
+    NaN marks counters that couldn't be converted; their ratio is 0.0.
     
-    return stats 
\ No newline at end of file
+    Args:
+        numerators: The numerator column.
+        denominators: The denominator column.
+        
+    Returns:
+        np.ndarray: The unrounded ratios.
+    """
+    safe_denominators = np.where(denominators == 0, 1.0, denominators)
+    ratios = np.where(denominators == 0, np.maximum(numerators, 0.0), numerators / safe_denominators)
+    return np.where(np.isnan(numerators) | np.isnan(denominators), 0.0, ratios)
+
+def _round2(values: "np.ndarray") -> "np.ndarray":
+    """
+    Round to two decimals exactly like the built-in round().
+    
+    np.round scales by 100 before rounding, which differs from round() in the last digit
+    for a few values such as 223/200, and batch results must match the single-player ones.
+    """
+    return np.array([round(value, 2) for value in values.tolist()], dtype=np.float64)
+
+def calculate_batch_stats(payloads: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Calculate the ratios and levels of many players at once.
+    
+    The counters of all players are gathered into columns in one pass and the ratios,
+    Bedwars stars and network levels are computed column-wise with NumPy. The results
+    are the same as calculate_fkdr, calculate_wlr, calculate_bblr, get_bedwars_stars and
+    get_hypixel_level give for each player. Without NumPy those functions are called for
+    every player instead.
+    
+    Args:
+        payloads: The raw player stats dictionaries from the Hypixel API. Must not be empty dictionaries.
+        
+    Returns:
+        Dict[str, Any]: Columns 'fkdr', 'wlr', 'bblr', 'bedwars_stars' and 'hypixel_level',
+                        in payload order. NumPy arrays if NumPy is installed, lists otherwise.
+    """
+    payloads = list(payloads)
+    
+    if np is None:
+        return {
+            'fkdr': [calculate_fkdr(payload) for payload in payloads],
+            'wlr': [calculate_wlr(payload) for payload in payloads],
+            'bblr': [calculate_bblr(payload) for payload in payloads],
+            'bedwars_stars': [get_bedwars_stars(payload) for payload in payloads],
+            'hypixel_level': [get_hypixel_level(payload) for payload in payloads]
+        }
+    
+    return _compute_batch_stats(_gather_columns([_read_player(payload) for payload in payloads]))
+
+def _compute_batch_stats(columns: Dict[str, List[Any]]) -> Dict[str, "np.ndarray"]:
+    """
+    Compute the ratios and levels of a batch from its gathered columns (see calculate_batch_stats).
+    
+    Args:
+        columns: The columns from _gather_columns.
+        
+    Returns:
+        Dict[str, np.ndarray]: The computed columns.
+    """
+    # None becomes NaN, so unconvertible counters can be told apart from zeros
+    def column(name: str) -> "np.ndarray":
+        return np.array(columns[name], dtype=np.float64)
+    
+    fkdr = _ratio(column('final_kills'), column('final_deaths'))
+    wlr = _ratio(column('wins'), column('losses'))
+    bblr = _ratio(column('beds_broken'), column('beds_lost'))
+    
+    # Stars from experience; unconvertible experience counts as none
+    exp_stars = leveling.get_bedwars_stars_batch(np.nan_to_num(column('experience'), nan=0.0))
+    
+    # achievements.bedwars_level wins whenever it is a valid number
+    levels = column('bedwars_level')
+    stars = np.where(np.isnan(levels), exp_stars, levels).astype(np.int64)
+    
+    # Network level; players without experience are level 1
+    network_exp = column('network_exp')
+    level = _round2(leveling.get_network_levels_batch(network_exp))
+    level = np.where(np.isnan(network_exp), 0.0, level)
+    
+    return {
+        'fkdr': _round2(fkdr),
+        'wlr': _round2(wlr),
+        'bblr': _round2(bblr),
+        'bedwars_stars': stars,
+        'hypixel_level': level
+    }
+
+def extract_relevant_stats_batch(payloads: Iterable[Dict[str, Any]]) -> List[Union[PlayerStats, Dict[str, Any]]]:
+    """
+    Extract the relevant statistics of many players, for bulk imports and large rankings.
+    
+    Every player still needs a record, and with the compiled schema reading a player costs
+    more than computing its ratios, so the records are built one by one; computing the
+    ratios column-wise first made whole batches slower. Use calculate_batch_stats when
+    only the ratios and levels are needed.
+    
+    Args:
+        payloads: The raw player stats dictionaries from the Hypixel API.
+        
+    Returns:
+        List[Union[PlayerStats, Dict[str, Any]]]: The stats, in payload order. Empty payloads
+                                                  give an empty dictionary, as in extract_relevant_stats.
+    """
+    return [extract_relevant_stats(payload) for payload in payloads]
@@ -0,0 +1,269 @@
+"""
+Stats schema for Hypixel Stats Companion.
+Declares where each player stat comes from in a Hypixel player object, and compiles
+the declarations into an extractor that walks every part of the object only once.
+"""
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src import leveling
+
+# Default for fields whose absence has to be told apart from any real value
+MISSING = object()
+
+class Field(NamedTuple):
+    """A value read from the player object."""
+    name: str
+    path: Tuple[str, ...]
+    type: type = object  # int and float values are converted; None marks values that can't be
+    default: Any = 0
+    label: Optional[str] = None  # Column or row title, for fields shown in the UI
+
+class Derived(NamedTuple):
+    """A value computed from other fields after they have been read."""
+    name: str
+    compute: Callable[[Dict[str, Any]], Any]
+    type: type = object
+    label: Optional[str] = None
+
+SchemaEntry = Union[Field, Derived]
+Extractor = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+def to_int(value: Any) -> Optional[int]:
+    """
+    Convert an API value to an int, or None if it isn't a number.
+    """
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+def to_float(value: Any) -> Optional[float]:
+    """
+    Convert an API value to a float, or None if it isn't a number.
+    """
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {int: to_int, float: to_float}
+
+def compute_ratio(numerator: Optional[int], denominator: Optional[int]) -> float:
+    """
+    Divide two counters, rounded to two decimals.
+
+    Args:
+        numerator: The numerator, or None if it isn't a number.
+        denominator: The denominator, or None if it isn't a number.
+
+    Returns:
+        float: The ratio. The numerator itself if the denominator is 0, and 0.0 if either isn't a number.
+    """
+    if numerator is None or denominator is None:
+        return 0.0
+
+    # Avoid division by zero
+    if denominator == 0:
+        return float(numerator) if numerator > 0 else 0.0
+
+    return round(numerator / denominator, 2)
+
+def compute_stars(bedwars_level: Any, experience: Optional[int]) -> int:
+    """
+    Get the Bedwars star from achievements.bedwars_level, or from the experience if that isn't a number.
+    """
+    if bedwars_level is not None and bedwars_level is not MISSING:
+        stars = to_int(bedwars_level)
+        if stars is not None:
+            return stars
+
+    if experience is None:
+        return 0
+    return leveling.get_bedwars_star(experience)
+
+def compute_network_level(network_exp: Optional[float]) -> float:
+    """
+    Get the network level rounded to two decimals, or 0.0 if the experience isn't a number.
+    """
+    if network_exp is None:
+        return 0.0
+    return round(leveling.get_network_level(network_exp), 2)
+
+def _bedwars(key: str) -> Tuple[str, ...]:
+    """Path of a Bedwars counter."""
+    return ('stats', 'Bedwars', key)
+
+# Everything extract_relevant_stats reads from a player object. Derived values are computed in order.
+PLAYER_SCHEMA: List[SchemaEntry] = [
+    Field('raw_uuid', ('uuid',), object, MISSING),
+    Field('displayname', ('displayname',), object, MISSING),
+    Field('network_exp', ('networkExp',), float, 0.0),
+    Field('achievement_points', ('achievementPoints',), int, label='AP'),
+    Field('karma', ('karma',), int, label='Karma'),
+    Field('first_login', ('firstLogin',), int),
+    Field('last_login', ('lastLogin',), int),
+    Field('bedwars_level', ('achievements', 'bedwars_level'), object, None),
+    Field('experience', _bedwars('Experience'), int),
+    Field('bedwars_coins', _bedwars('coins'), int, label='Coins'),
+    Field('bedwars_winstreak', _bedwars('winstreak'), int),
+    Field('winstreak', _bedwars('winstreak'), int, label='Winstreak'),
+    Field('final_kills', _bedwars('final_kills_bedwars'), int, label='Final Kills'),
+    Field('final_deaths', _bedwars('final_deaths_bedwars'), int, label='Final Deaths'),
+    Field('wins', _bedwars('wins_bedwars'), int, label='Wins'),
+    Field('losses', _bedwars('losses_bedwars'), int, label='Losses'),
+    Field('beds_broken', _bedwars('beds_broken_bedwars'), int, label='Beds Broken'),
+    Field('beds_lost', _bedwars('beds_lost_bedwars'), int, label='Beds Lost'),
+
+    Derived('uuid', lambda v: '' if v['raw_uuid'] is MISSING else v['raw_uuid'], str),
+    Derived('username', lambda v: v['displayname'] if v['displayname'] is not MISSING
+            else ('Unknown' if v['raw_uuid'] is MISSING else v['raw_uuid']), str),
+    Derived('hypixel_level', lambda v: compute_network_level(v['network_exp']), float, 'Level'),
+    Derived('bedwars_stars', lambda v: compute_stars(v['bedwars_level'], v['experience']), int, 'Stars'),
+    Derived('fkdr', lambda v: compute_ratio(v['final_kills'], v['final_deaths']), float, 'FKDR'),
+    Derived('wlr', lambda v: compute_ratio(v['wins'], v['losses']), float, 'WLR'),
+    Derived('bblr', lambda v: compute_ratio(v['beds_broken'], v['beds_lost']), float, 'BBLR'),
+    Derived('bedwars_games_played', lambda v: (v['wins'] or 0) + (v['losses'] or 0), int, 'Games Played')
+]
+
+class BedwarsMode(NamedTuple):
+    """A Bedwars mode with its own counters in the Bedwars stats."""
+    name: str
+    prefix: str  # Prefix of the mode's counters, e.g. "eight_one_final_kills_bedwars"
+    label: str
+
+BEDWARS_MODES: Dict[str, BedwarsMode] = {mode.name: mode for mode in [
+    BedwarsMode('solo', 'eight_one_', 'Solo'),
+    BedwarsMode('doubles', 'eight_two_', 'Doubles'),
+    BedwarsMode('threes', 'four_three_', '3v3v3v3'),
+    BedwarsMode('fours', 'four_four_', '4v4v4v4'),
+    BedwarsMode('4v4', 'two_four_', '4v4')
+]}
+
+def get_mode_schema(prefix: str) -> List[SchemaEntry]:
+    """
+    Get the schema of one Bedwars mode. Its paths are relative to the Bedwars stats object.
+
+    Args:
+        prefix: The mode's counter prefix, e.g. "eight_one_".
+
+    Returns:
+        List[SchemaEntry]: The schema.
+    """
+    return [
+        Field('final_kills', (f'{prefix}final_kills_bedwars',), int, label='Final Kills'),
+        Field('final_deaths', (f'{prefix}final_deaths_bedwars',), int, label='Final Deaths'),
+        Field('wins', (f'{prefix}wins_bedwars',), int, label='Wins'),
+        Field('losses', (f'{prefix}losses_bedwars',), int, label='Losses'),
+        Field('beds_broken', (f'{prefix}beds_broken_bedwars',), int, label='Beds Broken'),
+        Field('beds_lost', (f'{prefix}beds_lost_bedwars',), int, label='Beds Lost'),
+        Field('games_played', (f'{prefix}games_played_bedwars',), int, label='Games'),
+        Field('winstreak', (f'{prefix}winstreak',), int, label='Winstreak'),
+
+        Derived('fkdr', lambda v: compute_ratio(v['final_kills'], v['final_deaths']), float, 'FKDR'),
+        Derived('wlr', lambda v: compute_ratio(v['wins'], v['losses']), float, 'WLR'),
+        Derived('bblr', lambda v: compute_ratio(v['beds_broken'], v['beds_lost']), float, 'BBLR')
+    ]
+
+def get_paths(schema: Sequence[SchemaEntry]) -> List[str]:
+    """
+    Get the dotted paths a schema reads, e.g. for a projecting JSON decoder.
+
+    Args:
+        schema: The schema.
+
+    Returns:
+        List[str]: The paths, without duplicates, in schema order.
+    """
+    paths = ['.'.join(entry.path) for entry in schema if isinstance(entry, Field)]
+    return list(dict.fromkeys(paths))
+
+def get_types(schema: Sequence[SchemaEntry]) -> Dict[str, type]:
+    """
+    Get the value type of every field in a schema, by field name.
+
+    Args:
+        schema: The schema.
+
+    Returns:
+        Dict[str, type]: The types.
+    """
+    return {entry.name: entry.type for entry in schema}
+
+def _compile_node(fields: List[Tuple[Tuple[str, ...], Field]]) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    """
+    Compile the fields below one object of the player data into a function that fills them in.
+
+    Args:
+        fields: (remaining path, field) pairs; the remaining path is relative to this object.
+
+    Returns:
+        Callable: A function taking the object and the values to fill.
+    """
+    leaves = []
+    children: Dict[str, List[Tuple[Tuple[str, ...], Field]]] = {}
+    for path, field in fields:
+        if len(path) == 1:
+            leaves.append((path[0], field.name, _CONVERTERS.get(field.type)))
+        else:
+            children.setdefault(path[0], []).append((path[1:], field))
+
+    leaves = tuple(leaves)
+    compiled_children = tuple((key, _compile_node(child_fields)) for key, child_fields in children.items())
+
+    def extract(data: Dict[str, Any], values: Dict[str, Any]) -> None:
+        for key, name, convert in leaves:
+            if key in data:
+                value = data[key]
+                values[name] = convert(value) if convert is not None else value
+        for key, extract_child in compiled_children:
+            child = data.get(key)
+            if isinstance(child, dict):
+                extract_child(child, values)
+
+    return extract
+
+def compile_extractor(schema: Sequence[SchemaEntry], derive: bool = True) -> Extractor:
+    """
+    Compile a schema into a function that extracts all of its values from a player object.
+
+    All fields are grouped by path when compiling, so every nested object is looked up
+    once per call however many fields it holds. Missing values get their defaults,
+    without conversion.
+
+    Args:
+        schema: The schema.
+        derive: Whether to compute the Derived entries too, or only read the fields.
+
+    Returns:
+        Extractor: A function taking the player object and returning the values by name.
+    """
+    fields = [entry for entry in schema if isinstance(entry, Field)]
+    derived = tuple((entry.name, entry.compute) for entry in schema if isinstance(entry, Derived)) if derive else ()
+    defaults = {field.name: field.default for field in fields}
+    root = _compile_node([(field.path, field) for field in fields])
+
+    def extract(data: Dict[str, Any]) -> Dict[str, Any]:
+        values = defaults.copy()
+        root(data, values)
+        for name, compute in derived:
+            values[name] = compute(values)
+        return values
+
+    return extract
+
+# Compiled extractors of every Bedwars mode, applied to the Bedwars stats object
+MODE_EXTRACTORS: Dict[str, Extractor] = {
+    mode.name: compile_extractor(get_mode_schema(mode.prefix)) for mode in BEDWARS_MODES.values()
+}
+
+# Bedwars counters the mode extractors read
+MODE_KEYS: FrozenSet[str] = frozenset(
+    path for mode in BEDWARS_MODES.values() for path in get_paths(get_mode_schema(mode.prefix))
+)
+
+# Fields of the Hypixel player object kept when decoding /player responses, as dotted paths:
+# everything PLAYER_SCHEMA reads, plus lastLogout and every Bedwars counter for the details view.
+# "stats.Bedwars.*" keeps the counters but none of the nested objects or arrays.
+PLAYER_FIELDS = get_paths(PLAYER_SCHEMA) + ['lastLogout', 'stats.Bedwars.*']
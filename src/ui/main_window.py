@@ -6,6 +6,7 @@ UI responsiveness is maintained through batch processing with event updates betw
 import sys
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Dict, Any, Optional
 
 # We still need QCoreApplication for processEvents to keep UI responsive
@@ -20,8 +21,10 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QColor
 
-from src.api_client import ApiClient
+from src.api_client import ApiClient, PRIORITY_INTERACTIVE
 from src.log_monitor import LogMonitor
+from src.player_stats import PlaceholderStats, PlayerStats
+from src import stats_schema
 import src.stats_processor as stats_processor
 import src.ranking_engine as ranking_engine
 import src.nick_detector as nick_detector
@@ -225,9 +228,15 @@ class StatsProcessor:
     Process player stats synchronously in the main thread.
     This class minimizes threading complexity by processing data in batches with UI updates between operations.
     Uses QCoreApplication.processEvents() to maintain UI responsiveness during long operations.
+    
+    When max_workers is greater than 1, the network lookups run on a bounded thread pool
+    instead, while the main thread keeps processing Qt events and receives each player's
+    stats as soon as they arrive. Both API rate limiters are thread-safe, so the pool
+    never exceeds the API budgets.
     """
     
-    def __init__(self, usernames: List[str], api_client: ApiClient, existing_stats: List[Dict[str, Any]] = None) -> None:
+    def __init__(self, usernames: List[str], api_client: ApiClient, existing_stats: List[Dict[str, Any]] = None,
+                 max_workers: int = 1) -> None:
         """
         Initialize the stats processor.
         
@@ -235,18 +244,22 @@ class StatsProcessor:
             usernames: List of usernames to fetch stats for.
             api_client: The API client to use.
             existing_stats: List of existing player stats to preserve.
+            max_workers: Number of concurrent lookups. 1 processes players one at a time.
         """
         self.usernames = usernames
         self.api_client = api_client
         self.existing_stats = existing_stats if existing_stats else []
+        self.max_workers = max(1, max_workers)
         
-    def process(self, progress_callback=None) -> List[Dict[str, Any]]:
+    def process(self, progress_callback=None, player_callback=None) -> List[Dict[str, Any]]:
         """
         Process the usernames and fetch player stats.
         This method runs in the main thread and updates progress through callbacks.
         
         Args:
             progress_callback: Optional callback function to report progress (0-100)
+            player_callback: Optional callback function called in the main thread with each
+                             player's stats as soon as they are available
             
         Returns:
             List[Dict[str, Any]]: The processed player stats
@@ -259,102 +272,32 @@ class StatsProcessor:
         if self.existing_stats:
             all_player_stats = self.existing_stats.copy()
         
+        existing_usernames = {player.get('username') for player in self.existing_stats}
+        
         try:
-            # Process usernames in batches of 10 to improve responsiveness
-            batch_size = 10
-            batched_usernames = [self.usernames[i:i + batch_size] for i in range(0, len(self.usernames), batch_size)]
-            
-            for batch in batched_usernames:
-                for username in batch:
-                    # Skip players we already have stats for
-                    if self.existing_stats and any(player.get('username') == username for player in self.existing_stats):
-                        # Count skipped players in progress calculation
-                        processed_count += 1
-                        if progress_callback:
-                            progress_percent = min(99, int((processed_count / total_players) * 100))
-                            progress_callback(progress_percent)
-                        continue
-                    
-                    try:
-                        # Update progress - make sure we don't reach 100% until completely done
-                        processed_count += 1
-                        if progress_callback:
-                            progress_percent = min(99, int((processed_count / total_players) * 100))
-                            progress_callback(progress_percent)
-                        
-                        # Get UUID for the username
-                        try:
-                            uuid = self.api_client.get_uuid(username)
-                        except ValueError as e:
-                            # If player not found in Mojang API, they are definitely nicked
-                            if "Player '" in str(e) and "not found" in str(e):
-                                print(f"Player {username} is definitely nicked (not found in Mojang API)")
-                                placeholder_stats = {
-                                    'username': username,
-                                    'bedwars_stars': '?',
-                                    'fkdr': '?',
-                                    'wlr': '?',
-                                    'level': '?',
-                                    'achievement_points': '?',
-                                    'nick_probability': 1.0,  # 100% certain they're nicked
-                                    'nick_estimate': 'Confirmed Nick',
-                                    'is_placeholder': True  # Mark as placeholder for display purposes
-                                }
-                                all_player_stats.append(placeholder_stats)
-                                continue
-                            else:
-                                # Re-raise other errors
-                                raise
-                        
-                        # Get player stats
-                        player_data = self.api_client.get_player_stats(uuid)
-                        
-                        # Process the stats
-                        processed_stats = stats_processor.extract_relevant_stats(player_data)
-                        
-                        # Add to the list
-                        all_player_stats.append(processed_stats)
-                    
-                    except Exception as e:
-                        # Create placeholder stats for players that can't be found (likely nicked)
-                        print(f"Error processing player {username}: {str(e)}")
-                        
-                        # Check if this is a Hypixel API error indicating player hasn't played Hypixel
-                        is_confirmed_nick = False
-                        error_msg = str(e).lower()
-                        
-                        if "player with uuid" in error_msg and "not found" in error_msg:
-                            # This means they have a real Minecraft account but haven't played Hypixel
-                            # Not necessarily a nick, so mark with lower probability
-                            nick_probability = 0.6
-                            nick_estimate = "Probable Nick"
-                        elif "failed to get uuid" in error_msg:
-                            # If we couldn't get UUID from Mojang, they're definitely nicked
-                            nick_probability = 1.0
-                            nick_estimate = "Confirmed Nick"
-                            is_confirmed_nick = True
-                        else:
-                            # Other errors - use high probability but not certain
-                            nick_probability = 0.9
-                            nick_estimate = "Highly Likely Nick"
-                        
-                        # Create placeholder stats with appropriate nick probability
-                        placeholder_stats = {
-                            'username': username,
-                            'bedwars_stars': '?',
-                            'fkdr': '?',
-                            'wlr': '?',
-                            'level': '?',
-                            'achievement_points': '?',
-                            'nick_probability': nick_probability,
-                            'nick_estimate': nick_estimate,
-                            'is_placeholder': True,  # Mark as placeholder for display purposes
-                            'is_confirmed_nick': is_confirmed_nick
-                        }
-                        all_player_stats.append(placeholder_stats)
+            # Skip players we already have stats for, but count them in the progress calculation
+            usernames = [username for username in self.usernames if username not in existing_usernames]
+            processed_count = len(self.usernames) - len(usernames)
+            
+            # Resolve all new usernames up front with Mojang's bulk endpoint
+            resolved_uuids = self._resolve_uuids(usernames)
+            
+            if self.max_workers > 1:
+                results = self._fetch_concurrently(usernames, resolved_uuids)
+            else:
+                results = self._fetch_sequentially(usernames, resolved_uuids)
+            
+            for player_stats in results:
+                all_player_stats.append(player_stats)
+                processed_count += 1
                 
-                # Process Qt events after each batch to keep UI responsive
-                QCoreApplication.processEvents()
+                # Update progress - make sure we don't reach 100% until completely done
+                if progress_callback:
+                    progress_percent = min(99, int((processed_count / total_players) * 100))
+                    progress_callback(progress_percent)
+                
+                if player_callback:
+                    player_callback(player_stats)
             
             # Process the final stats
             final_stats = self._process_final_stats(all_player_stats)
@@ -373,6 +316,156 @@ class StatsProcessor:
             # Return whatever we have so far
             return all_player_stats
     
+    def _fetch_sequentially(self, usernames: List[str], resolved_uuids: Dict[str, Optional[str]]):
+        """
+        Fetch players one at a time in the main thread, processing Qt events between batches.
+        
+        Args:
+            usernames: The usernames to fetch.
+            resolved_uuids: UUIDs already resolved by the bulk lookup.
+            
+        Yields:
+            Dict[str, Any]: Each player's stats in lobby order.
+        """
+        # Process usernames in batches of 10 to improve responsiveness
+        batch_size = 10
+        for i in range(0, len(usernames), batch_size):
+            for username in usernames[i:i + batch_size]:
+                yield self._fetch_player(username, resolved_uuids)
+            
+            # Process Qt events after each batch to keep UI responsive
+            QCoreApplication.processEvents()
+    
+    def _fetch_concurrently(self, usernames: List[str], resolved_uuids: Dict[str, Optional[str]]):
+        """
+        Fetch players on a bounded thread pool while the main thread keeps processing Qt events.
+        
+        Args:
+            usernames: The usernames to fetch.
+            resolved_uuids: UUIDs already resolved by the bulk lookup.
+            
+        Yields:
+            Dict[str, Any]: Each player's stats in the order they complete.
+        """
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(usernames))))
+        try:
+            pending = {executor.submit(self._fetch_player, username, resolved_uuids) for username in usernames}
+            
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    yield future.result()
+                
+                # Keep the UI responsive while workers are waiting on the network
+                QCoreApplication.processEvents()
+        finally:
+            # Don't block the UI on workers that are still running if we stop early,
+            # and drop queued lookups so they don't spend rate limit budget for nothing
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_player(self, username: str, resolved_uuids: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """
+        Fetch and process the stats for a single player.
+        Safe to call from worker threads, as it doesn't touch the UI.
+        
+        Args:
+            username: The player's username.
+            resolved_uuids: UUIDs already resolved by the bulk lookup.
+            
+        Returns:
+            Dict[str, Any]: The processed stats, or placeholder stats if the player couldn't be fetched.
+        """
+        try:
+            # Get UUID for the username, preferring the bulk lookup result
+            if username in resolved_uuids:
+                uuid = resolved_uuids[username]
+                if uuid is None:
+                    # Mojang didn't return a profile, so they are definitely nicked
+                    print(f"Player {username} is definitely nicked (not found in Mojang API)")
+                    return self._confirmed_nick_placeholder(username)
+            else:
+                try:
+                    uuid = self.api_client.get_uuid(username)
+                except ValueError as e:
+                    # If player not found in Mojang API, they are definitely nicked
+                    if "Player '" in str(e) and "not found" in str(e):
+                        print(f"Player {username} is definitely nicked (not found in Mojang API)")
+                        return self._confirmed_nick_placeholder(username)
+                    else:
+                        # Re-raise other errors
+                        raise
+            
+            # Get player stats
+            player_data = self.api_client.get_player_stats(uuid)
+            
+            # Process the stats
+            return stats_processor.extract_relevant_stats_memoized(player_data)
+        
+        except requests.RequestException as e:
+            # Network problems and API outages say nothing about the player, so don't mark them as a nick
+            print(f"Could not reach the API for player {username}: {str(e)}")
+            return PlaceholderStats(username, 0.0, 'API Unavailable')
+        
+        except Exception as e:
+            # Create placeholder stats for players that can't be found (likely nicked)
+            print(f"Error processing player {username}: {str(e)}")
+            
+            # Check if this is a Hypixel API error indicating player hasn't played Hypixel
+            is_confirmed_nick = False
+            error_msg = str(e).lower()
+            
+            if "player with uuid" in error_msg and "not found" in error_msg:
+                # This means they have a real Minecraft account but haven't played Hypixel
+                # Not necessarily a nick, so mark with lower probability
+                nick_probability = 0.6
+                nick_estimate = "Probable Nick"
+            elif "failed to get uuid" in error_msg:
+                # If we couldn't get UUID from Mojang, they're definitely nicked
+                nick_probability = 1.0
+                nick_estimate = "Confirmed Nick"
+                is_confirmed_nick = True
+            else:
+                # Other errors - use high probability but not certain
+                nick_probability = 0.9
+                nick_estimate = "Highly Likely Nick"
+            
+            # Create placeholder stats with appropriate nick probability
+            return PlaceholderStats(username, nick_probability, nick_estimate, is_confirmed_nick)
+    
+    def _resolve_uuids(self, usernames: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve the UUIDs of the given usernames in as few requests as possible.
+        
+        Args:
+            usernames: The usernames to resolve.
+        
+        Returns:
+            Dict[str, Optional[str]]: Mapping of username to UUID (None for confirmed nicks).
+                                      Usernames missing from the mapping fall back to single lookups.
+        """
+        if not usernames:
+            return {}
+        
+        try:
+            return self.api_client.get_uuids(usernames)
+        except Exception as e:
+            print(f"Bulk UUID lookup failed, falling back to single lookups: {str(e)}")
+            return {}
+    
+    def _confirmed_nick_placeholder(self, username: str) -> PlaceholderStats:
+        """
+        Create placeholder stats for a player whose name doesn't exist in the Mojang API.
+        
+        Args:
+            username: The player's username.
+            
+        Returns:
+            PlaceholderStats: The placeholder stats.
+        """
+        # 100% certain they're nicked
+        return PlaceholderStats(username, 1.0, 'Confirmed Nick')
+    
     def _process_final_stats(self, player_stats: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Process the final stats, including ranking and nick detection.
@@ -414,7 +507,7 @@ class StatsProcessor:
                 for player in batch:
                     if not player.get('is_placeholder', False) and not player.get('nick_probability'):
                         try:
-                            nick_score = nick_detector.estimate_if_nicked(player)
+                            nick_score = nick_detector.estimate_if_nicked_memoized(player)
                             player['nick_probability'] = nick_score
                             player['nick_estimate'] = nick_detector.get_nick_probability_description(nick_score)
                         except Exception as e:
@@ -789,6 +882,10 @@ class PlayerDetailsDialog(QDialog):
         content_layout.addWidget(bedwars_stats_group)
         layout.addLayout(content_layout)
         
+        # Per-mode breakdown; the record computes it now, on first use
+        if isinstance(player_data, PlayerStats):
+            layout.addWidget(self._create_modes_group(player_data))
+        
         # Add raw stats in a collapsible section
         raw_stats_group = QGroupBox("Raw Data (Advanced)")
         raw_stats_group.setCheckable(True)
@@ -806,6 +903,43 @@ class PlayerDetailsDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
     
+    # Per-mode stats shown in the modes table, in column order
+    MODE_COLUMNS = ['games_played', 'wins', 'losses', 'wlr', 'final_kills', 'final_deaths', 'fkdr', 'bblr']
+    
+    def _create_modes_group(self, player_data: PlayerStats) -> QGroupBox:
+        """
+        Create the group with the player's Bedwars stats in each mode.
+        
+        Args:
+            player_data: The player's stats.
+            
+        Returns:
+            QGroupBox: The group, holding one table row per mode.
+        """
+        modes_group = QGroupBox("Bedwars Modes")
+        modes_layout = QVBoxLayout(modes_group)
+        
+        labels = {entry.name: entry.label for entry in stats_schema.get_mode_schema('')}
+        types = stats_schema.get_types(stats_schema.get_mode_schema(''))
+        
+        modes_table = QTableWidget(len(stats_schema.BEDWARS_MODES), len(self.MODE_COLUMNS) + 1)
+        modes_table.setHorizontalHeaderLabels(["Mode"] + [labels[stat] for stat in self.MODE_COLUMNS])
+        modes_table.verticalHeader().setVisible(False)
+        modes_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        modes_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        
+        for row, mode_stats in enumerate(player_data.get_all_mode_stats()):
+            modes_table.setItem(row, 0, QTableWidgetItem(stats_schema.BEDWARS_MODES[mode_stats.mode].label))
+            for column, stat in enumerate(self.MODE_COLUMNS, start=1):
+                value = mode_stats[stat]
+                text = f"{value:.2f}" if types[stat] is float else str(value)
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                modes_table.setItem(row, column, item)
+        
+        modes_layout.addWidget(modes_table)
+        return modes_group
+    
     def _format_timestamp(self, timestamp: int) -> str:
         """
         Format a Unix timestamp to a human-readable date.
@@ -832,6 +966,9 @@ class MainWindow(QMainWindow):
     Main window for the Hypixel Stats Companion App.
     """
     
+    # Numeric stat columns of the table, by column index, and the stat each shows
+    STAT_COLUMNS = {3: 'bedwars_stars', 4: 'fkdr', 5: 'wlr', 7: 'achievement_points'}
+    
     def __init__(self) -> None:
         """
         Initialize the main window.
@@ -842,6 +979,8 @@ class MainWindow(QMainWindow):
         try:
             api_key = config.get_api_key()
             self.api_client = ApiClient(api_key)
+            if api_key:
+                self.api_client.prewarm()
         except Exception as e:
             api_key = None
             self.api_client = None
@@ -1038,6 +1177,7 @@ class MainWindow(QMainWindow):
             try:
                 new_api_key = config.get_api_key()
                 if new_api_key != self.api_client.api_key:
+                    self.api_client.close()
                     self.api_client = ApiClient(new_api_key)
             except:
                 pass
@@ -1088,17 +1228,19 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage(f"Looking up details for player: {username}")
         
         try:
-            # Get UUID for the username
-            uuid = self.api_client.get_uuid(username)
-            
-            # Get player stats
-            player_data = self.api_client.get_player_stats(uuid)
+            # The user is waiting on this lookup, so let it skip ahead of lobby and background requests
+            with self.api_client.priority(PRIORITY_INTERACTIVE):
+                # Get UUID for the username
+                uuid = self.api_client.get_uuid(username)
+                
+                # Get player stats
+                player_data = self.api_client.get_player_stats(uuid)
             
             # Process the stats
-            processed_stats = stats_processor.extract_relevant_stats(player_data)
+            processed_stats = stats_processor.extract_relevant_stats_memoized(player_data)
             
             # Calculate nick probability
-            nick_score = nick_detector.estimate_if_nicked(processed_stats)
+            nick_score = nick_detector.estimate_if_nicked_memoized(processed_stats)
             processed_stats['nick_score'] = nick_score
             processed_stats['nick_description'] = nick_detector.get_nick_probability_description(nick_score)
             
@@ -1336,11 +1478,15 @@ class MainWindow(QMainWindow):
         self.fetch_progress.show()
         
         # Create a stats processor and process the usernames
-        processor = StatsProcessor(usernames, self.api_client)
+        processor = StatsProcessor(usernames, self.api_client, max_workers=config.get_fetch_workers())
+        self.streamed_player_stats = []
         
         try:
-            # Process the stats synchronously, with a progress callback
-            player_stats = processor.process(progress_callback=self.update_progress)
+            # Process the stats, showing each player in the table as soon as they arrive
+            player_stats = processor.process(
+                progress_callback=self.update_progress,
+                player_callback=self.handle_streamed_player
+            )
             
             # Process the results
             self.process_player_stats(player_stats)
@@ -1352,6 +1498,22 @@ class MainWindow(QMainWindow):
             # Hide the progress bar
             self.fetch_progress.hide()
     
+    def handle_streamed_player(self, player: Dict[str, Any]) -> None:
+        """
+        Show a single player's stats in the table while the rest of the lobby is still loading.
+        This method runs in the main thread.
+        
+        Args:
+            player: The player's stats dictionary
+        """
+        try:
+            self.streamed_player_stats.append(player)
+            self.current_player_stats = list(self.streamed_player_stats)
+            self._populate_table()
+            self.update_status(f"Loaded {len(self.streamed_player_stats)}/{len(self.all_lobby_usernames)} players...")
+        except Exception as e:
+            print(f"Error in handle_streamed_player: {str(e)}")
+    
     def process_player_stats(self, player_stats):
         """
         Process the final player stats and update the UI.
@@ -1368,17 +1530,11 @@ class MainWindow(QMainWindow):
             for username in self.all_lobby_usernames:
                 if username.lower() not in found_usernames:
                     # Add placeholder stats for missing players (likely nicks)
-                    missing_players.append({
-                        'username': username,
-                        'bedwars_stars': '?',
-                        'fkdr': '?',
-                        'wlr': '?',
-                        'level': '?',
-                        'achievement_points': '?',
-                        'nick_probability': 0.9,  # 90% likely to be a nick
-                        'nick_estimate': 'Highly Likely Nick',
-                        'rank': len(player_stats) + len(missing_players) + 1  # Append at the end
-                    })
+                    # 90% likely to be a nick, appended at the end
+                    missing_players.append(PlaceholderStats(
+                        username, 0.9, 'Highly Likely Nick',
+                        rank=len(player_stats) + len(missing_players) + 1
+                    ))
             
             # Add the missing players to the stats list
             all_players = player_stats + missing_players
@@ -1400,6 +1556,40 @@ class MainWindow(QMainWindow):
             print(f"Error in process_player_stats: {str(e)}")
             self.handle_error(f"Error processing player stats: {str(e)}")
     
+    def _stat_item(self, value: Any, number_type: type) -> QTableWidgetItem:
+        """
+        Create a centered table item for a numeric stat column.
+        
+        Args:
+            value: The stat value, or '?' if unknown.
+            number_type: int or float; floats are shown with two decimals.
+            
+        Returns:
+            QTableWidgetItem: The table item, with the number stored for sorting.
+        """
+        item = QTableWidgetItem()
+        if value == '?':
+            item.setText('?')
+            item.setData(Qt.ItemDataRole.UserRole, number_type(-1000))  # Place ? at the bottom when sorting
+        else:
+            number = value
+            if type(value) is not number_type:
+                # PlayerStats values are already normalized; only old-style dictionaries need converting
+                try:
+                    number = number_type(value)
+                except (ValueError, TypeError):
+                    number = None
+            
+            if number is None:
+                item.setText(str(value))
+                item.setData(Qt.ItemDataRole.UserRole, number_type(-999))  # Default for sorting
+            else:
+                text = f"{number:.2f}" if number_type is float else str(number)
+                item.setData(Qt.ItemDataRole.DisplayRole, text)
+                item.setData(Qt.ItemDataRole.UserRole, number)  # Store the number for sorting
+        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        return item
+    
     def _populate_table(self) -> None:
         """Populate the table with player stats."""
         try:
@@ -1480,56 +1670,10 @@ class MainWindow(QMainWindow):
                 team_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 self.table.setItem(row, 2, team_item)
                 
-                # Stars column
-                stars_item = QTableWidgetItem()
-                stars = player.get('bedwars_stars', '?')
-                if stars != '?':
-                    try:
-                        stars_value = int(stars)
-                        stars_item.setData(Qt.ItemDataRole.DisplayRole, str(stars_value))
-                        stars_item.setData(Qt.ItemDataRole.UserRole, stars_value)  # Store as integer for sorting
-                    except (ValueError, TypeError):
-                        stars_item.setText(str(stars))
-                        stars_item.setData(Qt.ItemDataRole.UserRole, -999)  # Default for sorting
-                else:
-                    stars_item.setText('?')
-                    stars_item.setData(Qt.ItemDataRole.UserRole, -1000)  # Place ? at the bottom when sorting
-                stars_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 3, stars_item)
-                
-                # FKDR column
-                fkdr_item = QTableWidgetItem()
-                fkdr = player.get('fkdr', '?')
-                if fkdr != '?':
-                    try:
-                        fkdr_value = float(fkdr)
-                        fkdr_item.setData(Qt.ItemDataRole.DisplayRole, f"{fkdr_value:.2f}")
-                        fkdr_item.setData(Qt.ItemDataRole.UserRole, fkdr_value)  # Store as float for sorting
-                    except (ValueError, TypeError):
-                        fkdr_item.setText(str(fkdr))
-                        fkdr_item.setData(Qt.ItemDataRole.UserRole, -999.0)  # Default for sorting
-                else:
-                    fkdr_item.setText('?')
-                    fkdr_item.setData(Qt.ItemDataRole.UserRole, -1000.0)  # Place ? at the bottom when sorting
-                fkdr_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 4, fkdr_item)
-                
-                # WLR column
-                wlr_item = QTableWidgetItem()
-                wlr = player.get('wlr', '?')
-                if wlr != '?':
-                    try:
-                        wlr_value = float(wlr)
-                        wlr_item.setData(Qt.ItemDataRole.DisplayRole, f"{wlr_value:.2f}")
-                        wlr_item.setData(Qt.ItemDataRole.UserRole, wlr_value)  # Store as float for sorting
-                    except (ValueError, TypeError):
-                        wlr_item.setText(str(wlr))
-                        wlr_item.setData(Qt.ItemDataRole.UserRole, -999.0)  # Default for sorting
-                else:
-                    wlr_item.setText('?')
-                    wlr_item.setData(Qt.ItemDataRole.UserRole, -1000.0)  # Place ? at the bottom when sorting
-                wlr_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 5, wlr_item)
+                # Stars, FKDR, WLR and AP columns, formatted by the stat's type in the schema
+                for column, stat in self.STAT_COLUMNS.items():
+                    stat_item = self._stat_item(player.get(stat, '?'), stats_processor.FIELD_TYPES[stat])
+                    self.table.setItem(row, column, stat_item)
                 
                 # Nick Est. column
                 nick_est_item = QTableWidgetItem(player.get('nick_estimate', ''))
@@ -1549,23 +1693,6 @@ class MainWindow(QMainWindow):
                 nick_est_item.setData(Qt.ItemDataRole.UserRole, nick_probability)
                 self.table.setItem(row, 6, nick_est_item)
                 
-                # AP column
-                ap_item = QTableWidgetItem()
-                ap = player.get('achievement_points', '?')
-                if ap != '?':
-                    try:
-                        ap_value = int(ap)
-                        ap_item.setData(Qt.ItemDataRole.DisplayRole, str(ap_value))
-                        ap_item.setData(Qt.ItemDataRole.UserRole, ap_value)  # Store as integer for sorting
-                    except (ValueError, TypeError):
-                        ap_item.setText(str(ap))
-                        ap_item.setData(Qt.ItemDataRole.UserRole, -999)  # Default for sorting
-                else:
-                    ap_item.setText('?')
-                    ap_item.setData(Qt.ItemDataRole.UserRole, -1000)  # Place ? at the bottom when sorting
-                ap_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 7, ap_item)
-                
             # Apply initial sort to rank column
             header = self.table.horizontalHeader()
             current_sort_column = header.sortIndicatorSection()
@@ -1714,6 +1841,13 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 print(f"Error during log monitor shutdown: {str(e)}")
             
+            # Release the API client's session and cache files
+            try:
+                if self.api_client:
+                    self.api_client.close()
+            except Exception as e:
+                print(f"Error closing API client: {str(e)}")
+            
             # Clear any references that might hold resources
             self.current_player_stats = []
             
@@ -1829,7 +1963,7 @@ class MainWindow(QMainWindow):
             # Default orders based on column type
             if column_index == 0:  # Rank
                 new_order = Qt.SortOrder.AscendingOrder
-            elif column_index in [3, 4, 5, 7]:  # Stars, FKDR, WLR, AP
+            elif column_index in self.STAT_COLUMNS:  # Stars, FKDR, WLR, AP
                 new_order = Qt.SortOrder.DescendingOrder
             else:
                 new_order = Qt.SortOrder.AscendingOrder
@@ -10,6 +10,10 @@ from typing import Optional, List, Dict
 # Define the config file path relative to the project root
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config.ini')
 
+# Persistent cache files are stored next to config.ini
+UUID_CACHE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), 'uuid_cache.db')
+RATE_LIMIT_FILE = os.path.join(os.path.dirname(CONFIG_FILE), 'rate_limits.json')
+
 def load_config() -> configparser.ConfigParser:
     """
     Load the configuration from config.ini.
@@ -70,6 +74,23 @@ def get_api_key() -> str:
     
     return api_key
 
+def get_additional_api_keys() -> List[str]:
+    """
+    Get any extra Hypixel API keys listed in configuration.
+    Requests are spread over these keys and the main API key, each with its own rate limit.
+    
+    Returns:
+        List[str]: The additional API keys from the comma-separated ADDITIONAL_API_KEYS
+                   setting, or an empty list if there are none.
+    """
+    config = load_config()
+    
+    if 'Hypixel' not in config or 'ADDITIONAL_API_KEYS' not in config['Hypixel']:
+        return []
+    
+    keys = [key.strip() for key in config['Hypixel']['ADDITIONAL_API_KEYS'].split(',')]
+    return [key for key in keys if key and key != "YOUR_HYPIXEL_API_KEY_HERE"]
+
 def get_default_log_paths() -> Dict[str, str]:
     """
     Get a dictionary of default log paths for different Minecraft launchers.
@@ -203,4 +224,203 @@ def set_polling_interval(seconds: int) -> None:
     """
     # Ensure reasonable bounds (1-10 seconds)
     interval = max(1, min(10, seconds))
-    save_config("Minecraft", "POLLING_INTERVAL", str(interval)) 
\ No newline at end of file
+    save_config("Minecraft", "POLLING_INTERVAL", str(interval))
+
+def _get_int_setting(section: str, key: str, default: int, minimum: int, maximum: int) -> int:
+    """
+    Get an integer setting from configuration, clamped to the given bounds.
+    Missing or invalid values are reset to the default and saved.
+    
+    Args:
+        section: The configuration section.
+        key: The configuration key.
+        default: The value to use if the setting is missing or invalid.
+        minimum: The smallest allowed value.
+        maximum: The largest allowed value.
+        
+    Returns:
+        int: The configured value.
+    """
+    config = load_config()
+    
+    if section not in config or key not in config[section]:
+        save_config(section, key, str(default))
+        return default
+    
+    try:
+        value = int(config[section][key])
+        return max(minimum, min(maximum, value))
+    except ValueError:
+        save_config(section, key, str(default))
+        return default
+
+def _get_float_setting(section: str, key: str, default: float, minimum: float, maximum: float) -> float:
+    """
+    Get a decimal setting from configuration, clamped to the given bounds.
+    Missing or invalid values are reset to the default and saved.
+    
+    Args:
+        section: The configuration section.
+        key: The configuration key.
+        default: The value to use if the setting is missing or invalid.
+        minimum: The smallest allowed value.
+        maximum: The largest allowed value.
+        
+    Returns:
+        float: The configured value.
+    """
+    config = load_config()
+    
+    if section not in config or key not in config[section]:
+        save_config(section, key, str(default))
+        return default
+    
+    try:
+        value = float(config[section][key])
+        return max(minimum, min(maximum, value))
+    except ValueError:
+        save_config(section, key, str(default))
+        return default
+
+def _get_bool_setting(section: str, key: str, default: bool) -> bool:
+    """
+    Get a true/false setting from configuration.
+    Missing or invalid values are reset to the default and saved.
+    
+    Args:
+        section: The configuration section.
+        key: The configuration key.
+        default: The value to use if the setting is missing or invalid.
+        
+    Returns:
+        bool: The configured value.
+    """
+    config = load_config()
+    
+    if section not in config or key not in config[section]:
+        save_config(section, key, str(default).lower())
+        return default
+    
+    try:
+        return config.getboolean(section, key)
+    except ValueError:
+        save_config(section, key, str(default).lower())
+        return default
+
+def get_uuid_cache_ttl() -> int:
+    """
+    Get how long resolved username -> UUID mappings stay valid in the cache.
+    
+    Returns:
+        int: The cache TTL in seconds (default: 7 days, 0 disables the cache).
+    """
+    return _get_int_setting("Cache", "UUID_CACHE_TTL", 7 * 24 * 60 * 60, 0, 30 * 24 * 60 * 60)
+
+def get_stats_cache_ttl() -> int:
+    """
+    Get how long fetched player stats are served from the cache without refreshing.
+    
+    Returns:
+        int: The fresh TTL in seconds (default: 120).
+    """
+    return _get_int_setting("Cache", "STATS_CACHE_TTL", 120, 0, 3600)
+
+def get_stats_cache_stale_ttl() -> int:
+    """
+    Get how long expired player stats may still be shown while they are refreshed in the background.
+    
+    Returns:
+        int: The stale TTL in seconds (default: 900).
+    """
+    return _get_int_setting("Cache", "STATS_CACHE_STALE_TTL", 900, 0, 24 * 60 * 60)
+
+def get_negative_cache_ttl() -> int:
+    """
+    Get how long a player that the APIs reported as nonexistent is remembered,
+    so repeated nicks aren't looked up again on every /who.
+    
+    Returns:
+        int: The TTL in seconds (default: 600). 0 disables the negative cache.
+    """
+    return _get_int_setting("Cache", "NEGATIVE_CACHE_TTL", 600, 0, 24 * 60 * 60)
+
+def get_stats_cache_size() -> int:
+    """
+    Get the maximum number of players kept in the stats cache.
+    
+    Returns:
+        int: The maximum number of cached players (default: 256).
+    """
+    return _get_int_setting("Cache", "STATS_CACHE_SIZE", 256, 0, 10000)
+
+def get_fetch_workers() -> int:
+    """
+    Get the number of players whose stats are fetched concurrently.
+    
+    Returns:
+        int: The number of concurrent lookups (default: 8, 1 fetches players one at a time).
+    """
+    return _get_int_setting("Network", "FETCH_WORKERS", 8, 1, 16)
+
+def get_max_retries() -> int:
+    """
+    Get how many times a request is retried after a transient failure (timeouts, 429 and 5xx responses).
+    
+    Returns:
+        int: The number of retries (default: 2).
+    """
+    return _get_int_setting("Network", "MAX_RETRIES", 2, 0, 5)
+
+def get_connection_pool_size() -> int:
+    """
+    Get the number of per-host connection pools kept by the HTTP session.
+    
+    Returns:
+        int: The number of pools (default: 4).
+    """
+    return _get_int_setting("Network", "POOL_SIZE", 4, 1, 32)
+
+def get_max_connections_per_host() -> int:
+    """
+    Get the maximum number of keep-alive connections kept open to each API host.
+    
+    Returns:
+        int: The maximum connections per host (default: 16).
+    """
+    return _get_int_setting("Network", "MAX_CONNECTIONS_PER_HOST", 16, 1, 100)
+
+def get_connect_timeout() -> float:
+    """
+    Get how long to wait for a connection to an API host before giving up.
+    
+    Returns:
+        float: The connect timeout in seconds (default: 3.05).
+    """
+    return _get_float_setting("Network", "CONNECT_TIMEOUT", 3.05, 0.5, 60.0)
+
+def get_read_timeout() -> float:
+    """
+    Get how long to wait for an API response before giving up.
+    
+    Returns:
+        float: The read timeout in seconds (default: 10).
+    """
+    return _get_float_setting("Network", "READ_TIMEOUT", 10.0, 1.0, 120.0)
+
+def get_accept_gzip() -> bool:
+    """
+    Get whether compressed API responses are requested.
+    
+    Returns:
+        bool: True to negotiate gzip/deflate (default), False to request uncompressed responses.
+    """
+    return _get_bool_setting("Network", "ACCEPT_GZIP", True)
+
+def get_persist_rate_limits() -> bool:
+    """
+    Get whether rate limiter state is saved so it survives application restarts.
+    
+    Returns:
+        bool: True to save and reload recent request times (default), False to start fresh each run.
+    """
+    return _get_bool_setting("Network", "PERSIST_RATE_LIMITS", True)
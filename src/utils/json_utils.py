@@ -0,0 +1,240 @@
+"""
+JSON decoding utility for Hypixel Stats Companion.
+Picks the fastest available JSON decoder for API responses, and can keep
+only selected fields of large documents.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library decoder is used without it
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional and only used for streaming projections
+    ijson = None
+
+JsonDecoder = Callable[[Union[bytes, str]], Any]
+
+def _decode_stdlib(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON with the standard library decoder.
+
+    Args:
+        data: The JSON document, as UTF-8 bytes or text.
+
+    Returns:
+        Any: The decoded value.
+    """
+    return json.loads(data)
+
+# Available decoders by name, fastest first
+DECODERS: Dict[str, JsonDecoder] = {}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+DECODERS['json'] = _decode_stdlib
+
+def get_decoder(name: Optional[str] = None) -> JsonDecoder:
+    """
+    Get a JSON decoder function.
+
+    Every decoder accepts bytes or text and raises a ValueError subclass for invalid JSON.
+
+    Args:
+        name: The decoder to use ("orjson" or "json"). If None, the fastest installed one is used.
+
+    Returns:
+        JsonDecoder: The decoder function.
+
+    Raises:
+        KeyError: If the named decoder isn't installed.
+    """
+    if name is None:
+        return next(iter(DECODERS.values()))
+
+    if name not in DECODERS:
+        raise KeyError(f"JSON decoder '{name}' is not available (installed: {', '.join(DECODERS)})")
+
+    return DECODERS[name]
+
+def get_decoder_name() -> str:
+    """
+    Get the name of the decoder that get_decoder() uses by default.
+
+    Returns:
+        str: The decoder name.
+    """
+    return next(iter(DECODERS))
+
+# Projection leaves: keep the whole value, or keep the value only if it is not an object or array
+KEEP = 'keep'
+KEEP_SCALAR = 'scalar'
+
+def compile_projection(paths: Iterable[str]) -> Dict[str, Any]:
+    """
+    Compile dotted paths into a projection tree for project() and get_projecting_decoder().
+
+    "player.networkExp" keeps that value whatever it is. A trailing "*", as in
+    "player.stats.Bedwars.*", keeps every plain value (number, string, bool, null)
+    directly under the object, but none of its nested objects or arrays.
+
+    Args:
+        paths: The dotted paths to keep.
+
+    Returns:
+        Dict[str, Any]: The projection tree.
+    """
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        keys = path.split('.')
+        node = tree
+        for key in keys[:-1]:
+            child = node.get(key)
+            if child == KEEP:
+                break  # An enclosing path already keeps everything
+            if not isinstance(child, dict):
+                child = node[key] = {}
+            node = child
+        else:
+            node[keys[-1]] = KEEP_SCALAR if keys[-1] == '*' else KEEP
+    return tree
+
+def _child_projection(projection: Any, key: str) -> Any:
+    """
+    Get the projection for a member of an object, or None if the member is dropped.
+    """
+    if projection == KEEP:
+        return KEEP
+    if not isinstance(projection, dict):
+        return None
+    return projection.get(key, projection.get('*'))
+
+def project(value: Any, projection: Any) -> Any:
+    """
+    Keep only the parts of a decoded JSON value selected by a projection tree.
+
+    Args:
+        value: The decoded value.
+        projection: A tree from compile_projection (or one of its subtrees).
+
+    Returns:
+        Any: The projected value. Dropped object members are left out.
+    """
+    if projection == KEEP:
+        return value
+    if projection == KEEP_SCALAR:
+        return None if isinstance(value, (dict, list)) else value
+    if not isinstance(value, dict):
+        return None
+
+    result = {}
+    for key, member in value.items():
+        member_projection = _child_projection(projection, key)
+        if member_projection is None:
+            continue
+        if member_projection == KEEP_SCALAR and isinstance(member, (dict, list)):
+            continue
+        if isinstance(member_projection, dict) and not isinstance(member, dict):
+            continue
+        result[key] = project(member, member_projection)
+    return result
+
+def _stream_project(data: Union[bytes, str], projection: Dict[str, Any]) -> Any:
+    """
+    Decode a JSON document incrementally, building only the parts selected by a projection.
+    Dropped members are parsed but never turned into Python objects.
+
+    Args:
+        data: The JSON document.
+        projection: A tree from compile_projection.
+
+    Returns:
+        Any: The projected value.
+
+    Raises:
+        ValueError: If the document isn't valid JSON.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    result = None
+    stack = []  # [container, projection of its members, current key]
+    skip_depth = 0  # Nesting depth inside a dropped object or array
+
+    try:
+        for event, value in ijson.basic_parse(data, use_float=True):
+            if skip_depth:
+                if event in ('start_map', 'start_array'):
+                    skip_depth += 1
+                elif event in ('end_map', 'end_array'):
+                    skip_depth -= 1
+                continue
+
+            if event == 'map_key':
+                stack[-1][2] = value
+                continue
+
+            if event in ('end_map', 'end_array'):
+                stack.pop()
+                continue
+
+            # A value starts: find out whether the projection keeps it
+            if not stack:
+                value_projection = projection
+            elif isinstance(stack[-1][0], list):
+                value_projection = KEEP  # Arrays are only ever kept whole
+            else:
+                value_projection = _child_projection(stack[-1][1], stack[-1][2])
+
+            is_container = event in ('start_map', 'start_array')
+            if (value_projection is None
+                    or (is_container and value_projection == KEEP_SCALAR)
+                    or (isinstance(value_projection, dict) and event != 'start_map')):
+                if is_container:
+                    skip_depth = 1
+                continue
+
+            if event == 'start_map':
+                value = {}
+            elif event == 'start_array':
+                value = []
+
+            if not stack:
+                result = value
+            elif isinstance(stack[-1][0], list):
+                stack[-1][0].append(value)
+            else:
+                stack[-1][0][stack[-1][2]] = value
+
+            if is_container:
+                stack.append([value, value_projection, None])
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid JSON: {str(e)}")
+
+    return result
+
+def get_projecting_decoder(paths: Iterable[str], streaming: bool = False) -> JsonDecoder:
+    """
+    Get a decoder that keeps only the given paths of a document (see compile_projection).
+
+    By default the document is fully decoded with the fastest decoder and then pruned,
+    so only one full document per worker exists at a time and just the projection is kept.
+    With streaming=True and ijson installed, dropped parts are never built at all; this
+    lowers the transient peak for very large documents, but parses several times slower.
+
+    Args:
+        paths: The dotted paths to keep.
+        streaming: Parse incrementally with ijson, if it is installed.
+
+    Returns:
+        JsonDecoder: The decoder function.
+    """
+    projection = compile_projection(paths)
+
+    if streaming and ijson is not None:
+        return lambda data: _stream_project(data, projection)
+
+    decode = get_decoder()
+    return lambda data: project(decode(data), projection)
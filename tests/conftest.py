@@ -0,0 +1,23 @@
+"""
+Shared test fixtures.
+"""
+import pytest
+
+from src.utils import config
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    """Fixture to keep config.ini and cache files out of the project directory."""
+    monkeypatch.setattr(config, 'CONFIG_FILE', str(tmp_path / 'config.ini'))
+    monkeypatch.setattr(config, 'UUID_CACHE_FILE', str(tmp_path / 'uuid_cache.db'))
+    monkeypatch.setattr(config, 'RATE_LIMIT_FILE', str(tmp_path / 'rate_limits.json'))
+    yield tmp_path
+
+@pytest.fixture(autouse=True)
+def empty_memos():
+    """Fixture to keep memoized stats and nick scores from leaking between tests."""
+    from src import nick_detector, stats_processor
+
+    stats_processor.clear_memo()
+    nick_detector.clear_memo()
+    yield
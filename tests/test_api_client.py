@@ -4,9 +4,15 @@ Tests for the API client.
 import pytest
 import requests
 import json
-from unittest.mock import MagicMock, patch
+import threading
+import time
+from unittest.mock import MagicMock, call, patch
 
-from src.api_client import ApiClient
+from src.api_client import (
+    ApiClient, ApiResponseError, RateLimiter, RateLimitStore, CircuitBreaker, ServiceUnavailableError, TimeoutHTTPAdapter,
+    PRIORITY_INTERACTIVE, PRIORITY_LOBBY, PRIORITY_BACKGROUND, STATS_REFRESH_WORKERS
+)
+from src.utils import config
 
 @pytest.fixture
 def mock_api_key():
@@ -20,6 +26,221 @@ def api_client(mock_api_key):
     """Fixture to create an API client."""
     return ApiClient()
 
+@pytest.fixture
+def clock(mocker):
+    """Fixture for a fake clock: time.time starts at 100 and time.sleep advances it."""
+    now = [100.0]
+    
+    def sleep(seconds):
+        now[0] += seconds
+    
+    mocker.patch('time.time', side_effect=lambda: now[0])
+    return mocker.patch('time.sleep', side_effect=sleep)
+
+class TestRateLimiter:
+    """Tests for the RateLimiter class."""
+    
+    def test_waits_when_window_is_full(self, mocker):
+        """Test that the limiter sleeps until the oldest request leaves the window."""
+        limiter = RateLimiter(2, 10)
+        limiter.request_timestamps.extend([0, 1])
+        mocker.patch('time.time', side_effect=[2, 10.5])
+        mock_sleep = mocker.patch('time.sleep')
+        
+        limiter.wait_if_needed()
+        
+        mock_sleep.assert_called_once_with(8)
+    
+    def test_server_budget_overrides_local_window(self, mocker):
+        """Test that a server-reported budget lets requests through a full local window."""
+        limiter = RateLimiter(2, 300)
+        limiter.request_timestamps.extend([0, 1])
+        mocker.patch('time.time', return_value=2)
+        mock_sleep = mocker.patch('time.sleep')
+        
+        limiter.sync_from_server(120, 100, 250)
+        limiter.wait_if_needed()
+        
+        mock_sleep.assert_not_called()
+        assert limiter.max_requests == 120
+        assert limiter.server_remaining == 99
+    
+    def test_server_budget_exhausted(self, clock):
+        """Test that the limiter waits for the server window to reset when no budget is left."""
+        limiter = RateLimiter(300, 300)
+        
+        limiter.sync_from_server(300, 0, 42)
+        limiter.wait_if_needed()
+        
+        clock.assert_called_once_with(42)
+    
+    def test_budget_is_checked_again_after_waiting(self, clock):
+        """Test that a request waiting for the server window to reset still respects the local window."""
+        limiter = RateLimiter(3, 10)
+        limiter.request_timestamps.extend([96, 97, 98])
+        
+        # The server window resets at 105, but the local window is full until 106
+        limiter.sync_from_server(3, 0, 5)
+        limiter.wait_if_needed()
+        
+        assert clock.call_args_list == [call(5), call(1)]
+        assert limiter.request_timestamps[-1] == 106
+    
+    def test_waiting_requests_share_the_new_window(self, mocker):
+        """Test that requests woken by a window reset don't all go out at once."""
+        now = [100.0]
+        mocker.patch('time.time', side_effect=lambda: now[0])
+        limiter = RateLimiter(300, 300)
+        limiter.sync_from_server(300, 0, 5)
+        
+        def new_window():
+            # The window resets, and the server has budget for a single request in the new one
+            now[0] = 105.0
+            limiter.sync_from_server(300, 1, 60)
+        
+        both_waiting = threading.Barrier(2, action=new_window)
+        later_waits = []
+        
+        def sleep(seconds):
+            if seconds == 5:
+                both_waiting.wait(timeout=5)
+            else:
+                later_waits.append(seconds)
+                now[0] += seconds
+        
+        mocker.patch('time.sleep', side_effect=sleep)
+        threads = [threading.Thread(target=limiter.wait_if_needed, args=(PRIORITY_INTERACTIVE,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        # One request takes the new window's budget, the other waits for the next window
+        assert later_waits == [60]
+    
+    def test_same_window_never_raises_remaining(self, mocker):
+        """Test that a stale header can't raise the remaining budget within one window."""
+        limiter = RateLimiter(300, 300)
+        mocker.patch('time.time', return_value=100)
+        
+        limiter.sync_from_server(300, 10, 60)
+        limiter.sync_from_server(300, 50, 60)
+        
+        assert limiter.server_remaining == 10
+
+    def test_interactive_requests_use_reserved_budget(self, clock):
+        """Test that lower priorities leave the reserved part of the budget to interactive requests."""
+        limiter = RateLimiter(100, 300)
+        limiter.sync_from_server(100, 5, 60)
+        
+        # An interactive request goes through immediately
+        limiter.wait_if_needed(PRIORITY_INTERACTIVE)
+        clock.assert_not_called()
+        
+        # Lobby requests keep 5% of the budget in reserve, so they have to wait
+        limiter.wait_if_needed(PRIORITY_LOBBY)
+        clock.assert_called_once_with(60)
+    
+    def test_background_requests_wait_earlier(self, clock):
+        """Test that background requests start waiting before the local window is full."""
+        # A quarter of the budget is reserved, so the background request waits for the first slot to free up
+        limiter = RateLimiter(4, 10)
+        limiter.request_timestamps.extend([97, 98, 99])
+        limiter.wait_if_needed(PRIORITY_BACKGROUND)
+        clock.assert_called_once_with(7)
+        
+        # With the same history an interactive request goes through immediately
+        clock.reset_mock()
+        limiter = RateLimiter(4, 10)
+        limiter.request_timestamps.extend([97, 98, 99])
+        limiter.wait_if_needed(PRIORITY_INTERACTIVE)
+        clock.assert_not_called()
+
+class TestRateLimitStore:
+    """Tests for the RateLimitStore class."""
+    
+    def test_state_survives_restart(self, tmp_path, mocker):
+        """Test that saved request times keep a new limiter inside the quota."""
+        path = str(tmp_path / 'rate_limits.json')
+        mocker.patch('time.time', return_value=100)
+        
+        limiter = RateLimiter(2, 300)
+        store = RateLimitStore(path, {'hypixel': limiter})
+        limiter.wait_if_needed()
+        limiter.wait_if_needed()
+        store.save(force=True)
+        
+        restored = RateLimiter(2, 300)
+        RateLimitStore(path, {'hypixel': restored})
+        
+        assert list(restored.request_timestamps) == [100, 100]
+        assert restored.remaining() == 0
+    
+    def test_expired_state_is_dropped(self, tmp_path, mocker):
+        """Test that request times outside the window are not restored."""
+        path = str(tmp_path / 'rate_limits.json')
+        mock_time = mocker.patch('time.time', return_value=100)
+        
+        limiter = RateLimiter(2, 300)
+        limiter.request_timestamps.extend([50, 90])
+        RateLimitStore(path, {'hypixel': limiter}).save(force=True)
+        
+        mock_time.return_value = 380
+        restored = RateLimiter(2, 300)
+        RateLimitStore(path, {'hypixel': restored})
+        
+        assert list(restored.request_timestamps) == [90]
+    
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        """Test that a corrupt state file doesn't stop the limiter from working."""
+        path = tmp_path / 'rate_limits.json'
+        path.write_text('not json')
+        
+        limiter = RateLimiter(2, 300)
+        RateLimitStore(str(path), {'hypixel': limiter})
+        
+        assert len(limiter.request_timestamps) == 0
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker class."""
+    
+    def test_opens_after_threshold_and_recovers(self, mocker):
+        """Test that the circuit opens, fails fast, and lets a trial request through after the timeout."""
+        mock_time = mocker.patch('time.monotonic', return_value=0)
+        breaker = CircuitBreaker('api.test', failure_threshold=2, reset_timeout=30)
+        
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert not breaker.allow_request()
+        
+        # After the timeout exactly one trial request is allowed
+        mock_time.return_value = 31
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        
+        breaker.record_success()
+        assert breaker.allow_request()
+    
+    def test_released_trial_allows_a_new_one(self, mocker):
+        """Test that a released trial leaves the circuit open but lets the next request try."""
+        mocker.patch('time.monotonic', return_value=0)
+        breaker = CircuitBreaker('api.test', failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        
+        # Only the thread making the trial can release it
+        other = threading.Thread(target=breaker.release_trial)
+        other.start()
+        other.join()
+        assert not breaker.allow_request()
+        
+        breaker.release_trial()
+        assert breaker.opened_at is not None
+        assert breaker.allow_request()
+
 class TestApiClient:
     """Tests for the ApiClient class."""
     
@@ -29,6 +250,23 @@ class TestApiClient:
         assert isinstance(api_client.session, requests.Session)
         mock_api_key.assert_called_once()
     
+    def test_session_configuration(self, api_client):
+        """Test that the session uses the configured pool size, timeouts and compression."""
+        adapter = api_client.session.get_adapter('https://api.hypixel.net/player')
+        
+        assert isinstance(adapter, TimeoutHTTPAdapter)
+        assert adapter.timeout == (config.get_connect_timeout(), config.get_read_timeout())
+        assert adapter._pool_maxsize == config.get_max_connections_per_host()
+        assert api_client.session.headers['Accept-Encoding'] == 'gzip, deflate'
+    
+    def test_session_without_gzip(self, mock_api_key, mocker):
+        """Test that compression can be turned off in config."""
+        mocker.patch('src.utils.config.get_accept_gzip', return_value=False)
+        
+        client = ApiClient()
+        
+        assert client.session.headers['Accept-Encoding'] == 'identity'
+    
     def test_get_uuid(self, api_client, mocker):
         """Test get_uuid method."""
         # Mock the _make_request method
@@ -51,6 +289,80 @@ class TestApiClient:
         with pytest.raises(ValueError, match="Player 'TestPlayer' not found"):
             api_client.get_uuid('TestPlayer')
     
+    def test_get_uuid_non_json_body(self, api_client, mocker):
+        """Test that a 200 with an HTML body is reported as an outage, not a missing player."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = b'<html><body>502 Bad Gateway</body></html>'
+        mocker.patch.object(api_client.session, 'get', return_value=mock_response)
+        
+        with pytest.raises(ServiceUnavailableError, match="Failed to get UUID for TestPlayer: .*Invalid JSON"):
+            api_client.get_uuid('TestPlayer')
+        
+        # The player isn't remembered as nonexistent
+        assert api_client.not_found_cache.get(("mojang", "testplayer")) is None
+        
+        with pytest.raises(ServiceUnavailableError, match="Request to https://test.url failed: Invalid JSON"):
+            api_client._make_request('https://test.url')
+    
+    def test_get_uuid_not_found_is_cached(self, api_client, mocker):
+        """Test that a name Mojang doesn't know isn't looked up again."""
+        mocker.patch.object(api_client, '_make_request', side_effect=ApiResponseError(404, 'API request failed with status code 404: '))
+        
+        for name in ('NickedPlayer', 'nickedplayer'):
+            with pytest.raises(ValueError, match="Failed to get UUID for"):
+                api_client.get_uuid(name)
+        
+        assert api_client._make_request.call_count == 1
+        
+        # The bulk lookup reports the cached nick without a request as well
+        assert api_client.get_uuids(['NickedPlayer']) == {'NickedPlayer': None}
+        assert api_client._make_request.call_count == 1
+    
+    def test_get_uuid_cached(self, api_client, mocker):
+        """Test that get_uuid serves repeat lookups from the UUID cache."""
+        mock_response = {'id': 'test_uuid', 'name': 'TestPlayer'}
+        mocker.patch.object(api_client, '_make_request', return_value=mock_response)
+        
+        assert api_client.get_uuid('TestPlayer') == 'test_uuid'
+        assert api_client.get_uuid('testplayer') == 'test_uuid'
+        
+        # Only the first lookup should hit the Mojang API
+        assert api_client._make_request.call_count == 1
+    
+    def test_get_uuids(self, api_client, mocker):
+        """Test get_uuids resolves names in chunks of 10 and reports missing names."""
+        usernames = [f'Player{i}' for i in range(12)]
+        
+        def fake_bulk(url, is_hypixel=True, json_body=None):
+            # Pretend Player3 is a nick that Mojang doesn't know about
+            return [{'id': f'uuid_{name}', 'name': name.capitalize()} for name in json_body if name != 'player3']
+        
+        mocker.patch.object(api_client, '_make_request', side_effect=fake_bulk)
+        
+        result = api_client.get_uuids(usernames)
+        
+        assert api_client._make_request.call_count == 2
+        assert result['Player0'] == 'uuid_player0'
+        assert result['Player11'] == 'uuid_player11'
+        assert result['Player3'] is None
+        assert len(result) == 12
+        
+        # Resolved names are cached for single lookups
+        assert api_client.get_uuid('Player5') == 'uuid_player5'
+        assert api_client._make_request.call_count == 2
+        
+        # So are names Mojang left out
+        with pytest.raises(ValueError, match="Player 'Player3' not found"):
+            api_client.get_uuid('Player3')
+        assert api_client._make_request.call_count == 2
+    
+    def test_get_uuids_chunk_failure(self, api_client, mocker):
+        """Test that names from a failed chunk are left out of the result."""
+        mocker.patch.object(api_client, '_make_request', side_effect=requests.RequestException('Connection error'))
+        
+        assert api_client.get_uuids(['Player1', 'Player2']) == {}
+    
     def test_get_player_stats(self, api_client, mocker):
         """Test get_player_stats method."""
         # Mock the _make_request method
@@ -67,6 +379,103 @@ class TestApiClient:
             {'key': 'test_api_key', 'uuid': 'test_uuid'}
         )
     
+    def test_get_player_stats_keeps_only_needed_fields(self, api_client, mocker):
+        """Test that player responses are reduced to the fields the stats processor uses."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({
+            'success': True,
+            'player': {
+                'uuid': 'test_uuid',
+                'networkExp': 1000,
+                'stats': {'Bedwars': {'wins_bedwars': 10, 'packages': ['a']}, 'SkyWars': {'wins': 3}}
+            }
+        }).encode()
+        mocker.patch.object(api_client.session, 'get', return_value=mock_response)
+        
+        result = api_client.get_player_stats('test_uuid')
+        
+        assert result == {'uuid': 'test_uuid', 'networkExp': 1000, 'stats': {'Bedwars': {'wins_bedwars': 10}}}
+    
+    def test_get_player_stats_not_found_is_cached(self, api_client, mocker):
+        """Test that a UUID without a Hypixel player isn't looked up again."""
+        mocker.patch.object(api_client, '_make_request', return_value={'success': True, 'player': None})
+        
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Player with UUID 'test_uuid' not found"):
+                api_client.get_player_stats('test_uuid')
+        
+        assert api_client._make_request.call_count == 1
+    
+    def test_get_player_stats_cached(self, api_client, mocker):
+        """Test that fresh cached stats are returned without a request."""
+        mock_player_data = {'success': True, 'player': {'uuid': 'test_uuid', 'stats': {}}}
+        mocker.patch.object(api_client, '_make_request', return_value=mock_player_data)
+        
+        api_client.get_player_stats('test_uuid')
+        result = api_client.get_player_stats('test_uuid')
+        
+        assert result == mock_player_data['player']
+        assert api_client._make_request.call_count == 1
+    
+    def test_get_player_stats_stale_schedules_refresh(self, api_client, mocker):
+        """Test that stale cached stats are returned and refreshed in the background."""
+        api_client.stats_cache.put('test_uuid', {'uuid': 'test_uuid'})
+        mocker.patch.object(api_client.stats_cache, 'get', return_value=({'uuid': 'test_uuid'}, False))
+        mocker.patch.object(api_client, '_make_request')
+        mock_refresh = mocker.patch.object(api_client, '_schedule_stats_refresh')
+        
+        result = api_client.get_player_stats('test_uuid')
+        
+        assert result == {'uuid': 'test_uuid'}
+        mock_refresh.assert_called_once_with('test_uuid')
+        api_client._make_request.assert_not_called()
+    
+    def test_stats_refreshes_are_bounded(self, api_client, mocker):
+        """Test that stale refreshes run on a few background workers, once per player."""
+        release = threading.Event()
+        lock = threading.Lock()
+        running = [0]
+        most_running = [0]
+        
+        def fetch(uuid):
+            with lock:
+                running[0] += 1
+                most_running[0] = max(most_running[0], running[0])
+            release.wait(timeout=5)
+            with lock:
+                running[0] -= 1
+        
+        mock_fetch = mocker.patch.object(api_client, '_fetch_player_stats', side_effect=fetch)
+        uuids = [f'uuid_{i}' for i in range(16)]
+        
+        for uuid in uuids + uuids:
+            api_client._schedule_stats_refresh(uuid)
+        time.sleep(0.1)
+        release.set()
+        api_client._refresh_executor.shutdown(wait=True)
+        
+        assert most_running[0] == STATS_REFRESH_WORKERS
+        assert sorted(c.args[0] for c in mock_fetch.call_args_list) == sorted(uuids)
+        assert api_client._refreshing == set()
+    
+    def test_close_cancels_queued_refreshes(self, api_client, mocker):
+        """Test that closing the client drops refreshes that haven't started."""
+        release = threading.Event()
+        mock_fetch = mocker.patch.object(api_client, '_fetch_player_stats', side_effect=lambda uuid: release.wait(timeout=5))
+        
+        for i in range(STATS_REFRESH_WORKERS + 3):
+            api_client._schedule_stats_refresh(f'uuid_{i}')
+        time.sleep(0.1)
+        api_client.close()
+        release.set()
+        
+        # Refreshes scheduled after closing are ignored
+        api_client._schedule_stats_refresh('late_uuid')
+        
+        assert mock_fetch.call_count == STATS_REFRESH_WORKERS
+        assert 'late_uuid' not in api_client._refreshing
+    
     def test_get_player_stats_player_not_found(self, api_client, mocker):
         """Test get_player_stats method when player is not found."""
         # Mock the _make_request method
@@ -108,7 +517,7 @@ class TestApiClient:
         # Mock the requests.Session.get method
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'success': True, 'data': 'test_data'}
+        mock_response.content = json.dumps({'success': True, 'data': 'test_data'}).encode()
         mocker.patch.object(api_client.session, 'get', return_value=mock_response)
         
         # Mock time.time and time.sleep
@@ -143,7 +552,7 @@ class TestApiClient:
         # Mock the requests.Session.get method
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'success': False, 'cause': 'Invalid API key'}
+        mock_response.content = json.dumps({'success': False, 'cause': 'Invalid API key'}).encode()
         mocker.patch.object(api_client.session, 'get', return_value=mock_response)
         
         # Mock time.time and time.sleep
@@ -165,4 +574,228 @@ class TestApiClient:
         
         # Call the method and check for exception
         with pytest.raises(requests.RequestException, match="Request to https://test.url failed: Connection error"):
-            api_client._make_request('https://test.url') 
\ No newline at end of file
+            api_client._make_request('https://test.url')
+    
+    def test_make_request_coalesces_duplicates(self, api_client, mocker):
+        """Test that concurrent identical requests share one network call."""
+        release = threading.Event()
+        
+        def slow_get(url, params=None):
+            release.wait(timeout=5)
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.content = json.dumps({'success': True, 'player': {'uuid': 'test_uuid'}}).encode()
+            return mock_response
+        
+        mocker.patch.object(api_client.session, 'get', side_effect=slow_get)
+        mocker.patch.object(api_client.rate_limiter, 'wait_if_needed')
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(api_client._make_request('https://test.url', {'uuid': 'test_uuid'})))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        # Give every thread time to join the in-flight request before it completes
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert api_client.session.get.call_count == 1
+        assert len(results) == 5
+        assert all(result == {'success': True, 'player': {'uuid': 'test_uuid'}} for result in results)
+    
+    def test_make_request_syncs_rate_limit_headers(self, api_client, mocker):
+        """Test that Hypixel rate limit headers update the limiter."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {'RateLimit-Limit': '300', 'RateLimit-Remaining': '250', 'RateLimit-Reset': '120'}
+        mock_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(api_client.session, 'get', return_value=mock_response)
+        
+        api_client._make_request('https://test.url')
+        
+        assert api_client.rate_limiter.server_remaining == 250
+    
+    def test_make_request_uses_key_with_most_budget(self, mock_api_key, mocker):
+        """Test that Hypixel requests are sent with the pooled key that has the most budget left."""
+        mocker.patch('src.utils.config.get_additional_api_keys', return_value=['second_key'])
+        client = ApiClient()
+        client.key_limiters['test_api_key'].sync_from_server(300, 10, 200)
+        client.key_limiters['second_key'].sync_from_server(300, 200, 200)
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(client.session, 'get', return_value=mock_response)
+        
+        client._make_request('https://test.url', {'key': 'test_api_key', 'uuid': 'test_uuid'})
+        
+        client.session.get.assert_called_once_with('https://test.url', params={'key': 'second_key', 'uuid': 'test_uuid'})
+        assert client.key_limiters['second_key'].server_remaining == 199
+        assert client.key_limiters['test_api_key'].server_remaining == 10
+    
+    def test_priority_is_per_thread(self, api_client, mocker):
+        """Test that the priority context applies to requests made on the current thread."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(api_client.session, 'get', return_value=mock_response)
+        mock_wait = mocker.patch.object(api_client.rate_limiter, 'wait_if_needed')
+        
+        with api_client.priority(PRIORITY_INTERACTIVE):
+            api_client._make_request('https://test.url/a')
+        api_client._make_request('https://test.url/b')
+        
+        assert [c.args[0] for c in mock_wait.call_args_list] == [PRIORITY_INTERACTIVE, PRIORITY_LOBBY]
+    
+    def test_interactive_request_does_not_join_waiting_lobby_request(self, api_client, mocker):
+        """Test that an interactive request is sent even while the same lobby request waits for budget."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(api_client.session, 'get', return_value=mock_response)
+        lobby_waiting = threading.Event()
+        release_lobby = threading.Event()
+        
+        def wait_if_needed(priority):
+            if priority == PRIORITY_LOBBY:
+                lobby_waiting.set()
+                release_lobby.wait(timeout=5)
+        
+        mocker.patch.object(api_client.rate_limiter, 'wait_if_needed', side_effect=wait_if_needed)
+        lobby = threading.Thread(target=api_client._make_request, args=('https://test.url',))
+        lobby.start()
+        lobby_waiting.wait(timeout=5)
+        
+        with api_client.priority(PRIORITY_INTERACTIVE):
+            result = api_client._make_request('https://test.url')
+        
+        # The interactive request was answered while the lobby request was still held back
+        assert result == {'success': True}
+        assert api_client.session.get.call_count == 1
+        release_lobby.set()
+        lobby.join(timeout=5)
+        assert api_client.session.get.call_count == 2
+    
+    def test_make_request_pinned_key(self, mock_api_key, mocker):
+        """Test that a pinned request keeps its own key even when another key has more budget."""
+        mocker.patch('src.utils.config.get_additional_api_keys', return_value=['second_key'])
+        client = ApiClient()
+        client.key_limiters['test_api_key'].sync_from_server(300, 50, 200)
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(client.session, 'get', return_value=mock_response)
+        
+        client._make_request('https://test.url', {'key': 'test_api_key'}, pin_key=True)
+        
+        client.session.get.assert_called_once_with('https://test.url', params={'key': 'test_api_key'})
+    
+    def test_make_request_honors_retry_after(self, api_client, mocker):
+        """Test that a 429 response blocks the limiter for Retry-After seconds."""
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.text = 'Too Many Requests'
+        mock_response.headers = {'Retry-After': '30'}
+        mocker.patch.object(api_client.session, 'get', return_value=mock_response)
+        mocker.patch('time.time', return_value=1000)
+        
+        # A 30 second wait is too long to retry, so the request fails instead of stalling
+        with pytest.raises(ServiceUnavailableError, match="status code 429"):
+            api_client._make_request('https://test.url')
+        
+        assert api_client.session.get.call_count == 1
+        assert api_client.rate_limiter.server_remaining == 0
+        assert api_client.rate_limiter.server_reset_at == 1030
+    
+    def test_make_request_retries_server_errors(self, api_client, mocker):
+        """Test that 5xx responses are retried with backoff."""
+        error_response = MagicMock()
+        error_response.status_code = 503
+        error_response.text = 'Service Unavailable'
+        ok_response = MagicMock()
+        ok_response.status_code = 200
+        ok_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(api_client.session, 'get', side_effect=[error_response, ok_response])
+        mock_sleep = mocker.patch('time.sleep')
+        
+        assert api_client._make_request('https://test.url') == {'success': True}
+        assert api_client.session.get.call_count == 2
+        mock_sleep.assert_called_once()
+    
+    def test_make_request_connection_errors_exhaust_retries(self, api_client, mocker):
+        """Test that persistent connection errors raise ServiceUnavailableError after retrying."""
+        mocker.patch.object(api_client.session, 'get', side_effect=requests.ConnectionError('Connection refused'))
+        mocker.patch('time.sleep')
+        
+        with pytest.raises(ServiceUnavailableError, match="Connection refused"):
+            api_client._make_request('https://test.url')
+        
+        assert api_client.session.get.call_count == api_client.max_retries + 1
+    
+    @pytest.mark.parametrize('trial_error', [
+        'rate_limited',
+        requests.TooManyRedirects('Exceeded 30 redirects')
+    ])
+    def test_half_open_trial_is_released(self, api_client, mocker, clock, trial_error):
+        """Test that a trial request ending in a 429 or a request error doesn't keep the circuit open."""
+        rate_limited = MagicMock()
+        rate_limited.status_code = 429
+        rate_limited.text = 'Too Many Requests'
+        rate_limited.headers = {'Retry-After': '30'}
+        ok_response = MagicMock()
+        ok_response.status_code = 200
+        ok_response.headers = {}
+        ok_response.content = json.dumps({'success': True}).encode()
+        first = rate_limited if trial_error == 'rate_limited' else trial_error
+        mocker.patch.object(api_client.session, 'get', side_effect=[first, ok_response])
+        
+        # Open the circuit, then let the timeout pass so the next request is the trial
+        breaker = api_client._get_circuit_breaker('https://test.url')
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        breaker.opened_at -= breaker.reset_timeout + 1
+        
+        with pytest.raises(requests.RequestException):
+            api_client._make_request('https://test.url')
+        
+        # The next request is allowed through as a new trial, and closes the circuit
+        assert api_client._make_request('https://test.url') == {'success': True}
+        assert api_client.session.get.call_count == 2
+        assert breaker.opened_at is None
+    
+    def test_half_open_trial_retries_short_429(self, api_client, mocker, clock):
+        """Test that a trial request answered with a short Retry-After is retried instead of failing fast."""
+        rate_limited = MagicMock()
+        rate_limited.status_code = 429
+        rate_limited.text = 'Too Many Requests'
+        rate_limited.headers = {'Retry-After': '2'}
+        ok_response = MagicMock()
+        ok_response.status_code = 200
+        ok_response.headers = {}
+        ok_response.content = json.dumps({'success': True}).encode()
+        mocker.patch.object(api_client.session, 'get', side_effect=[rate_limited, ok_response])
+        breaker = api_client._get_circuit_breaker('https://test.url')
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        breaker.opened_at -= breaker.reset_timeout + 1
+        
+        assert api_client._make_request('https://test.url') == {'success': True}
+        assert breaker.opened_at is None
+    
+    def test_make_request_fails_fast_when_circuit_open(self, api_client, mocker):
+        """Test that an open circuit skips the network entirely."""
+        mocker.patch.object(api_client.session, 'get')
+        breaker = api_client._get_circuit_breaker('https://test.url')
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        
+        with pytest.raises(ServiceUnavailableError, match="test.url is unavailable"):
+            api_client._make_request('https://test.url')
+        
+        api_client.session.get.assert_not_called()
@@ -0,0 +1,163 @@
+"""
+Tests for the asyncio API client, run against a local stand-in HTTP server.
+"""
+import asyncio
+import time
+
+import pytest
+import requests
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+from src.async_api_client import AsyncApiClient, AsyncRateLimiter
+from src.cache import UuidCache
+
+async def _start_fake_api(delay: float = 0.0):
+    """Start a local server that mimics the Mojang and Hypixel endpoints."""
+    async def profile(request):
+        await asyncio.sleep(delay)
+        name = request.match_info['name']
+        if name == 'NickedPlayer':
+            return web.Response(status=404, text='Not Found')
+        if name == 'ProxyError':
+            return web.Response(status=200, text='<html>Bad Gateway</html>', content_type='text/html')
+        return web.json_response({'id': f'uuid_{name.lower()}', 'name': name})
+    
+    async def player(request):
+        await asyncio.sleep(delay)
+        if request.query.get('key') != 'test_api_key':
+            return web.json_response({'success': False, 'cause': 'Invalid API key'})
+        uuid = request.query['uuid']
+        if uuid == 'unknown_uuid':
+            return web.json_response({'success': True, 'player': None})
+        return web.json_response({'success': True, 'player': {'uuid': uuid, 'stats': {}}})
+    
+    async def status(request):
+        return web.json_response({'success': True, 'session': {'online': True}})
+    
+    async def key(request):
+        return web.json_response({'success': True, 'record': {'owner': 'owner_uuid'}})
+    
+    app = web.Application()
+    app.router.add_get('/users/profiles/minecraft/{name}', profile)
+    app.router.add_get('/player', player)
+    app.router.add_get('/status', status)
+    app.router.add_get('/key', key)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+def _run_with_client(test_coro, delay: float = 0.0):
+    """Run a test coroutine with a client pointed at the local server."""
+    async def runner():
+        server, base_url = await _start_fake_api(delay)
+        try:
+            async with AsyncApiClient('test_api_key', uuid_cache=UuidCache(),
+                                      hypixel_url=base_url, mojang_url=base_url) as client:
+                return await test_coro(client)
+        finally:
+            await server.cleanup()
+    
+    return asyncio.run(runner())
+
+class TestAsyncApiClient:
+    """Tests for the AsyncApiClient class."""
+    
+    def test_get_uuid(self):
+        """Test get_uuid against the local server."""
+        async def check(client):
+            assert await client.get_uuid('TestPlayer') == 'uuid_testplayer'
+            with pytest.raises(ValueError, match="Failed to get UUID for NickedPlayer"):
+                await client.get_uuid('NickedPlayer')
+        
+        _run_with_client(check)
+    
+    def test_get_player_stats(self):
+        """Test get_player_stats against the local server."""
+        async def check(client):
+            assert await client.get_player_stats('test_uuid') == {'uuid': 'test_uuid', 'stats': {}}
+            with pytest.raises(ValueError, match="Player with UUID 'unknown_uuid' not found"):
+                await client.get_player_stats('unknown_uuid')
+        
+        _run_with_client(check)
+    
+    def test_get_player_status_and_verify(self):
+        """Test get_player_status and verify_api_key against the local server."""
+        async def check(client):
+            assert await client.get_player_status('test_uuid') == {'online': True}
+            assert await client.verify_api_key() is True
+        
+        _run_with_client(check)
+    
+    def test_concurrent_lookups(self):
+        """Test that many lookups run concurrently on one thread."""
+        async def check(client):
+            start = time.monotonic()
+            uuids = await asyncio.gather(*(client.get_uuid(f'Player{i}') for i in range(200)))
+            elapsed = time.monotonic() - start
+            
+            assert uuids == [f'uuid_player{i}' for i in range(200)]
+            # 200 sequential requests would take at least 40 seconds
+            assert elapsed < 5
+        
+        _run_with_client(check, delay=0.2)
+    
+    def test_duplicate_lookups_share_one_request(self):
+        """Test that concurrent identical lookups are coalesced into one request."""
+        async def check(client):
+            calls = []
+            original = client._send_request
+            
+            async def counting_send(*args):
+                calls.append(args)
+                return await original(*args)
+            
+            client._send_request = counting_send
+            stats = await asyncio.gather(*(client.get_player_stats('test_uuid') for _ in range(10)))
+            
+            assert len(calls) == 1
+            assert all(result == {'uuid': 'test_uuid', 'stats': {}} for result in stats)
+        
+        _run_with_client(check, delay=0.1)
+    
+    def test_connection_error(self):
+        """Test that connection failures are reported as requests exceptions."""
+        async def check():
+            async with AsyncApiClient('test_api_key', uuid_cache=UuidCache(),
+                                      mojang_url='http://127.0.0.1:1') as client:
+                with pytest.raises(requests.RequestException, match="Failed to get UUID for TestPlayer"):
+                    await client.get_uuid('TestPlayer')
+        
+        asyncio.run(check())
+    
+    def test_non_json_body_is_unavailable(self):
+        """Test that a 200 with an HTML body is reported as an outage, not a missing player."""
+        async def check(client):
+            with pytest.raises(requests.RequestException, match="Invalid JSON"):
+                await client.get_uuid('ProxyError')
+        
+        _run_with_client(check)
+
+class TestAsyncRateLimiter:
+    """Tests for the AsyncRateLimiter class."""
+    
+    def test_waits_when_window_is_full(self, mocker):
+        """Test that the limiter sleeps until the oldest request leaves the window."""
+        limiter = AsyncRateLimiter(2, 10)
+        mock_sleep = mocker.patch('src.async_api_client.asyncio.sleep')
+        mocker.patch('src.async_api_client.time.time', side_effect=[0, 1, 2, 10.5])
+        
+        async def check():
+            await limiter.wait_if_needed()
+            await limiter.wait_if_needed()
+            await limiter.wait_if_needed()
+        
+        asyncio.run(check())
+        
+        mock_sleep.assert_called_once_with(8)
+        assert len(limiter.request_timestamps) == 2
@@ -0,0 +1,110 @@
+"""
+Tests for the caching utilities.
+"""
+from src.cache import UuidCache, TTLCache, FingerprintCache
+
+class TestUuidCache:
+    """Tests for the UuidCache class."""
+    
+    def test_put_and_get(self):
+        """Test storing and retrieving a UUID."""
+        cache = UuidCache()
+        cache.put('TestPlayer', 'test_uuid')
+        
+        assert cache.get('TestPlayer') == 'test_uuid'
+        assert cache.get('testplayer') == 'test_uuid'
+        assert cache.get('OtherPlayer') is None
+    
+    def test_expired_entry(self, mocker):
+        """Test that entries older than the TTL are not returned."""
+        cache = UuidCache(ttl=60)
+        mocker.patch('src.cache.time.time', return_value=1000.0)
+        cache.put('TestPlayer', 'test_uuid')
+        
+        mocker.patch('src.cache.time.time', return_value=1061.0)
+        assert cache.get('TestPlayer') is None
+    
+    def test_disabled_cache(self):
+        """Test that a TTL of 0 disables the cache."""
+        cache = UuidCache(ttl=0)
+        cache.put('TestPlayer', 'test_uuid')
+        
+        assert cache.get('TestPlayer') is None
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries are reloaded from the database file."""
+        db_path = str(tmp_path / 'uuids.db')
+        cache = UuidCache(db_path)
+        cache.put('TestPlayer', 'test_uuid')
+        cache.close()
+        
+        reloaded = UuidCache(db_path)
+        assert reloaded.get('TestPlayer') == 'test_uuid'
+        
+        reloaded.invalidate('TestPlayer')
+        reloaded.close()
+        assert UuidCache(db_path).get('TestPlayer') is None
+
+class TestTTLCache:
+    """Tests for the TTLCache class."""
+    
+    def test_fresh_and_stale(self, mocker):
+        """Test that entries go from fresh to stale to expired."""
+        mock_time = mocker.patch('src.cache.time.monotonic', return_value=0.0)
+        cache = TTLCache(max_entries=10, ttl=60, stale_ttl=120)
+        cache.put('uuid', {'stars': 100})
+        
+        mock_time.return_value = 30.0
+        assert cache.get('uuid') == ({'stars': 100}, True)
+        
+        mock_time.return_value = 90.0
+        assert cache.get('uuid') == ({'stars': 100}, False)
+        
+        mock_time.return_value = 180.0
+        assert cache.get('uuid') is None
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        
+        # Touch 'a' so 'b' becomes the least recently used entry
+        cache.get('a')
+        cache.put('c', 3)
+        
+        assert cache.get('a') == (1, True)
+        assert cache.get('b') is None
+        assert cache.get('c') == (3, True)
+        assert len(cache) == 2
+
+class TestFingerprintCache:
+    """Tests for the FingerprintCache class."""
+    
+    def test_hit_only_while_fingerprint_matches(self):
+        """Test that a changed fingerprint misses and the new value replaces the old one."""
+        cache = FingerprintCache(max_entries=4)
+        
+        cache.put('uuid1', (100, 5), 'old')
+        
+        assert cache.get('uuid1', (100, 5)) == 'old'
+        assert cache.get('uuid1', (100, 6)) is None
+        
+        cache.put('uuid1', (100, 6), 'new')
+        
+        assert cache.get('uuid1', (100, 6)) == 'new'
+        assert cache.get('uuid1', (100, 5)) is None
+        assert len(cache) == 1
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays bounded, evicting the least recently used key."""
+        cache = FingerprintCache(max_entries=2)
+        
+        cache.put('a', 1, 'A')
+        cache.put('b', 1, 'B')
+        cache.get('a', 1)
+        cache.put('c', 1, 'C')
+        
+        assert cache.get('a', 1) == 'A'
+        assert cache.get('b', 1) is None
+        assert cache.get('c', 1) == 'C'
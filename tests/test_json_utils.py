@@ -0,0 +1,114 @@
+"""
+Tests for the JSON decoding utility.
+"""
+import json
+
+import pytest
+
+from src.utils import json_utils
+
+class TestJsonUtils:
+    """Tests for the json_utils module."""
+    
+    @pytest.mark.parametrize('name', list(json_utils.DECODERS))
+    def test_decoders_accept_bytes_and_text(self, name):
+        """Test that every installed decoder handles bytes and text alike."""
+        decoder = json_utils.get_decoder(name)
+        
+        assert decoder(b'{"player": {"displayname": "Test"}}') == {'player': {'displayname': 'Test'}}
+        assert decoder('{"success": true}') == {'success': True}
+    
+    @pytest.mark.parametrize('name', list(json_utils.DECODERS))
+    def test_invalid_json_raises_value_error(self, name):
+        """Test that invalid JSON raises a ValueError with every decoder."""
+        with pytest.raises(ValueError):
+            json_utils.get_decoder(name)(b'{"success": ')
+    
+    def test_default_decoder_is_fastest_available(self):
+        """Test that the default decoder is the first one listed."""
+        assert json_utils.get_decoder() is json_utils.DECODERS[json_utils.get_decoder_name()]
+        assert 'json' in json_utils.DECODERS
+    
+    def test_unknown_decoder(self):
+        """Test that asking for a decoder that isn't installed raises KeyError."""
+        with pytest.raises(KeyError):
+            json_utils.get_decoder('missing')
+
+class TestProjection:
+    """Tests for projected decoding."""
+    
+    PATHS = ['success', 'player.uuid', 'player.achievements.bedwars_level', 'player.stats.Bedwars.*']
+    
+    DOCUMENT = {
+        'success': True,
+        'player': {
+            'uuid': 'test_uuid',
+            'achievements': {'bedwars_level': 120, 'general_wins': 5},
+            'achievementsOneTime': ['one', 'two'],
+            'stats': {
+                'Bedwars': {'wins_bedwars': 10, 'coins': 2.5, 'packages': ['a', 'b'], 'favourites': {'slot': 1}},
+                'SkyWars': {'wins': 3}
+            }
+        }
+    }
+    
+    EXPECTED = {
+        'success': True,
+        'player': {
+            'uuid': 'test_uuid',
+            'achievements': {'bedwars_level': 120},
+            'stats': {'Bedwars': {'wins_bedwars': 10, 'coins': 2.5}}
+        }
+    }
+    
+    def test_project(self):
+        """Test that project keeps only the selected paths of a decoded value."""
+        assert json_utils.project(self.DOCUMENT, json_utils.compile_projection(self.PATHS)) == self.EXPECTED
+    
+    def test_enclosing_path_keeps_everything(self):
+        """Test that a path keeps its whole value, even when a longer path is listed too."""
+        projection = json_utils.compile_projection(['player.achievements', 'player.achievements.bedwars_level'])
+        
+        result = json_utils.project(self.DOCUMENT, projection)
+        
+        assert result == {'player': {'achievements': {'bedwars_level': 120, 'general_wins': 5}}}
+    
+    def test_stream_project(self):
+        """Test that the streaming parser builds the same result as decode-then-project."""
+        pytest.importorskip('ijson')
+        
+        data = json.dumps(self.DOCUMENT).encode('utf-8')
+        
+        assert json_utils._stream_project(data, json_utils.compile_projection(self.PATHS)) == self.EXPECTED
+    
+    def test_stream_project_invalid_json(self):
+        """Test that invalid JSON raises a ValueError from the streaming parser."""
+        pytest.importorskip('ijson')
+        
+        with pytest.raises(ValueError):
+            json_utils._stream_project(b'{"player": {', json_utils.compile_projection(self.PATHS))
+    
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_projecting_decoder(self, streaming):
+        """Test the decoder returned by get_projecting_decoder, whichever parser it uses."""
+        decoder = json_utils.get_projecting_decoder(self.PATHS, streaming=streaming)
+        
+        assert decoder(json.dumps(self.DOCUMENT).encode('utf-8')) == self.EXPECTED
+    
+    def test_streaming_decoder_uses_ijson(self, mocker):
+        """Test that a streaming decoder parses with ijson when it is installed."""
+        pytest.importorskip('ijson')
+        spy = mocker.spy(json_utils, '_stream_project')
+        
+        decoder = json_utils.get_projecting_decoder(self.PATHS, streaming=True)
+        
+        assert decoder(json.dumps(self.DOCUMENT).encode('utf-8')) == self.EXPECTED
+        assert spy.call_count == 1
+    
+    def test_streaming_decoder_without_ijson(self, monkeypatch):
+        """Test that a streaming decoder falls back to decode-then-project without ijson."""
+        monkeypatch.setattr(json_utils, 'ijson', None)
+        
+        decoder = json_utils.get_projecting_decoder(self.PATHS, streaming=True)
+        
+        assert decoder(json.dumps(self.DOCUMENT).encode('utf-8')) == self.EXPECTED
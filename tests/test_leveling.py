@@ -0,0 +1,86 @@
+"""
+Tests for the leveling module.
+"""
+import pytest
+
+from src import leveling
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def batch_mode(request, monkeypatch):
+    """Run a test with NumPy (if installed) and with the pure Python fallback."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(leveling, 'np', None)
+    return request.param
+
+class TestBedwarsLeveling:
+    """Tests for the Bedwars star functions."""
+
+    def test_prestige_costs_487000_xp(self):
+        """Test that a prestige needs the warm-up stars plus 96 regular stars."""
+        assert leveling.BEDWARS_XP_PER_PRESTIGE == 487000
+        assert leveling.get_bedwars_xp_for_star(100) == 487000
+
+    @pytest.mark.parametrize('experience, star', [
+        (-10, 0), (0, 0), (499, 0), (500, 1), (1499, 1), (1500, 2), (3500, 3), (7000, 4),
+        (11999, 4), (12000, 5), (486999, 99), (487000, 100), (487500, 101), (494000, 104),
+        (487000 * 10 + 7000, 1004)
+    ])
+    def test_star_from_experience(self, experience, star):
+        """Test stars at the warm-up and prestige boundaries."""
+        assert leveling.get_bedwars_star(experience) == star
+
+    def test_star_and_xp_are_inverse(self):
+        """Test that the experience needed for a star gives that star."""
+        for star in range(0, 1500, 7):
+            xp = leveling.get_bedwars_xp_for_star(star)
+            assert leveling.get_bedwars_star(xp) == star
+            assert leveling.get_bedwars_star(xp - 1) == max(star - 1, 0)
+
+    def test_xp_to_next_star(self):
+        """Test the experience missing for the next star."""
+        assert leveling.get_bedwars_xp_to_next_star(0) == 500
+        assert leveling.get_bedwars_xp_to_next_star(600) == 900
+        assert leveling.get_bedwars_xp_to_next_star(487000) == 500
+
+    def test_level_with_progress(self):
+        """Test that the fractional level shows progress towards the next star."""
+        assert leveling.get_bedwars_level(9500) == pytest.approx(4.5)
+        assert leveling.get_bedwars_level(487250) == pytest.approx(100.5)
+
+    def test_stars_batch(self, batch_mode):
+        """Test that the batch function matches the single one."""
+        values = [-5, 0, 499, 500, 7000, 486999, 487000, 5000000, 1234.7]
+
+        result = leveling.get_bedwars_stars_batch(values)
+
+        assert list(result) == [leveling.get_bedwars_star(value) for value in values]
+
+class TestNetworkLeveling:
+    """Tests for the network level functions."""
+
+    @pytest.mark.parametrize('experience, level', [
+        (0, 1.0), (10000, 2.0), (22500, 3.0), (2350000, 41.0)
+    ])
+    def test_level_from_experience(self, experience, level):
+        """Test network levels at whole-level boundaries."""
+        assert leveling.get_network_level(experience) == pytest.approx(level)
+
+    def test_level_and_xp_are_inverse(self):
+        """Test that the experience needed for a level gives that level."""
+        for level in range(1, 300):
+            assert leveling.get_network_level(leveling.get_network_xp_for_level(level)) == pytest.approx(level)
+
+    def test_xp_to_next_level(self):
+        """Test the experience missing for the next level."""
+        assert leveling.get_network_xp_to_next_level(0) == pytest.approx(10000)
+        assert leveling.get_network_xp_to_next_level(12500) == pytest.approx(10000)
+
+    def test_levels_batch(self, batch_mode):
+        """Test that the batch function matches the single one."""
+        values = [0, 1, 10000, 1234567.0, 50000000]
+
+        result = leveling.get_network_levels_batch(values)
+
+        assert list(result) == pytest.approx([leveling.get_network_level(value) for value in values])
@@ -0,0 +1,307 @@
+"""
+Tests for the log monitor.
+"""
+import datetime
+
+import pytest
+
+from src import log_monitor
+from src.log_monitor import (
+    BedDestroyed, FinalKill, GameStarted, LineClassifier, LobbyJoined, LogMonitor, LogTailer, PlayerJoined,
+    TeamAssigned, WhoList, parse_lines
+)
+
+WHO_LINE = '[12:00:00] [Client thread/INFO]: [CHAT] ONLINE: Player1, Player2, Player3\n'
+
+@pytest.fixture
+def log_file(tmp_path):
+    """An empty log file."""
+    path = tmp_path / 'latest.log'
+    path.write_bytes(b'')
+    return path
+
+def append(path, data):
+    """Append bytes to a file, like Minecraft writing to its log."""
+    with open(path, 'ab') as f:
+        f.write(data)
+
+class TestLogTailer:
+    """Tests for reading appended lines."""
+
+    def test_partial_line_is_carried_over(self, log_file):
+        """Test that a line cut in half is returned once it is complete."""
+        tailer = LogTailer(str(log_file))
+        append(log_file, b'first line\n[CHAT] ONLINE: Play')
+
+        assert list(tailer.read_lines()) == ['first line']
+        assert tailer.position == len(b'first line\n')
+
+        append(log_file, b'er1, Player2\r\n')
+
+        assert list(tailer.read_lines()) == ['[CHAT] ONLINE: Player1, Player2']
+        assert list(tailer.read_lines()) == []
+        tailer.close()
+
+    def test_reads_in_bounded_chunks(self, log_file, mocker):
+        """Test that a large catch-up is read chunk by chunk without losing lines."""
+        lines = [f'line {i} §aé' for i in range(500)]
+        append(log_file, ''.join(line + '\n' for line in lines).encode('utf-8'))
+        tailer = LogTailer(str(log_file), chunk_size=7)
+        hold = mocker.spy(tailer, '_hold')
+
+        assert list(tailer.read_lines()) == lines
+        assert hold.call_count > 500
+        assert all(len(call.args[0]) <= 7 for call in hold.call_args_list)
+        tailer.close()
+
+    def test_starts_at_position(self, log_file):
+        """Test that lines before the start position are not read."""
+        append(log_file, b'old line\n')
+        tailer = LogTailer(str(log_file), position=len(b'old line\n'))
+        append(log_file, b'new line\n')
+
+        assert list(tailer.read_lines()) == ['new line']
+        tailer.close()
+
+    def test_truncated_file_is_read_from_start(self, log_file):
+        """Test that the file is read from the start again after it got shorter."""
+        tailer = LogTailer(str(log_file))
+        append(log_file, b'a long line from the old session\n')
+        list(tailer.read_lines())
+
+        log_file.write_bytes(b'new\n')
+
+        assert list(tailer.read_lines()) == ['new']
+        tailer.close()
+
+    def test_overlong_line_is_skipped(self, log_file, mocker):
+        """Test that a line without a newline doesn't grow without bound."""
+        mocker.patch.object(log_monitor, 'MAX_LINE_LENGTH', 16)
+        tailer = LogTailer(str(log_file), chunk_size=8)
+        append(log_file, b'x' * 100)
+
+        assert list(tailer.read_lines()) == []
+        assert len(tailer._partial) <= 16
+
+        append(log_file, b'xxxx\nafter\n')
+
+        assert list(tailer.read_lines()) == ['after']
+        tailer.close()
+
+    def test_rotated_file_is_drained_then_followed(self, log_file):
+        """Test that a log moved away is read to its end before the new log is read from the start."""
+        tailer = LogTailer(str(log_file))
+        append(log_file, b'[10:00:00] old session\n')
+        list(tailer.read_lines())
+        append(log_file, b'last old line\nno newline')
+
+        log_file.rename(log_file.with_name('2024-01-01-1.log'))
+        # The new log is already longer than the offset in the old one
+        append(log_file, b'[11:00:00] new session started\n' * 3)
+
+        assert tailer.changed()
+        assert list(tailer.read_lines()) == ['last old line', 'no newline'] + ['[11:00:00] new session started'] * 3
+        assert not tailer.changed()
+        tailer.close()
+
+    def test_log_truncated_in_place_is_detected_by_head(self, log_file):
+        """Test that a log truncated and rewritten past the old offset is read from the start."""
+        tailer = LogTailer(str(log_file))
+        append(log_file, b'[10:00:00] old session\n')
+        list(tailer.read_lines())
+
+        log_file.write_bytes(b'[11:00:00] new session\n' + b'[11:00:01] more\n')
+
+        assert list(tailer.read_lines()) == ['[11:00:00] new session', '[11:00:01] more']
+        tailer.close()
+
+    def test_reopened_file_is_checked(self, log_file):
+        """Test that a file replaced while the tailer was closed is read from the start."""
+        tailer = LogTailer(str(log_file))
+        append(log_file, b'old\n')
+        list(tailer.read_lines())
+        tailer.close()
+
+        log_file.rename(log_file.with_name('old.log'))
+        append(log_file, b'first\nsecond\n')
+
+        assert list(tailer.read_lines()) == ['first', 'second']
+        tailer.close()
+
+class TestLineClassifier:
+    """Tests for classifying log lines."""
+
+    @pytest.mark.parametrize('line, kind, details', [
+        ('[CHAT] ONLINE: Player1, Player2 (2)', log_monitor.WHO, {'who_players': 'Player1, Player2'}),
+        ('[CHAT] [TEAM] Player1: rush mid', log_monitor.TEAM_CHAT, {'team_chat_player': 'Player1'}),
+        ('[CHAT] Player1 has joined the Red team!', log_monitor.TEAM_JOIN,
+         {'team_join_player': 'Player1', 'team_color': 'Red'}),
+        ('[CHAT] You joined the lobby!', log_monitor.LOBBY_JOIN, {}),
+        ('[CHAT] The game has started!', log_monitor.GAME_START, {}),
+    ])
+    def test_classifies_lines(self, line, kind, details):
+        """Test that each kind of line is recognized with its details."""
+        result = LineClassifier().classify(line)
+
+        assert result is not None
+        assert result[0] == kind
+        assert {name: result[1].group(name) for name in details} == details
+
+    @pytest.mark.parametrize('line', [
+        '[CHAT] Player1: gg',
+        '[CHAT] Player1 joined the game',
+        '[Render thread/INFO]: Reloading ResourceManager',
+        '[CHAT] [TEAM]',
+        ''
+    ])
+    def test_ignores_other_lines(self, line):
+        """Test that lines of no interest aren't classified."""
+        assert LineClassifier().classify(line) is None
+
+class TestLogEvents:
+    """Tests for parsing log lines into events."""
+
+    def test_parse_lines(self):
+        """Test that each kind of line gives its event, with the timestamp of the line."""
+        prefix = '[12:00:{:02d}] [Client thread/INFO]: [CHAT] '
+        messages = [
+            'You joined the lobby!',
+            'Player1 has joined (3/16)!',
+            'ONLINE: §aPlayer1, Player2',
+            'Player1: gg',
+            'Player1 has joined the Red team!',
+            '[TEAM] Player2: hi',
+            'The game has started!',
+            'Player1 was knocked into the void by Player2. FINAL KILL!',
+            'Player3 fell into the void. FINAL KILL!',
+            'BED DESTRUCTION > Blue Bed was destroyed by Player1!',
+            'BED DESTRUCTION > Your Bed was iced by Player3!'
+        ]
+        lines = [prefix.format(second) + message + '\n' for second, message in enumerate(messages)]
+
+        events = list(parse_lines(lines))
+
+        def at(second):
+            return datetime.time(12, 0, second)
+
+        assert events == [
+            LobbyJoined(at(0)),
+            PlayerJoined(at(1), 'Player1'),
+            WhoList(at(2), ('Player1', 'Player2')),
+            TeamAssigned(at(4), 'Player1', 'RED'),
+            TeamAssigned(at(5), 'Player2', log_monitor.YOUR_TEAM),
+            GameStarted(at(6)),
+            FinalKill(at(7), 'Player1', 'Player2'),
+            FinalKill(at(8), 'Player3', None),
+            BedDestroyed(at(9), 'BLUE', 'Player1'),
+            BedDestroyed(at(10), log_monitor.YOUR_TEAM, 'Player3')
+        ]
+
+    def test_lines_without_timestamp(self):
+        """Test that lines without a valid timestamp prefix give events without a timestamp."""
+        events = list(parse_lines(['[CHAT] The game has started!', '[99:00:00] [CHAT] You joined the lobby!']))
+
+        assert events == [GameStarted(None), LobbyJoined(None)]
+
+    def test_read_events_from_monitor(self, log_file, mocker):
+        """Test that the monitor yields the events of new lines without calling the callbacks."""
+        mocker.patch('src.log_monitor.config.get_log_file_path', return_value=str(log_file))
+        mocker.patch('src.log_monitor.config.get_polling_interval', return_value=2)
+        monitor = LogMonitor(mocker.Mock(), mocker.Mock())
+        append(log_file, WHO_LINE.encode('utf-8') + b'[12:00:01] [CHAT] Player1 has joined the Red team!\n')
+
+        events = list(monitor.read_events())
+
+        assert [type(event) for event in events] == [WhoList, TeamAssigned]
+        assert events[0].timestamp == datetime.time(12, 0, 0)
+        monitor.callback.assert_not_called()
+        monitor.team_callback.assert_not_called()
+        assert monitor.player_teams == {}
+        monitor.tailer.close()
+
+class TestLogMonitor:
+    """Tests for processing new log lines."""
+
+    @pytest.fixture
+    def monitor(self, log_file, mocker):
+        """A monitor of the empty log file."""
+        mocker.patch('src.log_monitor.config.get_log_file_path', return_value=str(log_file))
+        mocker.patch('src.log_monitor.config.get_polling_interval', return_value=2)
+        monitor = LogMonitor(mocker.Mock())
+        yield monitor
+        monitor.tailer.close()
+
+    def test_who_line_written_in_two_parts(self, monitor, log_file):
+        """Test that a /who line cut in half by a mid-write read is not lost."""
+        half = len(WHO_LINE) // 2
+        append(log_file, WHO_LINE[:half].encode('utf-8'))
+        monitor._process_new_lines()
+
+        monitor.callback.assert_not_called()
+
+        append(log_file, WHO_LINE[half:].encode('utf-8'))
+        monitor._process_new_lines()
+
+        monitor.callback.assert_called_once()
+        assert sorted(monitor.callback.call_args[0][0]) == ['Player1', 'Player2', 'Player3']
+
+    def test_who_after_game_restart(self, monitor, log_file):
+        """Test that /who output in a new log is found even if the new log is larger than the old offset."""
+        append(log_file, b'[10:00:00] old session\n')
+        monitor._process_new_lines()
+
+        log_file.rename(log_file.with_name('2024-01-01-1.log'))
+        append(log_file, b'[11:00:00] Setting user: Test\n' * 5 + WHO_LINE.encode('utf-8'))
+        monitor._process_new_lines()
+
+        monitor.callback.assert_called_once()
+
+    def test_team_callback(self, monitor, log_file, mocker):
+        """Test that team information from the log is stored and reported."""
+        monitor.team_callback = mocker.Mock()
+        append(log_file, b'[CHAT] Player1 has joined the Red team!\n[CHAT] [TEAM] Player2: hi\n'
+                         b'[CHAT] [TEAM] Player1: hi\n')
+
+        monitor._process_new_lines()
+
+        assert monitor.get_all_player_teams() == {'Player1': 'RED', 'Player2': log_monitor.YOUR_TEAM}
+        assert monitor.team_callback.call_args_list == [
+            mocker.call('Player1', 'RED'), mocker.call('Player2', log_monitor.YOUR_TEAM)
+        ]
+
+    def test_sample_lines(self, monitor, log_file):
+        """Test the events, teams and players found in a sample of chat lines."""
+        lines = [
+            '[CHAT] Player1 has joined the Red team!',
+            '[CHAT] [TEAM] Player2: hi',
+            '[CHAT] ONLINE: §aPlayer3, Player4',
+            '[CHAT] Player5: ONLINE is a word',
+            '[CHAT] ONLINE: None'
+        ]
+
+        assert list(parse_lines(lines)) == [
+            TeamAssigned(None, 'Player1', 'RED'),
+            TeamAssigned(None, 'Player2', log_monitor.YOUR_TEAM),
+            WhoList(None, ('Player3', 'Player4')),
+            WhoList(None, ())
+        ]
+
+        append(log_file, ''.join(line + '\n' for line in lines).encode('utf-8'))
+        monitor._process_new_lines()
+
+        assert monitor.player_teams == {'Player1': 'RED', 'Player2': log_monitor.YOUR_TEAM}
+        assert monitor.all_players == {'Player1', 'Player3', 'Player4'}
+        monitor.callback.assert_called_once()
+        assert sorted(monitor.callback.call_args[0][0]) == ['Player1', 'Player3', 'Player4']
+
+    def test_existing_content_is_skipped(self, log_file, mocker):
+        """Test that only lines written after starting are processed."""
+        append(log_file, WHO_LINE.encode('utf-8'))
+        mocker.patch('src.log_monitor.config.get_log_file_path', return_value=str(log_file))
+        mocker.patch('src.log_monitor.config.get_polling_interval', return_value=2)
+        monitor = LogMonitor(mocker.Mock())
+
+        monitor._process_new_lines()
+
+        monitor.callback.assert_not_called()
+        monitor.tailer.close()
@@ -0,0 +1,140 @@
+"""
+Tests for fetching lobby stats in the main window.
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+pytest.importorskip('PyQt6')
+
+from src.ui.main_window import StatsProcessor
+
+USERNAMES = ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo', 'Foxtrot']
+
+def make_player(username, final_kills):
+    """Build a minimal Hypixel player object."""
+    return {
+        'uuid': f'uuid-{username}',
+        'displayname': username,
+        'stats': {'Bedwars': {'final_kills_bedwars': final_kills, 'final_deaths_bedwars': 1}}
+    }
+
+@pytest.fixture
+def api_client(mocker):
+    """A mocked API client that knows every player in USERNAMES."""
+    client = mocker.Mock()
+    client.get_uuids.return_value = {username: f'uuid-{username}' for username in USERNAMES}
+    players = {f'uuid-{username}': make_player(username, index) for index, username in enumerate(USERNAMES)}
+    client.get_player_stats.side_effect = lambda uuid: players[uuid]
+    return client
+
+class TestStatsProcessor:
+    """Tests for the lobby stats processor."""
+
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    def test_fetches_and_ranks_every_player(self, api_client, mocker, max_workers):
+        """Test that every player is fetched once and the result is ranked, with one worker or many."""
+        player_callback = mocker.Mock()
+        progress_callback = mocker.Mock()
+
+        result = StatsProcessor(USERNAMES, api_client, max_workers=max_workers).process(
+            progress_callback, player_callback)
+
+        # Highest FKDR first
+        assert [player['username'] for player in result] == USERNAMES[::-1]
+        assert [player['rank'] for player in result] == list(range(1, len(USERNAMES) + 1))
+        assert api_client.get_player_stats.call_count == len(USERNAMES)
+        streamed = [call.args[0]['username'] for call in player_callback.call_args_list]
+        assert sorted(streamed) == sorted(USERNAMES)
+        assert progress_callback.call_args_list[-1] == mocker.call(100)
+
+    def test_sequential_streams_in_lobby_order(self, api_client, mocker):
+        """Test that one worker reports players in lobby order."""
+        player_callback = mocker.Mock()
+
+        StatsProcessor(USERNAMES, api_client, max_workers=1).process(player_callback=player_callback)
+
+        assert [call.args[0]['username'] for call in player_callback.call_args_list] == USERNAMES
+
+    def test_concurrent_streams_in_completion_order(self, api_client, mocker):
+        """Test that many workers report each player as soon as its lookup finishes."""
+        players = {f'uuid-{username}': make_player(username, 1) for username in USERNAMES[:2]}
+        alpha_may_finish = threading.Event()
+
+        def get_player_stats(uuid):
+            if uuid == 'uuid-Alpha':
+                alpha_may_finish.wait(5)
+            return players[uuid]
+
+        api_client.get_player_stats.side_effect = get_player_stats
+        player_callback = mocker.Mock(side_effect=lambda stats: alpha_may_finish.set())
+
+        StatsProcessor(USERNAMES[:2], api_client, max_workers=2).process(player_callback=player_callback)
+
+        assert [call.args[0]['username'] for call in player_callback.call_args_list] == ['Bravo', 'Alpha']
+
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    def test_placeholders(self, api_client, max_workers):
+        """Test the placeholders for nicks, players new to Hypixel and API outages."""
+        api_client.get_uuids.return_value = {'Alpha': None, 'Bravo': 'uuid-Bravo', 'Charlie': 'uuid-Charlie'}
+        api_client.get_uuid.side_effect = ValueError("Failed to get UUID for Delta: Player 'Delta' not found")
+
+        def get_player_stats(uuid):
+            if uuid == 'uuid-Bravo':
+                raise ValueError("Player with UUID uuid-Bravo not found")
+            raise requests.RequestException("api.hypixel.net is unavailable")
+
+        api_client.get_player_stats.side_effect = get_player_stats
+
+        result = StatsProcessor(['Alpha', 'Bravo', 'Charlie', 'Delta'], api_client,
+                                max_workers=max_workers).process()
+
+        estimates = {player['username']: player['nick_estimate'] for player in result}
+        assert estimates == {
+            'Alpha': 'Confirmed Nick',
+            'Bravo': 'Probable Nick',
+            'Charlie': 'API Unavailable',
+            'Delta': 'Confirmed Nick'
+        }
+        assert all(player.get('is_placeholder', False) for player in result)
+
+    def test_non_json_response_is_api_unavailable(self, api_client):
+        """Test that a lookup answered with an HTML page doesn't mark the player as a nick."""
+        api_client.get_uuids.return_value = {}
+        api_client.get_uuid.side_effect = requests.RequestException(
+            "Failed to get UUID for Alpha: Request to https://api.mojang.com failed: Invalid JSON in response")
+
+        result = StatsProcessor(['Alpha'], api_client).process()
+
+        assert result[0]['nick_estimate'] == 'API Unavailable'
+
+    def test_existing_players_are_not_fetched_again(self, api_client):
+        """Test that players already in the table are kept without a lookup."""
+        existing = StatsProcessor(['Alpha'], api_client).process()
+        api_client.get_player_stats.reset_mock()
+
+        result = StatsProcessor(['Alpha', 'Bravo'], api_client, existing_stats=existing, max_workers=4).process()
+
+        assert sorted(player['username'] for player in result) == ['Alpha', 'Bravo']
+        api_client.get_player_stats.assert_called_once_with('uuid-Bravo')
+
+    def test_stopping_early_cancels_queued_lookups(self, api_client):
+        """Test that lookups still queued when the consumer stops are never sent."""
+        players = {f'uuid-{username}': make_player(username, 1) for username in USERNAMES}
+
+        def get_player_stats(uuid):
+            time.sleep(0.05)
+            return players[uuid]
+
+        api_client.get_player_stats.side_effect = get_player_stats
+        processor = StatsProcessor(USERNAMES, api_client, max_workers=2)
+        results = processor._fetch_concurrently(USERNAMES, {username: f'uuid-{username}' for username in USERNAMES})
+
+        next(results)
+        results.close()
+        time.sleep(0.3)
+
+        # Only the lookups already running when the consumer stopped still finish
+        assert api_client.get_player_stats.call_count < len(USERNAMES)
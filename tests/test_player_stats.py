@@ -0,0 +1,127 @@
+"""
+Tests for the player stats records.
+"""
+import copy
+
+import pytest
+
+from src import stats_schema
+from src.player_stats import PlayerStats, PlaceholderStats
+from src.ranking_engine import rank_players, rank_by_criteria
+
+class TestPlayerStats:
+    """Tests for the PlayerStats and PlaceholderStats records."""
+
+    def test_numeric_fields_are_normalized(self):
+        """Test that numeric fields are converted once on creation."""
+        stats = PlayerStats(username='Test', bedwars_stars='150', fkdr='2.5', wlr=None, karma='lots')
+
+        assert stats.bedwars_stars == 150
+        assert stats.fkdr == 2.5
+        assert stats.wlr == 0.0
+        assert stats.karma == 0
+        assert isinstance(stats.hypixel_level, float)
+
+    def test_dict_compatibility(self):
+        """Test that records can be used like the old stats dictionaries."""
+        stats = PlayerStats(username='Test', uuid='abc', bedwars_stars=100)
+
+        assert stats['username'] == 'Test'
+        assert stats.get('bedwars_stars', 0) == 100
+        assert 'fkdr' in stats
+
+        # Optional fields are only present once set
+        assert 'rank' not in stats
+        assert stats.get('rank', 7) == 7
+        with pytest.raises(KeyError):
+            stats['rank']
+
+        stats['rank'] = 3
+        assert 'rank' in stats
+        assert stats['rank'] == 3
+        assert list(stats)[-1] == 'rank'
+        assert stats.to_dict()['rank'] == 3
+
+        # Keys that were never part of the stats can't be added
+        with pytest.raises(KeyError):
+            stats['unknown'] = 1
+
+    def test_from_dict_round_trip(self):
+        """Test that a record converts from and to an equal dictionary."""
+        stats = PlayerStats(username='Test', uuid='abc', bedwars_stars=100, fkdr=1.5)
+
+        restored = PlayerStats.from_dict({**stats.to_dict(), 'not_a_field': 1})
+
+        assert restored == stats
+        assert restored == stats.to_dict()
+
+    def test_copies_are_independent(self):
+        """Test that copy() and deepcopy() create independent records."""
+        stats = PlayerStats(username='Test', bedwars_stars=100)
+
+        for clone in (stats.copy(), copy.copy(stats), copy.deepcopy(stats)):
+            clone['rank'] = 1
+            assert clone == {**stats.to_dict(), 'rank': 1}
+        assert 'rank' not in stats
+
+    def test_records_have_no_instance_dict(self):
+        """Test that records don't carry a per-instance __dict__."""
+        assert not hasattr(PlayerStats(), '__dict__')
+        assert not hasattr(PlaceholderStats('Nick', 1.0, 'Confirmed Nick'), '__dict__')
+
+    def test_placeholder_stats(self):
+        """Test that placeholders match the old placeholder dictionaries."""
+        placeholder = PlaceholderStats('Nick', 0.9, 'Highly Likely Nick', rank=5)
+
+        assert placeholder.get('is_placeholder', False) is True
+        assert placeholder['bedwars_stars'] == '?'
+        assert placeholder['nick_probability'] == 0.9
+        assert placeholder['rank'] == 5
+        assert placeholder.get('is_confirmed_nick') is False
+        assert PlayerStats().get('is_placeholder', False) is False
+
+        with pytest.raises(KeyError):
+            placeholder['fkdr'] = 1.0
+
+    def test_ranking_uses_records(self):
+        """Test that records rank like the equivalent dictionaries."""
+        players = [
+            PlayerStats(username='Player1', bedwars_stars=100, fkdr=2.0),
+            PlayerStats(username='Player2', bedwars_stars=200, fkdr=1.5),
+            PlayerStats(username='Player3', bedwars_stars=100, fkdr=3.0)
+        ]
+
+        ranked = [p['username'] for p in rank_players(players)]
+        ranked_dicts = [p['username'] for p in rank_players([p.to_dict() for p in players])]
+
+        assert ranked == ranked_dicts == ['Player3', 'Player1', 'Player2']
+
+        by_stars = rank_by_criteria(players, 'bedwars_stars')
+        assert by_stars[0]['username'] == 'Player2'
+        assert by_stars[0]['rank'] == 1
+
+    def test_mode_stats_are_computed_lazily_and_memoized(self, mocker):
+        """Test that per-mode stats are only computed when first asked for, once per mode."""
+        bedwars = {'eight_one_final_kills_bedwars': 30, 'eight_one_final_deaths_bedwars': 20,
+                   'two_four_wins_bedwars': 4}
+        stats = PlayerStats(username='Test', bedwars=dict(bedwars, coins=500, packages=['a'] * 100))
+        solo = mocker.Mock(side_effect=stats_schema.MODE_EXTRACTORS['solo'])
+        mocker.patch.dict(stats_schema.MODE_EXTRACTORS, {'solo': solo})
+
+        assert solo.call_count == 0
+
+        first = stats.get_mode_stats('solo')
+        second = stats.get_mode_stats('solo')
+
+        assert first is second
+        assert solo.call_count == 1
+        assert first.fkdr == 1.5
+        assert [mode.mode for mode in stats.get_all_mode_stats()] == ['solo', 'doubles', 'threes', 'fours', '4v4']
+        assert stats.get_mode_stats('4v4').wlr == 4.0
+
+        # Only the per-mode counters are kept
+        assert stats._bedwars == bedwars
+
+        # Per-mode stats aren't part of the dictionary view
+        assert 'bedwars' not in stats
+        assert stats == stats.to_dict()
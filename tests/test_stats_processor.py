@@ -0,0 +1,154 @@
+"""
+Tests for the stats processor.
+"""
+import pytest
+
+from src import nick_detector, stats_processor, stats_schema
+
+def make_payload(index, **bedwars):
+    """Create a raw player payload with the given Bedwars counters."""
+    return {
+        'uuid': f'uuid{index}',
+        'displayname': f'Player{index}',
+        'networkExp': index * 250000,
+        'stats': {'Bedwars': bedwars}
+    }
+
+PAYLOADS = [
+    make_payload(0),
+    make_payload(1, final_kills_bedwars=10, final_deaths_bedwars=0, wins_bedwars=5, losses_bedwars=0),
+    make_payload(2, final_kills_bedwars=223, final_deaths_bedwars=200, wins_bedwars=0, losses_bedwars=7),
+    make_payload(3, final_kills_bedwars='12', final_deaths_bedwars='abc', beds_broken_bedwars=3,
+                 beds_lost_bedwars=4, Experience=52000),
+    {**make_payload(4, Experience=700000), 'achievements': {'bedwars_level': 'bad'}},
+    {**make_payload(5, Experience=700000), 'achievements': {'bedwars_level': 321}},
+    {'uuid': 'uuid6', 'networkExp': 'unknown', 'stats': 'none'},
+    {}
+]
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def batch_mode(request, monkeypatch):
+    """Run a test with NumPy (if installed) and with the pure Python fallback."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(stats_processor, 'np', None)
+    return request.param
+
+class TestBatchStats:
+    """Tests for the batch stats functions."""
+
+    def test_batch_matches_single_player_functions(self, batch_mode):
+        """Test that batch results equal the per-player functions, including division by zero."""
+        payloads = [payload for payload in PAYLOADS if payload]
+
+        result = stats_processor.calculate_batch_stats(payloads)
+
+        assert list(result['fkdr']) == [stats_processor.calculate_fkdr(p) for p in payloads]
+        assert list(result['wlr']) == [stats_processor.calculate_wlr(p) for p in payloads]
+        assert list(result['bblr']) == [stats_processor.calculate_bblr(p) for p in payloads]
+        assert list(result['bedwars_stars']) == [stats_processor.get_bedwars_stars(p) for p in payloads]
+        assert list(result['hypixel_level']) == [stats_processor.get_hypixel_level(p) for p in payloads]
+
+        # 223 / 200 is one of the values np.round rounds differently from round()
+        assert list(result['fkdr'])[:3] == [0.0, 10.0, 1.11]
+
+    def test_extract_batch_matches_single_extraction(self, batch_mode):
+        """Test that batch extraction gives the same records as extract_relevant_stats."""
+        result = stats_processor.extract_relevant_stats_batch(PAYLOADS)
+
+        assert result == [stats_processor.extract_relevant_stats(p) for p in PAYLOADS]
+        assert result[-1] == {}
+
+    def test_empty_batch(self, batch_mode):
+        """Test that an empty batch gives empty results."""
+        assert stats_processor.extract_relevant_stats_batch([]) == []
+        assert all(len(column) == 0 for column in stats_processor.calculate_batch_stats([]).values())
+
+class TestModeStats:
+    """Tests for the per-mode stats."""
+
+    def test_extract_mode_stats(self):
+        """Test that each mode reads its own prefixed counters."""
+        payload = make_payload(0, eight_two_final_kills_bedwars=9, eight_two_final_deaths_bedwars=0,
+                               four_four_wins_bedwars='6', four_four_losses_bedwars=4, final_kills_bedwars=100)
+
+        doubles = stats_processor.extract_mode_stats(payload, 'doubles')
+        fours = stats_processor.extract_mode_stats(payload, 'fours')
+
+        assert doubles.final_kills == 9
+        assert doubles.fkdr == 9.0
+        assert fours.wlr == 1.5
+        assert stats_processor.extract_mode_stats({}, 'solo').fkdr == 0.0
+
+    def test_records_match_mode_extraction(self):
+        """Test that the record's lazily computed modes match extract_mode_stats."""
+        payload = make_payload(0, four_three_beds_broken_bedwars=5, four_three_beds_lost_bedwars=2)
+
+        stats = stats_processor.extract_relevant_stats(payload)
+
+        for mode in stats_schema.BEDWARS_MODES:
+            assert stats.get_mode_stats(mode) == stats_processor.extract_mode_stats(payload, mode)
+        assert stats.get_mode_stats('threes').bblr == 2.5
+
+    def test_unknown_mode(self):
+        """Test that unknown modes raise a KeyError."""
+        with pytest.raises(KeyError):
+            stats_processor.extract_mode_stats(make_payload(0), 'eight_one_')
+
+class TestMemoizedExtraction:
+    """Tests for the memo in front of stats extraction and nick estimates."""
+
+    def test_unchanged_players_are_not_processed_again(self, mocker):
+        """Test that an unchanged payload reuses the memoized stats."""
+        spy = mocker.spy(stats_processor, '_extract_player')
+        payload = make_payload(1, Experience=5000, final_kills_bedwars=10)
+
+        first = stats_processor.extract_relevant_stats_memoized(payload)
+        second = stats_processor.extract_relevant_stats_memoized(dict(payload))
+
+        assert spy.call_count == 1
+        assert first == second == stats_processor.extract_relevant_stats(payload)
+
+        # Callers get copies, so changing one doesn't change the memo
+        first['rank'] = 1
+        assert 'rank' not in stats_processor.extract_relevant_stats_memoized(payload)
+
+    def test_changed_players_are_processed_again(self, mocker):
+        """Test that a changed fingerprint counter gives fresh stats."""
+        payload = make_payload(1, Experience=5000, final_kills_bedwars=10)
+        stats_processor.extract_relevant_stats_memoized(payload)
+
+        changed = make_payload(1, Experience=5600, final_kills_bedwars=11)
+        stats = stats_processor.extract_relevant_stats_memoized(changed)
+
+        assert stats.final_kills == 11
+
+    @pytest.mark.parametrize('player, bedwars', [({'karma': 1000}, {}), ({'achievementPoints': 50}, {}),
+                                                 ({}, {'coins': 900})])
+    def test_fields_outside_games_invalidate_the_memo(self, player, bedwars):
+        """Test that fields that change without playing, like karma and coins, give fresh stats."""
+        stats_processor.extract_relevant_stats_memoized(make_payload(1, Experience=5000, coins=100))
+
+        changed = make_payload(1, **{'Experience': 5000, 'coins': 100, **bedwars})
+        changed.update(player)
+        stats = stats_processor.extract_relevant_stats_memoized(changed)
+
+        assert stats == stats_processor.extract_relevant_stats(changed)
+
+    def test_nick_scores_are_memoized(self, mocker):
+        """Test that nick scores are reused for unchanged stats, even after the rank was set."""
+        spy = mocker.spy(nick_detector, 'estimate_if_nicked')
+        stats = stats_processor.extract_relevant_stats_memoized(make_payload(1))
+
+        first = nick_detector.estimate_if_nicked_memoized(stats)
+        second = nick_detector.estimate_if_nicked_memoized(stats_processor.extract_relevant_stats_memoized(make_payload(1)))
+
+        assert first == second
+        assert spy.call_count == 1
+
+        # A change in lobby order doesn't change the score
+        stats['rank'] = 3
+        assert nick_detector.estimate_if_nicked_memoized(stats) == first
+        assert spy.call_count == 1
+        assert nick_detector.estimate_if_nicked(stats) == first
@@ -0,0 +1,91 @@
+"""
+Tests for the stats schema.
+"""
+from src import stats_schema
+from src.stats_schema import Derived, Field
+
+class CountingDict(dict):
+    """Dictionary that counts how often each key is looked up."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = {}
+
+    def _count(self, key):
+        self.lookups[key] = self.lookups.get(key, 0) + 1
+
+    def get(self, key, default=None):
+        self._count(key)
+        return super().get(key, default)
+
+    def __getitem__(self, key):
+        self._count(key)
+        return super().__getitem__(key)
+
+SCHEMA = [
+    Field('name', ('displayname',), object, 'Unknown'),
+    Field('kills', ('stats', 'Bedwars', 'final_kills_bedwars'), int),
+    Field('deaths', ('stats', 'Bedwars', 'final_deaths_bedwars'), int),
+    Field('coins', ('stats', 'Bedwars', 'coins'), int),
+    Field('level', ('networkExp',), float, 0.0),
+    Derived('fkdr', lambda v: stats_schema.compute_ratio(v['kills'], v['deaths']), float)
+]
+
+class TestStatsSchema:
+    """Tests for compiling and running schemas."""
+
+    def test_extracts_fields_and_derived_values(self):
+        """Test that fields are converted and derived values computed."""
+        extract = stats_schema.compile_extractor(SCHEMA)
+
+        values = extract({
+            'displayname': 'Test',
+            'networkExp': '1500.5',
+            'stats': {'Bedwars': {'final_kills_bedwars': '30', 'final_deaths_bedwars': 20, 'coins': 'many'}}
+        })
+
+        assert values == {'name': 'Test', 'kills': 30, 'deaths': 20, 'coins': None, 'level': 1500.5, 'fkdr': 1.5}
+
+    def test_missing_values_use_defaults(self):
+        """Test that missing values and missing or invalid subtrees give the defaults."""
+        extract = stats_schema.compile_extractor(SCHEMA)
+
+        assert extract({}) == {'name': 'Unknown', 'kills': 0, 'deaths': 0, 'coins': 0, 'level': 0.0, 'fkdr': 0.0}
+        assert extract({'stats': 'none'})['kills'] == 0
+        assert extract({'stats': {'Bedwars': []}})['deaths'] == 0
+
+    def test_each_subtree_is_looked_up_once(self):
+        """Test that shared path prefixes are only walked once per player."""
+        extract = stats_schema.compile_extractor(SCHEMA)
+        bedwars = CountingDict(final_kills_bedwars=1, final_deaths_bedwars=2, coins=3)
+        stats = CountingDict(Bedwars=bedwars)
+        player = CountingDict(stats=stats)
+
+        extract(player)
+
+        assert player.lookups.get('stats') == 1
+        assert stats.lookups.get('Bedwars') == 1
+
+    def test_extract_without_derived_values(self):
+        """Test that derive=False only reads the fields."""
+        extract = stats_schema.compile_extractor(SCHEMA, derive=False)
+
+        assert 'fkdr' not in extract({})
+
+    def test_paths_and_types(self):
+        """Test the paths and types a schema declares."""
+        assert stats_schema.get_paths(SCHEMA) == [
+            'displayname', 'stats.Bedwars.final_kills_bedwars', 'stats.Bedwars.final_deaths_bedwars',
+            'stats.Bedwars.coins', 'networkExp'
+        ]
+        assert stats_schema.get_types(SCHEMA)['fkdr'] is float
+
+    def test_player_schema_covers_player_stats(self):
+        """Test that the player schema produces every PlayerStats field."""
+        from src.player_stats import PlayerStats
+
+        values = stats_schema.compile_extractor(stats_schema.PLAYER_SCHEMA)({'uuid': 'abc'})
+
+        assert set(PlayerStats._FIELDS) <= set(values)
+        assert values['username'] == 'abc'
+        assert values['uuid'] == 'abc'